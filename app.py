@@ -6,24 +6,14 @@
 # -------------------------
 # Standard library
 # -------------------------
-import io
-import json
 import time
-import logging
-from datetime import datetime
 
 # -------------------------
 # Third-party libraries
 # -------------------------
 import pandas as pd
-import pytz
 import streamlit as st
-import gspread
-from google.oauth2 import service_account
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from streamlit_lottie import st_lottie
-from tenacity import retry, wait_exponential, stop_after_attempt
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 # -------------------------
 # Configuración
@@ -35,66 +25,33 @@ from config.settings import (
     WORKSHEET_USUARIOS,
     COLUMNAS_RECLAMOS,
     COLUMNAS_CLIENTES,
-    COLUMNAS_USUARIOS,
-    WORKSHEET_NOTIFICACIONES,
-    NOTIFICATION_TYPES,
-    COLUMNAS_NOTIFICACIONES,
-    SECTORES_DISPONIBLES,
-    TIPOS_RECLAMO,
-    TECNICOS_DISPONIBLES,
-    MATERIALES_POR_RECLAMO,
-    ROUTER_POR_SECTOR,
+    COLUMNA_ID_RECLAMO,
+    COLUMNA_ID_CLIENTE,
     DEBUG_MODE,
 )
 
 # -------------------------
 # Local components
 # -------------------------
-from components.reclamos.nuevo import render_nuevo_reclamo
-from components.reclamos.gestion import render_gestion_reclamos
-from components.clientes.gestion import render_gestion_clientes
-from components.reclamos.impresion import render_impresion_reclamos
-from components.reclamos.planificacion import render_planificacion_grupos
-from components.reclamos.cierre import render_cierre_reclamos
+# Las páginas se importan al mostrarlas (ver RUTEO DE COMPONENTES): reportlab,
+# PIL y el resto de sus dependencias no se cargan hasta que hacen falta.
 from components.resumen_jornada import render_resumen_jornada
-from components.notifications import init_notification_manager
-from components.notification_bell import render_notification_bell
-from components.auth import auth_has_permission, check_authentication, render_login_form
-from components.navigation import render_main_navigation
-from components.metrics_dashboard import render_metrics_dashboard, metric_card
-from components.ui import breadcrumb, metric_card, card, badge, loading_indicator
+from components.auth import check_authentication, validar_sesion, render_login_form, render_user_info
 
 # -------------------------
 # Utils
 # -------------------------
-from utils.helpers import (
-    show_warning,
-    show_error,
-    show_success,
-    show_info,
-    format_phone_number,
-    format_dni,
-    get_current_datetime,
-    format_datetime,
-    truncate_text,
-    is_valid_email,
-    safe_float_conversion,
-    safe_int_conversion,
-    get_status_badge,
-    format_currency,
-    get_breadcrumb_icon,
-)
-from utils.styles import get_main_styles, get_loading_spinner, loading_indicator
-from utils.data_manager import (
-    safe_get_sheet_data,
-    safe_normalize,
-    update_sheet_data,
-    batch_update_sheet,
-)
+from utils.styles import inyectar_estilos
+from utils.data_manager import cargar_hoja
 from utils.api_manager import api_manager, init_api_session_state
-from utils.pdf_utils import agregar_pie_pdf
-from utils.date_utils import parse_fecha, es_fecha_valida, format_fecha, ahora_argentina
-from utils.permissions import has_permission
+from utils.trazas_api import iniciar_rerun
+from utils.telemetria import obtener_exportador, rerun_duracion
+from utils.credenciales import cargar_directorio
+from utils.metricas_cubo import cubo_sincronizado
+from utils.vigilancia_sla import obtener_vigilante
+from utils.cola_impresion import obtener_cola_impresion
+from utils.date_utils import ahora_argentina
+from utils.escritura_versionada import versiones_filas, mostrar_aviso_conflictos
 
 # CONFIGURACIÓN DE PÁGINA
 st.set_page_config(
@@ -108,6 +65,12 @@ st.set_page_config(
 # INICIALIZACIÓN
 # --------------------------
 
+# Marcar el rerun para atribuir las llamadas a la API a esta página
+_inicio_rerun = time.perf_counter()
+_pagina_rerun = st.session_state.get('current_page', 'Inicio') if check_authentication() else 'Login'
+_ctx = get_script_run_ctx()
+iniciar_rerun(_pagina_rerun, _ctx.session_id if _ctx else None)
+
 # Inicializar API manager correctamente
 success, error = api_manager.initialize()
 if not success:
@@ -117,13 +80,23 @@ if not success:
 # Inicializar variables de sesión de API (compatibilidad)
 init_api_session_state()
 
-# Cargar estilos Monokai (siempre modo oscuro)
-st.markdown(get_main_styles(), unsafe_allow_html=True)
+# Endpoint /metrics o archivo .prom (según TELEMETRIA_*; único por proceso)
+obtener_exportador()
+
+# Cola de impresión: su planificador prepara los PDFs de la mañana aunque nadie abra la página
+obtener_cola_impresion()
+
+# Estilos Monokai (siempre modo oscuro): hoja minificada publicada en static/
+inyectar_estilos()
 
 # --------------------------
 # FUNCIONES AUXILIARES
 # --------------------------
 
+def registrar_duracion_rerun():
+    """Duración del rerun para las métricas (llamar antes de st.stop/st.rerun)"""
+    rerun_duracion.observe(time.perf_counter() - _inicio_rerun, pagina=_pagina_rerun)
+
 def init_google_sheets():
     """Inicializa la conexión con Google Sheets"""
     try:
@@ -141,13 +114,17 @@ def cargar_datos():
     try:
         sheet_reclamos, sheet_clientes, sheet_usuarios = init_google_sheets()
         
-        df_reclamos = safe_get_sheet_data(sheet_reclamos, COLUMNAS_RECLAMOS)
-        df_clientes = safe_get_sheet_data(sheet_clientes, COLUMNAS_CLIENTES)
-        df_usuarios = safe_get_sheet_data(sheet_usuarios, COLUMNAS_USUARIOS)
+        # Reutiliza la última carga (y su versión) mientras la hoja no cambie
+        df_reclamos, st.session_state.df_version = cargar_hoja(sheet_reclamos, COLUMNAS_RECLAMOS)
+        df_clientes, st.session_state.df_clientes_version = cargar_hoja(sheet_clientes, COLUMNAS_CLIENTES)
+        # Usuarios desde el directorio cacheado (sin contraseñas): no se relee la hoja en cada rerun
+        df_usuarios = pd.DataFrame(list(cargar_directorio(sheet_usuarios).values()))
+        df_usuarios = df_usuarios.drop(columns=["password"], errors="ignore")
         
         return df_reclamos, df_clientes, df_usuarios, sheet_reclamos, sheet_clientes
     except Exception as e:
         st.error(f"Error al cargar datos: {str(e)}")
+        st.session_state.df_version = st.session_state.df_clientes_version = "vacio"
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), None, None
 
 def render_metricas_simples(df_reclamos):
@@ -155,36 +132,20 @@ def render_metricas_simples(df_reclamos):
     if df_reclamos.empty:
         return
     
-    hoy = ahora_argentina().date()
-    
-    # Reclamos de hoy
-    reclamos_hoy = 0
-    if 'Fecha y hora' in df_reclamos.columns:
-        try:
-            df_reclamos['Fecha'] = pd.to_datetime(df_reclamos['Fecha y hora']).dt.date
-            reclamos_hoy = len(df_reclamos[df_reclamos['Fecha'] == hoy])
-        except:
-            reclamos_hoy = 0
-    
-    # Contar por estado
-    if 'Estado' in df_reclamos.columns:
-        pendientes = len(df_reclamos[df_reclamos['Estado'] == 'Pendiente'])
-        en_curso = len(df_reclamos[df_reclamos['Estado'] == 'En curso'])
-        desconexiones = len(df_reclamos[df_reclamos['Tipo de reclamo'] == 'Desconexión'])
-    else:
-        pendientes = en_curso = desconexiones = 0
+    cubo = cubo_sincronizado(df_reclamos)
+    hoy = ahora_argentina().strftime("%Y-%m-%d")
     
     # Mostrar métricas
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📥 Ingresados hoy", reclamos_hoy)
+        st.metric("📥 Ingresados hoy", cubo.contar(dia=hoy))
     with col2:
-        st.metric("⏳ Pendientes", pendientes)
+        st.metric("⏳ Pendientes", cubo.contar(estado="Pendiente"))
     with col3:
-        st.metric("🔄 En curso", en_curso)
+        st.metric("🔄 En curso", cubo.contar(estado="En curso"))
     with col4:
-        st.metric("🔌 Desconexiones", desconexiones)
+        st.metric("🔌 Desconexiones", cubo.contar(estado="Desconexión"))
 
 def render_navegacion_principal():
     """Renderiza la navegación principal en la pantalla"""
@@ -218,9 +179,11 @@ def render_navegacion_principal():
 # AUTENTICACIÓN
 # --------------------------
 
-if not check_authentication():
-    df_reclamos, df_clientes, df_usuarios, sheet_reclamos, sheet_clientes = cargar_datos()
+# El login y la validación de la sesión solo necesitan la hoja de usuarios (el directorio queda en caché)
+sheet_usuarios = api_manager.open_sheet(SHEET_ID, WORKSHEET_USUARIOS)
+if not check_authentication() or not validar_sesion(sheet_usuarios):
     render_login_form(sheet_usuarios)
+    registrar_duracion_rerun()
     st.stop()
 
 # --------------------------
@@ -233,40 +196,53 @@ df_reclamos, df_clientes, df_usuarios, sheet_reclamos, sheet_clientes = cargar_d
 st.session_state.df_reclamos = df_reclamos
 st.session_state.df_clientes = df_clientes
 st.session_state.df_usuarios = df_usuarios
+cubo_sincronizado(df_reclamos, st.session_state.df_version)
+obtener_vigilante().actualizar_datos(df_reclamos, st.session_state.df_version)
+# Versión por fila del snapshot tal como se leyó, antes de que las páginas lo modifiquen
+st.session_state.versiones_reclamos = versiones_filas(
+    df_reclamos, st.session_state.df_version, tuple(COLUMNAS_RECLAMOS), COLUMNA_ID_RECLAMO
+)
+st.session_state.versiones_clientes = versiones_filas(
+    df_clientes, st.session_state.df_clientes_version, tuple(COLUMNAS_CLIENTES), COLUMNA_ID_CLIENTE
+)
 
 # --------------------------
 # INTERFAZ PRINCIPAL
 # --------------------------
 
 # Header principal
-st.markdown("""
-<div style="text-align: center; padding: 2rem 0;">
-    <h1 style="margin: 0; background: linear-gradient(135deg, #66D9EF 0%, #F92672 30%, #A6E22E 70%, #AE81FF 100%); 
-    -webkit-background-clip: text; -webkit-text-fill-color: transparent; font-size: 2.8rem;">
-        Fusion Reclamos CRM
-    </h1>
-    <p style="color: #CFCFC2; margin-top: 0.5rem;">
-        Sistema profesional de gestión de reclamos
-    </p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(
+    "<div class='app-header'><h1>Fusion Reclamos CRM</h1>"
+    "<p>Sistema profesional de gestión de reclamos</p></div>",
+    unsafe_allow_html=True
+)
 
 # Información de usuario en sidebar
 with st.sidebar:
     render_user_info()
     st.markdown("---")
-    st.markdown(f"""
-    <div style="text-align: center; color: #75715E; font-size: 0.9rem;">
-        Versión 2.3 • {ahora_argentina().strftime('%d/%m/%Y %H:%M')}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(
+        f"<div class='app-version'>Versión 2.3 • {ahora_argentina().strftime('%d/%m/%Y %H:%M')}</div>",
+        unsafe_allow_html=True
+    )
 
 # Mostrar métricas
 render_metricas_simples(df_reclamos)
 
+# Dashboard completo (tendencias de KPIs y tiempos de resolución) a pedido, en Inicio
+if st.session_state.get('current_page', 'Inicio') == 'Inicio' and st.toggle(
+    "📈 Ver dashboard de métricas", key="mostrar_dashboard_metricas"
+):
+    from components.metrics_dashboard import render_metrics_dashboard, render_tiempos_resolucion
+    render_metrics_dashboard(df_reclamos, is_mobile=st.session_state.get('is_mobile', False))
+    render_tiempos_resolucion(df_reclamos)
+
 # Navegación principal
 render_navegacion_principal()
 
+# Registros que la última escritura no guardó porque otro usuario los cambió
+mostrar_aviso_conflictos()
+
 # --------------------------
 # RUTEO DE COMPONENTES
 # --------------------------
@@ -275,8 +251,10 @@ render_navegacion_principal()
 current_page = st.session_state.get('current_page', 'Inicio')
 
 # Renderizar componente según la página seleccionada
+resultado = None
 if current_page == 'Inicio':
-    render_nuevo_reclamo(
+    from components.reclamos.nuevo import render_nuevo_reclamo
+    resultado = render_nuevo_reclamo(
         df_reclamos=df_reclamos,
         df_clientes=df_clientes,
         sheet_reclamos=sheet_reclamos,
@@ -285,7 +263,8 @@ if current_page == 'Inicio':
     )
 
 elif current_page == 'Reclamos cargados':
-    render_gestion_reclamos(
+    from components.reclamos.gestion import render_gestion_reclamos
+    resultado = render_gestion_reclamos(
         df_reclamos=df_reclamos,
         df_clientes=df_clientes,
         sheet_reclamos=sheet_reclamos,
@@ -293,7 +272,8 @@ elif current_page == 'Reclamos cargados':
     )
 
 elif current_page == 'Gestión de clientes':
-    render_gestion_clientes(
+    from components.clientes.gestion import render_gestion_clientes
+    resultado = render_gestion_clientes(
         df_clientes=df_clientes,
         df_reclamos=df_reclamos,
         sheet_clientes=sheet_clientes,
@@ -301,21 +281,24 @@ elif current_page == 'Gestión de clientes':
     )
 
 elif current_page == 'Imprimir reclamos':
-    render_impresion_reclamos(
+    from components.reclamos.impresion import render_impresion_reclamos
+    resultado = render_impresion_reclamos(
         df_clientes=df_clientes,
         df_reclamos=df_reclamos,
         user=st.session_state.auth.get('user_info', {})
     )
 
 elif current_page == 'Seguimiento técnico':
-    render_planificacion_grupos(
+    from components.reclamos.planificacion import render_planificacion_grupos
+    resultado = render_planificacion_grupos(
         df_reclamos=df_reclamos,
         sheet_reclamos=sheet_reclamos,
         user=st.session_state.auth.get('user_info', {})
     )
 
 elif current_page == 'Cierre de Reclamos':
-    render_cierre_reclamos(
+    from components.reclamos.cierre import render_cierre_reclamos
+    resultado = render_cierre_reclamos(
         df_reclamos=df_reclamos,
         df_clientes=df_clientes,
         sheet_reclamos=sheet_reclamos,
@@ -323,20 +306,28 @@ elif current_page == 'Cierre de Reclamos':
         user=st.session_state.auth.get('user_info', {})
     )
 
-# Renderizar componente seleccionado
-if opcion in COMPONENTES and has_permission(COMPONENTES[opcion]["permiso"]):
-    with st.container():
-        st.markdown("---")
-        resultado = COMPONENTES[opcion]["render"](**COMPONENTES[opcion]["params"])
-        
-        if resultado and resultado.get('needs_refresh'):
-            st.cache_data.clear()
-            time.sleep(1)
-            st.rerun()
+# Recargar datos si el componente modificó la hoja
+# (cada escritura invalida la carga de su hoja y las cachés derivadas se indexan por
+# versión de datos: solo hace falta invalidar las notificaciones, que tienen TTL)
+if resultado and resultado.get('needs_refresh'):
+    from components.notifications import get_cached_notifications
+    get_cached_notifications.clear()
+    registrar_duracion_rerun()
+    st.rerun()
 
 # --------------------------
 # RESUMEN DE JORNADA OPTIMIZADO
 # --------------------------
 with st.container():
     render_resumen_jornada(df_reclamos)
-    st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Costo de API del rerun (solo en depuración)
+if DEBUG_MODE:
+    from components.panel_api import render_panel_api
+    from components.panel_perfiles import render_panel_perfiles
+    render_panel_api()
+    render_panel_perfiles()
+
+# Latencia total del rerun por página (telemetría)
+registrar_duracion_rerun()
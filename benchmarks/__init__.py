@@ -0,0 +1,3 @@
+"""
+Suite de benchmarks sobre datos sintéticos (ver benchmarks/__main__.py)
+"""
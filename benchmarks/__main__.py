@@ -0,0 +1,61 @@
+# benchmarks/__main__.py
+"""
+Corre la suite de benchmarks contra el backend offline.
+
+Uso:
+    python -m benchmarks                          # 1k, 10k y 100k reclamos
+    python -m benchmarks --tamanos 10000 1000000 --filtro fecha
+    python -m benchmarks --comparar               # contra la corrida anterior del historial
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from config.settings import OFFLINE_ENV_VAR
+
+# Antes de importar la app: nunca tocar Google Sheets desde un benchmark
+os.environ.setdefault(OFFLINE_ENV_VAR, tempfile.mkdtemp(prefix="fusion-bench-"))
+
+from benchmarks import hot_paths  # noqa: E402,F401  (registra los benchmarks)
+from benchmarks.nucleo import (  # noqa: E402
+    HISTORIAL_PATH, UMBRAL_REGRESION, cargar_historial, comparar, ejecutar, guardar_corrida, registrados,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de los caminos críticos de procesamiento")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--filtro", default=None, help="Solo benchmarks cuyo nombre contenga este texto")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--historial", default=HISTORIAL_PATH)
+    parser.add_argument("--etiqueta", default=None, help="Nombre libre para identificar la corrida")
+    parser.add_argument("--comparar", action="store_true", help="Comparar con la corrida anterior")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION)
+    parser.add_argument("--listar", action="store_true")
+    args = parser.parse_args()
+
+    if args.listar:
+        for nombre in sorted(registrados()):
+            print(nombre)
+        return 0
+
+    anterior = cargar_historial(args.historial)
+    print(f"{'benchmark':<40} {'tamaño':>9} {'mediana':>14} {'pico':>12}")
+    resultados = ejecutar(args.tamanos, args.filtro, args.repeticiones)
+    guardar_corrida(resultados, args.historial, args.etiqueta)
+
+    if not args.comparar or not anterior:
+        return 0
+
+    filas = comparar(resultados, anterior[-1]["resultados"], args.umbral)
+    print(f"\nComparación con {anterior[-1].get('commit') or anterior[-1]['fecha']}:")
+    for fila in filas:
+        marca = "  ⚠️ REGRESIÓN" if fila["regresion"] else ""
+        print(f"{fila['benchmark']:<40} {fila['tamano']:>9,} {fila['antes_ms']:>10.1f} → {fila['ahora_ms']:>10.1f} ms "
+              f"({fila['variacion']:+.1f}%){marca}")
+    return 1 if any(f["regresion"] for f in filas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
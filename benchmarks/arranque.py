@@ -0,0 +1,156 @@
+# benchmarks/arranque.py
+"""
+Benchmark de arranque en frío: tiempo de importación y primera pintura.
+
+Cada medición corre en un proceso nuevo (sin módulos ya importados):
+- importación de lo que app.py importa al comienzo y de cada página (que se
+  importa recién al visitarla), más el desglose de `python -X importtime`
+  para ver qué dependencias dominan
+- primera pintura: primer rerun de app.py (pantalla de login) con AppTest y
+  primer rerun autenticado, sobre el backend offline con datos sintéticos
+
+Uso:
+    python -m benchmarks.arranque --repeticiones 5
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+from config.settings import OFFLINE_ENV_VAR
+
+os.environ.setdefault(OFFLINE_ENV_VAR, tempfile.mkdtemp(prefix="fusion-arranque-"))
+
+from benchmarks.nucleo import HISTORIAL_PATH, dataset, guardar_corrida  # noqa: E402
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(RAIZ, "app.py")
+
+PAGINAS = {
+    "nuevo": "components.reclamos.nuevo",
+    "gestion": "components.reclamos.gestion",
+    "clientes": "components.clientes.gestion",
+    "impresion": "components.reclamos.impresion",
+    "planificacion": "components.reclamos.planificacion",
+    "cierre": "components.reclamos.cierre",
+}
+
+_PRIMERA_PINTURA = """
+import json, time
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+from benchmarks.e2e_app import APP_PATH, TIMEOUT, _login
+listo = time.perf_counter()
+at = AppTest.from_file(APP_PATH, default_timeout=TIMEOUT)
+at.run()
+pintura = time.perf_counter()
+_login(at, 0)
+at.run()
+autenticado = time.perf_counter()
+print(json.dumps({
+    "primera_pintura": pintura - listo,
+    "primer_rerun_autenticado": autenticado - pintura,
+    "excepciones": [e.message for e in at.exception],
+}))
+"""
+
+
+def modulos_de_app() -> List[str]:
+    """Módulos que app.py importa a nivel de módulo (los de cualquier rerun)"""
+    with open(APP_PATH, "r", encoding="utf-8") as f:
+        arbol = ast.parse(f.read())
+    modulos = []
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.Import):
+            modulos += [a.name for a in nodo.names]
+        elif isinstance(nodo, ast.ImportFrom) and nodo.module:
+            modulos.append(nodo.module)
+    return modulos
+
+
+def _python(codigo: str, *opciones: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *opciones, "-c", codigo],
+        cwd=RAIZ, env=dict(os.environ), capture_output=True, text=True, check=True
+    )
+
+
+def medir_importacion(modulos: List[str]) -> float:
+    """Segundos para importar los módulos en un proceso nuevo"""
+    codigo = ("import time\ninicio = time.perf_counter()\n"
+              + "".join(f"import {m}\n" for m in modulos)
+              + "print(time.perf_counter() - inicio)")
+    return float(_python(codigo).stdout.strip().splitlines()[-1])
+
+
+def desglose_importtime(modulos: List[str], cantidad: int = 15) -> List[Tuple[str, float]]:
+    """Paquetes con mayor tiempo acumulado según `python -X importtime`"""
+    salida = _python("".join(f"import {m}\n" for m in modulos), "-X", "importtime").stderr
+    tiempos = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, paquete = linea[len("import time:"):].split("|")
+        if acumulado.strip().isdigit():
+            tiempos.append((paquete.strip(), int(acumulado) / 1_000_000))
+    return sorted(tiempos, key=lambda t: t[1], reverse=True)[:cantidad]
+
+
+def medir_primera_pintura() -> Dict[str, float]:
+    resultado = json.loads(_python(_PRIMERA_PINTURA).stdout.strip().splitlines()[-1])
+    for excepcion in resultado.pop("excepciones"):
+        print(f"  excepción en la app: {excepcion}")
+    return resultado
+
+
+def _resumen(valores: List[float]) -> Dict[str, float]:
+    return {
+        "min_s": round(min(valores), 6),
+        "mediana_s": round(statistics.median(valores), 6),
+        "repeticiones": len(valores),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tiempo de importación y primera pintura en frío")
+    parser.add_argument("--reclamos", type=int, default=10_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--historial", default=HISTORIAL_PATH)
+    parser.add_argument("--etiqueta", default=None)
+    parser.add_argument("--sin-app", action="store_true", help="Solo importaciones (sin AppTest)")
+    args = parser.parse_args()
+
+    from utils.datos_sinteticos import escribir_dataset
+    escribir_dataset(dataset(args.reclamos), os.environ[OFFLINE_ENV_VAR])
+
+    mediciones: Dict[str, List[float]] = {}
+    grupos = {"app": modulos_de_app(), **{f"pagina.{p}": [m] for p, m in PAGINAS.items()}}
+    for _ in range(args.repeticiones):
+        for nombre, modulos in grupos.items():
+            mediciones.setdefault(f"arranque.importar_{nombre}", []).append(medir_importacion(modulos))
+        if not args.sin_app:
+            for nombre, segundos in medir_primera_pintura().items():
+                mediciones.setdefault(f"arranque.{nombre}", []).append(segundos)
+
+    print(f"\n{'medición':<44} {'mín.':>10} {'mediana':>10}")
+    resultados = {}
+    for nombre, valores in mediciones.items():
+        resumen = _resumen(valores)
+        print(f"{nombre:<44} {resumen['min_s'] * 1000:>8.0f}ms {resumen['mediana_s'] * 1000:>8.0f}ms")
+        resultados[nombre] = {str(args.reclamos): resumen}
+
+    print("\nImportaciones más costosas de app.py (acumulado):")
+    for paquete, segundos in desglose_importtime(grupos["app"]):
+        print(f"  {paquete:<42} {segundos * 1000:>8.1f}ms")
+
+    guardar_corrida(resultados, args.historial, args.etiqueta)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+# benchmarks/e2e_app.py
+"""
+Benchmark de punta a punta: latencia de cada rerun de app.py.
+
+Maneja la app con streamlit.testing.v1.AppTest (sin navegador ni red) sobre
+el backend offline con datos sintéticos, y ejecuta sesiones realistas:
+login, carga de reclamo, planificación de grupos, cierre e impresión. Informa
+p50/p90/p99 por interacción y guarda la corrida en el historial de benchmarks.
+
+Uso:
+    python -m benchmarks.e2e_app --reclamos 10000 --sesiones 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from config.settings import OFFLINE_ENV_VAR
+
+os.environ.setdefault(OFFLINE_ENV_VAR, tempfile.mkdtemp(prefix="fusion-e2e-"))
+
+from benchmarks.nucleo import HISTORIAL_PATH, dataset, guardar_corrida  # noqa: E402
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+TIMEOUT = 300
+
+
+class ElementoNoEncontrado(Exception):
+    """La interacción no aplica en el estado actual de la página"""
+
+
+def _boton(at, key: Optional[str] = None, etiqueta: Optional[str] = None, prefijo_key: Optional[str] = None):
+    for boton in at.button:
+        if key is not None and boton.key == key:
+            return boton
+        if prefijo_key is not None and str(boton.key or "").startswith(prefijo_key):
+            return boton
+        if etiqueta is not None and etiqueta in boton.label:
+            return boton
+    raise ElementoNoEncontrado(key or etiqueta or prefijo_key)
+
+
+def _texto(at, etiqueta: str):
+    for campo in at.text_input:
+        if etiqueta in campo.label:
+            return campo
+    raise ElementoNoEncontrado(etiqueta)
+
+
+def _navegar(key: str) -> Callable:
+    return lambda at, n: _boton(at, key=key).click()
+
+
+def _login(at, n):
+    _texto(at, "Usuario").input("admin")
+    _texto(at, "Contraseña").input("admin")
+    _boton(at, etiqueta="Ingresar").click()
+
+
+def _buscar_cliente(at, n):
+    _texto(at, "N° de Cliente").input(f"9{n:06d}")
+
+
+def _guardar_reclamo(at, n):
+    _texto(at, "Nombre del Cliente").input(f"CLIENTE PRUEBA {n}")
+    _texto(at, "Dirección").input(f"CALLE FALSA {n}")
+    _texto(at, "Teléfono").input("3564000000")
+    _texto(at, "Sector").input(str(n % 17 + 1))
+    _boton(at, etiqueta="Guardar Reclamo").click()
+
+
+def _cerrar_lote(at, n):
+    # Cierre en lote de los reclamos en curso (AppTest no edita celdas del data_editor)
+    if not any(c.key == "todos_en_curso" for c in at.checkbox):
+        raise ElementoNoEncontrado("todos_en_curso")  # Sin reclamos en curso
+    at.checkbox(key="todos_en_curso").check()
+    _boton(at, etiqueta="Aplicar a los seleccionados").click()
+
+
+# (nombre, acción sobre el AppTest antes del rerun)
+SESION = [
+    ("login", _login),
+    ("buscar_cliente", _buscar_cliente),
+    ("guardar_reclamo", _guardar_reclamo),
+    ("nav_seguimiento", _navegar("seguimiento")),
+    ("distribuir_grupos", lambda at, n: _boton(at, etiqueta="Distribuir reclamos ahora").click()),
+    ("confirmar_asignacion", lambda at, n: _boton(at, etiqueta="Confirmar y guardar").click()),
+    ("nav_cierre", _navegar("cierre")),
+    ("cerrar_lote", _cerrar_lote),
+    ("nav_imprimir", _navegar("imprimir")),
+    ("pdf_pendientes", lambda at, n: _boton(at, key="pdf_todos_pendientes").click()),
+    ("nav_reclamos", _navegar("reclamos")),
+    ("nav_inicio", _navegar("inicio")),
+]
+
+
+def _preparar_backend(reclamos: int) -> None:
+    """Escribe el dataset sintético en la carpeta offline de esta corrida"""
+    from utils.datos_sinteticos import escribir_dataset
+    escribir_dataset(dataset(reclamos), os.environ[OFFLINE_ENV_VAR])
+
+
+def correr_sesion(numero: int, informar: Callable[[str], None] = print) -> Dict[str, float]:
+    """Una sesión completa en un AppTest nuevo; devuelve segundos por interacción"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=TIMEOUT)
+    tiempos: Dict[str, float] = {}
+
+    inicio = time.perf_counter()
+    at.run()
+    tiempos["primera_carga"] = time.perf_counter() - inicio
+
+    for nombre, accion in SESION:
+        try:
+            accion(at, numero)
+        except ElementoNoEncontrado as e:
+            informar(f"  sesión {numero}: se omite {nombre} (no se encontró {e})")
+            continue
+        inicio = time.perf_counter()
+        at.run()
+        tiempos[nombre] = time.perf_counter() - inicio
+        if at.exception:
+            informar(f"  sesión {numero}: excepción en {nombre}: {at.exception[0].message}")
+    return tiempos
+
+
+def percentil(valores: List[float], q: float) -> float:
+    ordenados = sorted(valores)
+    posicion = min(len(ordenados) - 1, max(0, round(q * (len(ordenados) - 1))))
+    return ordenados[posicion]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Latencia de reruns de app.py con AppTest")
+    parser.add_argument("--reclamos", type=int, default=10_000)
+    parser.add_argument("--sesiones", type=int, default=5)
+    parser.add_argument("--historial", default=HISTORIAL_PATH)
+    parser.add_argument("--etiqueta", default=None)
+    args = parser.parse_args()
+
+    _preparar_backend(args.reclamos)
+
+    muestras: Dict[str, List[float]] = {}
+    for numero in range(1, args.sesiones + 1):
+        for nombre, segundos in correr_sesion(numero).items():
+            muestras.setdefault(nombre, []).append(segundos)
+
+    print(f"\n{'interacción':<24} {'n':>3} {'p50':>10} {'p90':>10} {'p99':>10}")
+    resultados = {}
+    for nombre, valores in muestras.items():
+        p50, p90, p99 = (percentil(valores, q) for q in (0.5, 0.9, 0.99))
+        print(f"{nombre:<24} {len(valores):>3} {p50 * 1000:>8.0f}ms {p90 * 1000:>8.0f}ms {p99 * 1000:>8.0f}ms")
+        resultados[f"e2e.{nombre}"] = {str(args.reclamos): {
+            "min_s": round(min(valores), 6),
+            "mediana_s": round(p50, 6),
+            "p90_s": round(p90, 6),
+            "p99_s": round(p99, 6),
+            "repeticiones": len(valores),
+        }}
+
+    guardar_corrida(resultados, args.historial, args.etiqueta)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
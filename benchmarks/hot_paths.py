@@ -0,0 +1,116 @@
+# benchmarks/hot_paths.py
+"""
+Benchmarks de los caminos de procesamiento de datos más frecuentes.
+
+Cada función recibe el dataset sintético y devuelve lo que se mide.
+"""
+import copy
+import tempfile
+
+import pandas as pd
+
+from benchmarks.nucleo import benchmark
+from config.settings import WORKSHEET_RECLAMOS, WORKSHEET_CLIENTES, WORKSHEET_NOTIFICACIONES, SHEET_ID
+
+USUARIO = {"username": "admin", "nombre": "Administrador", "rol": "admin"}
+
+
+def _reclamos(datos) -> pd.DataFrame:
+    return datos[WORKSHEET_RECLAMOS]
+
+
+def _clientes(datos) -> pd.DataFrame:
+    return datos[WORKSHEET_CLIENTES]
+
+
+# --- Preparación de datos ---
+
+@benchmark("gestion._preparar_datos")
+def bench_preparar_gestion(datos):
+    from components.reclamos.gestion import _preparar_datos
+    return lambda: _preparar_datos(_reclamos(datos), _clientes(datos))
+
+
+@benchmark("impresion._preparar_datos")
+def bench_preparar_impresion(datos):
+    from components.reclamos.impresion import _preparar_datos
+    return lambda: _preparar_datos(_reclamos(datos), _clientes(datos), USUARIO)
+
+
+# --- Fechas ---
+
+@benchmark("date_utils.parse_fecha")
+def bench_parse_fecha(datos):
+    from utils.date_utils import parse_fecha
+    fechas = _reclamos(datos)["Fecha y hora"].tolist()
+    return lambda: [parse_fecha(f) for f in fechas]
+
+
+@benchmark("date_utils.parse_fechas_series")
+def bench_parse_fechas_series(datos):
+    from utils.date_utils import parse_fechas_series
+    fechas = _reclamos(datos)["Fecha y hora"]
+    return lambda: parse_fechas_series(fechas)
+
+
+@benchmark("date_utils.format_fecha")
+def bench_format_fecha(datos):
+    from utils.date_utils import parse_fecha, format_fecha
+    fechas = [parse_fecha(f) for f in _reclamos(datos)["Fecha y hora"]]
+    return lambda: [format_fecha(f) for f in fechas]
+
+
+# --- Planificación ---
+
+@benchmark("planificacion.distribuir_por_sector_mejorado")
+def bench_distribuir(datos):
+    from components.reclamos.planificacion import distribuir_por_sector_mejorado
+    df = _reclamos(datos)
+    return lambda: distribuir_por_sector_mejorado(df, 4)
+
+
+@benchmark("planificacion._balancear_asignaciones")
+def bench_balancear(datos):
+    from components.reclamos.planificacion import distribuir_por_sector_mejorado, _balancear_asignaciones
+    df = _reclamos(datos)
+    pendientes = df[df["Estado"] == "Pendiente"]
+    inicial = distribuir_por_sector_mejorado(df, 4)
+    # Se balancea sobre una copia: la función modifica las asignaciones
+    return lambda: _balancear_asignaciones(copy.deepcopy(inicial), pendientes)
+
+
+# --- PDFs y reportes ---
+
+@benchmark("impresion._crear_pdf_reclamos", tamanos=[1_000, 10_000])
+def bench_pdf_reclamos(datos):
+    from components.reclamos.impresion import _preparar_datos, _crear_pdf_reclamos
+    df = _preparar_datos(_reclamos(datos), _clientes(datos), USUARIO)
+    pendientes = df[df["Estado"] == "Pendiente"]
+    return lambda: _crear_pdf_reclamos(pendientes, "Reclamos pendientes", USUARIO)
+
+
+@benchmark("reporte_diario.generar_reporte_diario_imagen")
+def bench_reporte_diario(datos):
+    from utils.reporte_diario import generar_reporte_diario_imagen
+    df = _reclamos(datos)
+    return lambda: generar_reporte_diario_imagen(df)
+
+
+# --- Notificaciones ---
+
+@benchmark("notifications.get_for_user")
+def bench_notificaciones(datos):
+    from components.notifications import NotificationManager
+    from utils.almacenamiento_local import ClienteLocal
+    from utils.api_manager import api_manager
+
+    df = datos[WORKSHEET_NOTIFICACIONES]
+    hoja = ClienteLocal(tempfile.mkdtemp(prefix="bench-")).open_by_key(SHEET_ID).add_worksheet(WORKSHEET_NOTIFICACIONES)
+    hoja.reemplazar([list(df.columns)] + df.astype(str).values.tolist())
+    manager = NotificationManager(hoja)
+
+    def correr():
+        # Sin la pausa de rate limiting: se mide el procesamiento, no la espera
+        api_manager.last_call_time = 0
+        return manager.get_for_user("oficina1")
+    return correr
@@ -0,0 +1,169 @@
+# benchmarks/nucleo.py
+"""
+Núcleo de la suite de benchmarks: registro, medición e historial.
+
+Cada benchmark se registra con @benchmark y recibe el conjunto sintético del
+tamaño pedido. Se mide tiempo (varias repeticiones, sin tracemalloc) y, en
+una corrida aparte, el pico de memoria con tracemalloc. Los resultados se
+agregan a un historial JSON para comparar versiones.
+"""
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import LOCAL_DATA_DIR
+
+HISTORIAL_PATH = f"{LOCAL_DATA_DIR}/benchmarks/historial.json"
+UMBRAL_REGRESION = 0.20  # Variación relativa de la mediana que se marca como regresión
+
+_REGISTRO: Dict[str, Dict[str, Any]] = {}
+
+
+def benchmark(nombre: str, tamanos: Optional[List[int]] = None):
+    """
+    Registra un benchmark.
+
+    La función decorada recibe el dataset y devuelve un callable sin
+    argumentos (lo que se mide). Así la preparación queda fuera de la medición.
+
+    Args:
+        nombre: Identificador estable (clave en el historial)
+        tamanos: Tamaños permitidos (None = todos los pedidos en la corrida)
+    """
+    def decorador(preparar: Callable[[Dict], Callable[[], Any]]):
+        _REGISTRO[nombre] = {"preparar": preparar, "tamanos": tamanos}
+        return preparar
+    return decorador
+
+
+def registrados() -> Dict[str, Dict[str, Any]]:
+    return dict(_REGISTRO)
+
+
+@lru_cache(maxsize=4)
+def dataset(reclamos: int, semilla: int = 42):
+    """Dataset sintético memoizado por tamaño (se genera una vez por corrida)"""
+    from utils.datos_sinteticos import generar_dataset
+    return generar_dataset(reclamos, semilla=semilla, fin=datetime(2025, 6, 30, 18, 0))
+
+
+def limpiar_caches() -> None:
+    """Vacía las cachés de la app para que cada repetición mida en frío"""
+    import streamlit as st
+    from utils import pdf_utils, reporte_diario
+
+    st.cache_data.clear()
+    with pdf_utils._cache_lock:
+        pdf_utils._cache_pdf.clear()
+    reporte_diario._render_png.cache_clear()
+
+
+def medir(funcion: Callable[[], Any], repeticiones: int = 5) -> Dict[str, float]:
+    """Tiempo (mín./mediana en segundos) y pico de memoria (MB)"""
+    tiempos = []
+    for _ in range(repeticiones):
+        limpiar_caches()
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    limpiar_caches()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "min_s": round(min(tiempos), 6),
+        "mediana_s": round(statistics.median(tiempos), 6),
+        "pico_mb": round(pico / 1024 / 1024, 3),
+        "repeticiones": repeticiones,
+    }
+
+
+def ejecutar(tamanos: List[int], filtro: Optional[str] = None, repeticiones: int = 5,
+             informar: Callable[[str], None] = print) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Corre los benchmarks registrados para cada tamaño"""
+    resultados: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for nombre, info in sorted(_REGISTRO.items()):
+        if filtro and filtro not in nombre:
+            continue
+        for tamano in tamanos:
+            if info["tamanos"] is not None and tamano not in info["tamanos"]:
+                continue
+            funcion = info["preparar"](dataset(tamano))
+            medicion = medir(funcion, repeticiones)
+            resultados.setdefault(nombre, {})[str(tamano)] = medicion
+            informar(f"{nombre:<40} {tamano:>9,} {medicion['mediana_s'] * 1000:>11.1f} ms {medicion['pico_mb']:>9.1f} MB")
+    return resultados
+
+
+def _commit_actual() -> Optional[str]:
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return salida.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def cargar_historial(path: str = HISTORIAL_PATH) -> List[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def guardar_corrida(resultados: Dict, path: str = HISTORIAL_PATH, etiqueta: Optional[str] = None) -> Dict[str, Any]:
+    """Agrega la corrida al historial (escritura atómica)"""
+    corrida = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "etiqueta": etiqueta,
+        "maquina": {"python": platform.python_version(), "plataforma": platform.platform(), "cpus": os.cpu_count()},
+        "resultados": resultados,
+    }
+    historial = cargar_historial(path) + [corrida]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(historial, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+    return corrida
+
+
+def comparar(actual: Dict, anterior: Dict, umbral: float = UMBRAL_REGRESION) -> List[Dict[str, Any]]:
+    """
+    Compara la mediana de tiempo de cada benchmark/tamaño contra una corrida anterior.
+
+    Returns:
+        Lista de filas con benchmark, tamaño, antes, ahora, variación y si es regresión
+    """
+    filas = []
+    for nombre, por_tamano in actual.items():
+        for tamano, medicion in por_tamano.items():
+            previa = anterior.get(nombre, {}).get(tamano)
+            if not previa or not previa.get("mediana_s"):
+                continue
+            variacion = medicion["mediana_s"] / previa["mediana_s"] - 1
+            filas.append({
+                "benchmark": nombre,
+                "tamano": int(tamano),
+                "antes_ms": round(previa["mediana_s"] * 1000, 1),
+                "ahora_ms": round(medicion["mediana_s"] * 1000, 1),
+                "variacion": round(variacion * 100, 1),
+                "regresion": variacion > umbral,
+            })
+    return filas
@@ -2,145 +2,151 @@
 Componente de autenticación profesional estilo CRM
 Versión mejorada con diseño elegante
 """
+import hashlib
+import json
+import time
 import streamlit as st
-from utils.data_manager import safe_get_sheet_data
-from config.settings import (
-    WORKSHEET_USUARIOS,
-    COLUMNAS_USUARIOS,
-    PERMISOS_POR_ROL
+import streamlit.components.v1 as components
+from utils.credenciales import (
+    autenticar, crear_sesion, leer_sesion, renovar_sesion, revocar_sesion, rotar_sesion, usuario_vigente
 )
-import time
-from utils.styles import get_loading_spinner
+from utils.telemetria import logins
+from config.settings import SESSION_TIMEOUT, SESSION_COOKIE
+
+# Valor de la cookie a escribir en el próximo rerun ("" la borra)
+_COOKIE_PENDIENTE = '_cookie_sesion_pendiente'
+
+def huella_cliente():
+    """Hash de las cabeceras estables del navegador: la sesión no sirve desde otro cliente"""
+    headers = st.context.headers
+    datos = f"{headers.get('User-Agent', '')}|{headers.get('Accept-Language', '')}"
+    return hashlib.sha256(datos.encode('utf-8')).hexdigest()
+
+def _programar_cookie(valor):
+    st.session_state[_COOKIE_PENDIENTE] = valor
+
+def _sincronizar_cookie():
+    """
+    Escribe (o borra) la cookie de sesión en el navegador. Streamlit solo
+    permite leer cookies (st.context.cookies), así que se escriben con un
+    componente HTML sin alto; el identificador nunca pasa por la URL.
+    """
+    valor = st.session_state.pop(_COOKIE_PENDIENTE, None)
+    if valor is None:
+        return
+    max_age = SESSION_TIMEOUT if valor else 0
+    components.html(f"""<script>
+        const seguro = window.parent.location.protocol === "https:" ? "; Secure" : "";
+        window.parent.document.cookie = {json.dumps(SESSION_COOKIE)} + "=" + {json.dumps(valor)}
+            + "; path=/; max-age={max_age}; SameSite=Strict" + seguro;
+    </script>""", height=0)
 
 def init_auth_session():
-    """Inicializa las variables de sesión"""
+    """Inicializa las variables de sesión (retoma la sesión del servidor guardada en la cookie)"""
     if 'auth' not in st.session_state:
         st.session_state.auth = {
             'logged_in': False,
             'user_info': None
         }
+        sesion_id = st.context.cookies.get(SESSION_COOKIE)
+        if not sesion_id:
+            return
+        huella = huella_cliente()
+        sesion = leer_sesion(sesion_id, huella)
+        # Al retomar se cambia el identificador: el de la cookie anterior deja de valer
+        nuevo_id = rotar_sesion(sesion_id, huella) if sesion else None
+        if nuevo_id:
+            # Identidad y rol se completan desde el directorio en validar_sesion
+            st.session_state.auth = {
+                'logged_in': True,
+                'user_info': {'username': sesion['username']},
+                'sesion_id': nuevo_id,
+                'token_exp': int(time.time()) + SESSION_TIMEOUT,
+                'validada': False,
+            }
+            _programar_cookie(nuevo_id)
+            logins.inc(resultado="token")
+        else:
+            _programar_cookie("")
+            logins.inc(resultado="token_invalido")
+
+def _iniciar_sesion(user_info):
+    """Registra la sesión en el servidor y deja solo su identificador en una cookie"""
+    sesion_id = crear_sesion(user_info['username'], huella_cliente())
+    st.session_state.auth = {
+        'logged_in': True,
+        'user_info': user_info,
+        'sesion_id': sesion_id,
+        'token_exp': int(time.time()) + SESSION_TIMEOUT,
+        'validada': True,
+    }
+    _programar_cookie(sesion_id)
+
+def _descartar_sesion():
+    """Vuelve al login sin tocar las cachés compartidas"""
+    st.session_state.auth = {'logged_in': False, 'user_info': None}
+    _programar_cookie("")
+
+def _renovar_token():
+    """
+    Extiende el vencimiento con la actividad (al pasar la mitad del plazo).
+
+    Returns:
+        False si la sesión fue revocada o venció en el servidor
+    """
+    auth = st.session_state.auth
+    sesion = leer_sesion(auth.get('sesion_id'))
+    if sesion is None:
+        return False
+    if sesion['exp'] - time.time() < SESSION_TIMEOUT / 2:
+        exp = renovar_sesion(auth['sesion_id'])
+        if exp is None:
+            return False
+        auth['token_exp'] = exp
+        _programar_cookie(auth['sesion_id'])
+    return True
+
+def validar_sesion(sheet_usuarios):
+    """
+    Confirma en cada rerun que el usuario sigue existiendo y activo en el
+    directorio (cacheado) y actualiza su rol; si no, revoca la sesión.
+    """
+    auth = st.session_state.auth
+    if not auth.get('logged_in'):
+        return False
+    user_info = usuario_vigente(auth['user_info']['username'], sheet_usuarios)
+    if user_info is None:
+        if not auth.get('validada'):
+            logins.inc(resultado="token_invalido")
+        revocar_sesion(auth.get('sesion_id'))
+        _descartar_sesion()
+        _sincronizar_cookie()
+        return False
+    auth['user_info'] = user_info
+    auth['validada'] = True
+    return True
 
 def logout():
-    """Cierra la sesión del usuario"""
+    """Cierra la sesión del usuario (solo el estado de esta sesión: las cachés son compartidas)"""
+    revocar_sesion(st.session_state.get('auth', {}).get('sesion_id'))
+    for clave in list(st.session_state.keys()):
+        del st.session_state[clave]
     st.session_state.auth = {'logged_in': False, 'user_info': None}
-    st.cache_data.clear()  # Limpiar caché de datos
+    _programar_cookie("")
 
 def verify_credentials(username, password, sheet_usuarios):
+    """Verifica usuario y contraseña contra el directorio cacheado"""
     try:
-        df_usuarios = safe_get_sheet_data(sheet_usuarios, COLUMNAS_USUARIOS)
-        
-        # Normalización de datos
-        df_usuarios["username"] = df_usuarios["username"].str.strip().str.lower()
-        df_usuarios["password"] = df_usuarios["password"].astype(str).str.strip()
-        
-        # Manejo flexible de campo 'activo'
-        df_usuarios["activo"] = df_usuarios["activo"].astype(str).str.upper().isin(["SI", "TRUE", "1", "SÍ", "VERDADERO"])
-        
-        usuario = df_usuarios[
-            (df_usuarios["username"] == username.strip().lower()) & 
-            (df_usuarios["password"] == password.strip()) &
-            (df_usuarios["activo"])
-        ]
-        
-        if not usuario.empty:
-            return {
-                "username": usuario.iloc[0]["username"],
-                "nombre": usuario.iloc[0]["nombre"],
-                "rol": usuario.iloc[0]["rol"].lower(),
-                "permisos": PERMISOS_POR_ROL.get(usuario.iloc[0]["rol"].lower(), {}).get('permisos', [])
-            }
+        user_info = autenticar(username, password, sheet_usuarios)
+        logins.inc(resultado="ok" if user_info else "fallido")
+        return user_info
     except Exception as e:
+        logins.inc(resultado="error")
         st.error(f"Error en autenticación: {str(e)}")
     return None
 
 def render_login_form(sheet_usuarios):
     """Formulario de login con diseño profesional CRM"""
-    
-    # CSS personalizado para el login (mantener igual)
-    login_styles = """
-    <style>
-    .login-container {
-        max-width: 400px;
-        margin: 60px auto;
-        padding: 40px;
-        background: var(--bg-card);
-        border-radius: var(--radius-xl);
-        border: 1px solid var(--border-color);
-        box-shadow: var(--shadow-lg);
-        text-align: center;
-    }
-    
-    .login-header {
-        margin-bottom: 30px;
-    }
-    
-    .login-logo {
-        font-size: 3.5rem;
-        margin-bottom: 15px;
-        background: linear-gradient(135deg, #66D9EF 0%, #F92672 30%, #A6E22E 70%, #AE81FF 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-    }
-    
-    .login-title {
-        font-size: 1.8rem;
-        font-weight: 700;
-        margin-bottom: 10px;
-        color: var(--text-primary);
-    }
-    
-    .login-subtitle {
-        color: var(--text-secondary);
-        margin-bottom: 30px;
-        font-size: 0.95rem;
-    }
-    
-    .login-form {
-        text-align: left;
-    }
-    
-    .login-input {
-        margin-bottom: 20px;
-    }
-    
-    .login-button {
-        width: 100%;
-        margin-top: 10px;
-        padding: 12px;
-        font-size: 1rem;
-        font-weight: 600;
-    }
-    
-    .login-footer {
-        margin-top: 30px;
-        padding-top: 20px;
-        border-top: 1px solid var(--border-light);
-        color: var(--text-muted);
-        font-size: 0.85rem;
-    }
-    
-    .login-error {
-        background: rgba(239, 68, 68, 0.1);
-        border: 1px solid rgba(239, 68, 68, 0.3);
-        color: #EF4444;
-        padding: 12px;
-        border-radius: var(--radius-md);
-        margin: 15px 0;
-        text-align: center;
-    }
-    
-    .login-success {
-        background: rgba(16, 185, 129, 0.1);
-        border: 1px solid rgba(16, 185, 129, 0.3);
-        color: #10B981;
-        padding: 12px;
-        border-radius: var(--radius-md);
-        margin: 15px 0;
-        text-align: center;
-    }
-    </style>
-    """
-    
     st.markdown("""
     <div class="login-container">
         <div class="login-header">
@@ -148,124 +154,56 @@ def render_login_form(sheet_usuarios):
         </div>
     """, unsafe_allow_html=True)
     
-    # Inicializar estado de carga
-    if 'login_loading' not in st.session_state:
-        st.session_state.login_loading = False
-    if 'login_attempt' not in st.session_state:
-        st.session_state.login_attempt = False
-    if 'login_username' not in st.session_state:
-        st.session_state.login_username = ""
-    if 'login_password' not in st.session_state:
-        st.session_state.login_password = ""
-    
-    # Mostrar spinner si está cargando
-    if st.session_state.login_loading:
-        st.markdown(get_loading_spinner(), unsafe_allow_html=True)
-        st.markdown("""
-        <div style="text-align: center; margin-top: 20px;">
-            <p style="color: var(--text-secondary);">Verificando credenciales...</p>
-        </div>
-        """, unsafe_allow_html=True)
+    # Formulario de login
+    with st.form("login_formulario"):
+        st.markdown('<div class="login-form">', unsafe_allow_html=True)
+        
+        # Campo de usuario con icono
+        col1, col2 = st.columns([1, 10])
+        with col1:
+            st.markdown('<div class="login-icon">👤</div>', unsafe_allow_html=True)
+        with col2:
+            username = st.text_input("Usuario", placeholder="Ingresa tu usuario", 
+                                   label_visibility="collapsed").strip()
+        
+        # Campo de contraseña con icono
+        col1, col2 = st.columns([1, 10])
+        with col1:
+            st.markdown('<div class="login-icon">🔒</div>', unsafe_allow_html=True)
+        with col2:
+            password = st.text_input("Contraseña", type="password", 
+                                   placeholder="Ingresa tu contraseña", 
+                                   label_visibility="collapsed")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
         
-        # Procesar la autenticación
-        try:
-            user_info = verify_credentials(
-                st.session_state.login_username, 
-                st.session_state.login_password, 
-                sheet_usuarios
-            )
-            
-            if user_info:
-                st.session_state.auth = {
-                    'logged_in': True,
-                    'user_info': user_info
-                }
-                st.session_state.login_loading = False
-                st.session_state.login_attempt = False
-                st.rerun()
+        if st.form_submit_button("🚀 Ingresar al sistema", use_container_width=True):
+            if not username or not password:
+                st.error("⚠️ Usuario y contraseña son requeridos")
             else:
-                st.session_state.login_loading = False
-                st.session_state.login_attempt = True
-                st.rerun()
+                with st.spinner("Verificando credenciales..."):
+                    user_info = verify_credentials(username, password, sheet_usuarios)
                 
-        except Exception as e:
-            st.session_state.login_loading = False
-            st.session_state.login_attempt = True
-            st.error(f"Error en autenticación: {str(e)}")
-            st.rerun()
-    
-    else:
-        # Mostrar mensaje de error si hubo un intento fallido
-        if st.session_state.login_attempt:
-            st.error("❌ Credenciales incorrectas o usuario inactivo")
-            st.session_state.login_attempt = False
-        
-        # Formulario de login
-        with st.form("login_formulario"):
-            st.markdown('<div class="login-form">', unsafe_allow_html=True)
-            
-            # Campo de usuario con icono
-            col1, col2 = st.columns([1, 10])
-            with col1:
-                st.markdown('<div style="font-size: 1.5rem; padding-top: 10px;">👤</div>', unsafe_allow_html=True)
-            with col2:
-                username = st.text_input("Usuario", placeholder="Ingresa tu usuario", 
-                                       value=st.session_state.login_username,
-                                       label_visibility="collapsed").strip()
-            
-            # Campo de contraseña con icono
-            col1, col2 = st.columns([1, 10])
-            with col1:
-                st.markdown('<div style="font-size: 1.5rem; padding-top: 10px;">🔒</div>', unsafe_allow_html=True)
-            with col2:
-                password = st.text_input("Contraseña", type="password", 
-                                       placeholder="Ingresa tu contraseña", 
-                                       value=st.session_state.login_password,
-                                       label_visibility="collapsed")
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            if st.form_submit_button("🚀 Ingresar al sistema", use_container_width=True):
-                if not username or not password:
-                    st.error("⚠️ Usuario y contraseña son requeridos")
-                else:
-                    # Guardar credenciales y activar loading
-                    st.session_state.login_username = username
-                    st.session_state.login_password = password
-                    st.session_state.login_loading = True
+                if user_info:
+                    _iniciar_sesion(user_info)
                     st.rerun()
+                else:
+                    st.error("❌ Credenciales incorrectas o usuario inactivo")
     
     st.markdown("""
         <div class="login-footer">
             <p>© 2025 Fusion CRM • v2.3.0</p>
-            <p style="font-size: 0.8rem; margin-top: 5px;">Sistema optimizado para gestión eficiente</p>
+            <p class="login-footer-note">Sistema optimizado para gestión eficiente</p>
         </div>
     </div>
     """, unsafe_allow_html=True)
-    
-    # Procesar login después del render
-    if st.session_state.login_loading:
-        time.sleep(0.5)  # Pequeña pausa para el efecto visual
-        user_info = verify_credentials(username, password, sheet_usuarios)
-        
-        if user_info:
-            st.session_state.auth = {
-                'logged_in': True,
-                'user_info': user_info
-            }
-            st.session_state.login_loading = False
-            st.success(f"✅ Bienvenido, {user_info['nombre']}!")
-            time.sleep(1)
-            st.rerun()
-        else:
-            st.session_state.login_loading = False
-            st.error("❌ Credenciales incorrectas o usuario inactivo")
-            time.sleep(2)
-            st.rerun()
 
 def check_authentication():
     """Verifica si el usuario está autenticado"""
     init_auth_session()
+    if st.session_state.auth['logged_in'] and not _renovar_token():
+        _descartar_sesion()
+    _sincronizar_cookie()
     return st.session_state.auth['logged_in']
 
 def auth_has_permission(required_permission):
@@ -4,6 +4,7 @@ import pandas as pd
 import uuid
 from utils.date_utils import ahora_argentina, format_fecha, parse_fecha
 from utils.api_manager import api_manager, batch_update_sheet
+from utils.perfilado import perfilar_render
 from config.settings import SECTORES_DISPONIBLES
 
 # --- FUNCIONES HELPER NUEVAS ---
@@ -36,6 +37,7 @@ def _obtener_indice_sector(sector_actual, sectores_disponibles):
         return 0
 
 # --- FUNCIÓN PRINCIPAL CORREGIDA ---
+@perfilar_render
 def render_gestion_clientes(df_clientes, df_reclamos, sheet_clientes, user_role):
     """
     Muestra la sección de gestión de clientes
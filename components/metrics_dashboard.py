@@ -4,49 +4,53 @@ Versión 3.0 - Diseño tipo CRM con tarjetas elegantes
 """
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
+from utils.date_utils import ahora_argentina
+from utils.tiempos_resolucion import percentiles_resolucion, DIMENSIONES_RESOLUCION
+from config.settings import RESOLUCION_PRECISION
+from utils.metricas_cubo import cubo_sincronizado
+from utils.series_kpi import tendencias_dashboard
 
-def metric_card(value, label, icon, trend=None, delta=None):
-    """Componente de tarjeta de métrica profesional"""
+SECCION_ESTADOS = "<div class='section-title'><h4>📊 Distribución por Estado</h4></div>"
+
+def metric_card(value, label, icon, trend=None, delta=None, delta_label=None):
+    """Componente de tarjeta de métrica profesional (delta_label: qué mide la variación si no es el valor)"""
     
-    trend_html = f"""
-    <div style='display: flex; align-items: center; justify-content: center; gap: 0.25rem; font-size: 0.8rem; margin-top: 0.25rem;'>
-        <span style='color: {"var(--success-color)" if (delta or 0) >= 0 else "var(--danger-color)"}'>
-            {"↗️" if (delta or 0) >= 0 else "↘️"} {abs(delta or 0)}%
-        </span>
-    </div>
-    """ if trend and delta is not None else ""
+    trend_html = ""
+    if trend and delta is not None:
+        sube = (delta or 0) >= 0
+        trend_html = (
+            f"<div class='metric-trend {'metric-trend-up' if sube else 'metric-trend-down'}'>"
+            f"{'↗️' if sube else '↘️'} {abs(delta or 0)}%{f' {delta_label}' if delta_label else ''}</div>"
+        )
     
-    return f"""
-    <div class='card' style='text-align: center; padding: 1.5rem 1rem; margin: 0;'>
-        <div style='font-size: 2.5rem; margin-bottom: 0.5rem; color: var(--primary-color);'>{icon}</div>
-        <div style='font-size: 2rem; font-weight: 700; color: var(--text-primary); line-height: 1;'>{value}</div>
-        <div style='color: var(--text-secondary); font-size: 0.9rem; margin: 0.5rem 0;'>{label}</div>
-        {trend_html}
-    </div>
-    """
+    return (
+        "<div class='card metric-card metric-card-compact'>"
+        f"<div class='metric-icon'>{icon}</div>"
+        f"<div class='metric-value'>{value}</div>"
+        f"<div class='metric-label'>{label}</div>"
+        f"{trend_html}"
+        "</div>"
+    )
 
 def status_badge(status, count):
     """Badge de estado para métricas"""
     status_config = {
-        "Pendiente": {"color": "var(--warning-color)", "icon": "⏳"},
-        "En curso": {"color": "var(--info-color)", "icon": "🔧"},
-        "Resuelto": {"color": "var(--success-color)", "icon": "✅"},
-        "Desconexión": {"color": "var(--danger-color)", "icon": "🔌"},
-        "Cerrado": {"color": "var(--text-muted)", "icon": "🔒"}
+        "Pendiente": {"clase": "status-pendiente", "icon": "⏳"},
+        "En curso": {"clase": "status-en-curso", "icon": "🔧"},
+        "Resuelto": {"clase": "status-resuelto", "icon": "✅"},
+        "Desconexión": {"clase": "status-desconexion", "icon": "🔌"},
+        "Cerrado": {"clase": "", "icon": "🔒"}
     }
     
-    config = status_config.get(status, {"color": "var(--text-muted)", "icon": "❓"})
+    config = status_config.get(status, {"clase": "", "icon": "❓"})
     
-    return f"""
-    <div style='display: flex; align-items: center; justify-content: space-between; padding: 0.75rem; background: {config["color"]}15; border-radius: var(--radius-md); border: 1px solid {config["color"]}30; margin: 0.25rem 0;'>
-        <span style='display: flex; align-items: center; gap: 0.5rem;'>
-            <span style='color: {config["color"]};'>{config["icon"]}</span>
-            <span style='color: var(--text-primary);'>{status}</span>
-        </span>
-        <span style='font-weight: 600; color: {config["color"]};'>{count}</span>
-    </div>
-    """
+    return (
+        f"<div class='status-badge {config['clase']}'>"
+        f"<span class='status-badge-label'><span>{config['icon']}</span><span>{status}</span></span>"
+        f"<span class='status-badge-count'>{count}</span>"
+        "</div>"
+    )
 
 def render_metrics_dashboard(df_reclamos, is_mobile=False):
     """Renderiza el dashboard de métricas profesional"""
@@ -55,32 +59,27 @@ def render_metrics_dashboard(df_reclamos, is_mobile=False):
             st.warning("No hay datos de reclamos para mostrar")
             return
 
-        df_metricas = df_reclamos.copy()
+        cubo = cubo_sincronizado(df_reclamos)
+        tendencias = tendencias_dashboard(df_reclamos)
 
         # Procesamiento de datos
-        df_activos = df_metricas[df_metricas["Estado"].isin(["Pendiente", "En curso"])]
-        total_activos = len(df_activos)
-        pendientes = len(df_activos[df_activos["Estado"] == "Pendiente"])
-        en_curso = len(df_activos[df_activos["Estado"] == "En curso"])
-        resueltos = len(df_metricas[df_metricas["Estado"] == "Resuelto"])
-        desconexiones = df_metricas["Estado"].str.strip().str.lower().eq("desconexión").sum()
+        pendientes = cubo.contar(estado="Pendiente")
+        en_curso = cubo.contar(estado="En curso")
+        total_activos = pendientes + en_curso
+        resueltos = cubo.contar(estado="Resuelto")
+        desconexiones = cubo.contar(estado="Desconexión")
         
         # Calcular porcentajes para tendencias
-        total_reclamos = len(df_metricas)
+        total_reclamos = cubo.total
         porcentaje_activos = (total_activos / total_reclamos * 100) if total_reclamos > 0 else 0
         porcentaje_resueltos = (resueltos / total_reclamos * 100) if total_reclamos > 0 else 0
 
         # Header del dashboard
-        st.markdown("""
-        <div style="margin: 2rem 0 1.5rem 0;">
-            <h2 style="display: flex; align-items: center; gap: 0.5rem; margin: 0;">
-                <span>📈</span> Dashboard de Métricas
-            </h2>
-            <p style="color: var(--text-secondary); margin: 0.5rem 0 0 0;">
-                Resumen general de la gestión de reclamos
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(
+            "<div class='dashboard-header'><h2><span>📈</span> Dashboard de Métricas</h2>"
+            "<p>Resumen general de la gestión de reclamos</p></div>",
+            unsafe_allow_html=True
+        )
 
         # Diseño responsive
         if is_mobile:
@@ -88,19 +87,15 @@ def render_metrics_dashboard(df_reclamos, is_mobile=False):
             col1, col2 = st.columns(2)
             
             with col1:
-                st.markdown(metric_card(total_activos, "Activos", "📄", delta=12), unsafe_allow_html=True)
+                st.markdown(metric_card(total_activos, "Activos", "📄", trend=True, delta=tendencias["backlog"]), unsafe_allow_html=True)
                 st.markdown(metric_card(en_curso, "En Curso", "🔧"), unsafe_allow_html=True)
                 
             with col2:
-                st.markdown(metric_card(pendientes, "Pendientes", "⏳", delta=-5), unsafe_allow_html=True)
-                st.markdown(metric_card(resueltos, "Resueltos", "✅", delta=8), unsafe_allow_html=True)
+                st.markdown(metric_card(pendientes, "Pendientes", "⏳", trend=True, delta=tendencias["ingresos"], delta_label="nuevos"), unsafe_allow_html=True)
+                st.markdown(metric_card(resueltos, "Resueltos", "✅", trend=True, delta=tendencias["resueltos"]), unsafe_allow_html=True)
                 
             # Sección de estados
-            st.markdown("""
-            <div style="margin-top: 1.5rem;">
-                <h4 style="margin: 0 0 1rem 0; color: var(--text-primary);">📊 Distribución por Estado</h4>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(SECCION_ESTADOS, unsafe_allow_html=True)
             
             st.markdown(status_badge("Pendiente", pendientes), unsafe_allow_html=True)
             st.markdown(status_badge("En curso", en_curso), unsafe_allow_html=True)
@@ -113,13 +108,13 @@ def render_metrics_dashboard(df_reclamos, is_mobile=False):
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.markdown(metric_card(total_activos, "Reclamos Activos", "📄", delta=12), unsafe_allow_html=True)
+                st.markdown(metric_card(total_activos, "Reclamos Activos", "📄", trend=True, delta=tendencias["backlog"]), unsafe_allow_html=True)
             with col2:
-                st.markdown(metric_card(pendientes, "Pendientes", "⏳", delta=-5), unsafe_allow_html=True)
+                st.markdown(metric_card(pendientes, "Pendientes", "⏳", trend=True, delta=tendencias["ingresos"], delta_label="nuevos"), unsafe_allow_html=True)
             with col3:
                 st.markdown(metric_card(en_curso, "En Curso", "🔧"), unsafe_allow_html=True)
             with col4:
-                st.markdown(metric_card(resueltos, "Resueltos", "✅", delta=8), unsafe_allow_html=True)
+                st.markdown(metric_card(resueltos, "Resueltos", "✅", trend=True, delta=tendencias["resueltos"]), unsafe_allow_html=True)
             
             # Segunda fila de métricas
             col5, col6, col7, col8 = st.columns(4)
@@ -134,11 +129,7 @@ def render_metrics_dashboard(df_reclamos, is_mobile=False):
                 st.markdown(metric_card(total_reclamos, "Total Reclamos", "📋"), unsafe_allow_html=True)
             
             # Sección de estados en columnas
-            st.markdown("""
-            <div style="margin: 2rem 0 1rem 0;">
-                <h4 style="margin: 0 0 1rem 0; color: var(--text-primary);">📊 Distribución por Estado</h4>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(SECCION_ESTADOS, unsafe_allow_html=True)
             
             estado_col1, estado_col2, estado_col3, estado_col4 = st.columns(4)
             
@@ -152,13 +143,37 @@ def render_metrics_dashboard(df_reclamos, is_mobile=False):
                 if desconexiones > 0:
                     st.markdown(status_badge("Desconexión", desconexiones), unsafe_allow_html=True)
                 else:
-                    st.markdown("""
-                    <div style='padding: 0.75rem; background: var(--bg-surface); border-radius: var(--radius-md); border: 1px solid var(--border-color); text-align: center; color: var(--text-muted);'>
-                        No hay desconexiones
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown("<div class='empty-state'>No hay desconexiones</div>", unsafe_allow_html=True)
+
 
     except Exception as e:
         st.error(f"Error al mostrar métricas: {str(e)}")
         if st.session_state.get('DEBUG_MODE', False):
-            st.exception(e)
\ No newline at end of file
+            st.exception(e)
+
+def render_tiempos_resolucion(df_reclamos):
+    """Percentiles de tiempo de resolución para un rango de fechas"""
+    with st.expander("⏱️ Tiempos de resolución (p50 / p90 / p99)"):
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            dimension = st.selectbox(
+                "Agrupar por:",
+                list(DIMENSIONES_RESOLUCION),
+                format_func=lambda d: DIMENSIONES_RESOLUCION[d],
+                key="resolucion_dimension"
+            )
+        with col2:
+            hoy = ahora_argentina().date()
+            rango = st.date_input(
+                "Cerrados entre:",
+                value=(hoy - timedelta(days=30), hoy),
+                key="resolucion_rango"
+            )
+
+        desde, hasta = (rango if isinstance(rango, (list, tuple)) and len(rango) == 2 else (None, None))
+        tabla = percentiles_resolucion(df_reclamos, dimension, desde, hasta)
+        if tabla.empty:
+            st.info("No hay reclamos resueltos en el rango seleccionado.")
+        else:
+            st.dataframe(tabla, use_container_width=True, hide_index=True)
+            st.caption(f"Horas desde la carga hasta el cierre. Precisión relativa de los percentiles: ±{RESOLUCION_PRECISION:.0%}.")
@@ -2,14 +2,15 @@
 
 import streamlit as st
 import pandas as pd
-import time
 from datetime import datetime, timedelta
-from utils.date_utils import ahora_argentina, format_fecha
+from utils.date_utils import ahora_argentina
 from utils.api_manager import api_manager
 from utils.data_manager import safe_get_sheet_data, batch_update_sheet
-from config.settings import NOTIFICATION_TYPES, COLUMNAS_NOTIFICACIONES, MAX_NOTIFICATIONS
+from utils.notificaciones import agregar_notificacion
+from utils.telemetria import cache_medida
+from config.settings import COLUMNAS_NOTIFICACIONES, MAX_NOTIFICATIONS
 
-@st.cache_data(ttl=10)
+@cache_medida("get_cached_notifications", st.cache_data(ttl=10))
 def get_cached_notifications(username, unread_only=True, limit=MAX_NOTIFICATIONS):
     return st.session_state.notification_manager.get_for_user(username, unread_only, limit)
 
@@ -18,72 +19,18 @@ class NotificationManager:
         self.sheet = sheet_notifications
         self.max_retries = 3
 
-    def _get_next_id(self):
-        for _ in range(self.max_retries):
-            try:
-                df = safe_get_sheet_data(self.sheet, COLUMNAS_NOTIFICACIONES)
-                return 1 if df.empty else int(df['ID'].max()) + 1
-            except Exception as e:
-                st.error(f"Error al obtener ID: {str(e)}")
-                time.sleep(1)
-        return None
-
     def add(self, notification_type, message, user_target='all', claim_id=None, action=None):
         """
-        Agrega una notificación general para todos los usuarios ('all')
-        con límite de 10 en total.
+        Agrega una notificación (las globales, 'all', con un máximo de
+        NOTIFICACIONES_MAX_GLOBALES; ver utils.notificaciones).
         """
-        if notification_type not in NOTIFICATION_TYPES:
-            raise ValueError(f"Tipo de notificación no válido: {notification_type}. Opciones: {list(NOTIFICATION_TYPES.keys())}")
-
-        try:
-            # Obtener todas las notificaciones actuales dirigidas a 'all'
-            df_notif = safe_get_sheet_data(self.sheet, COLUMNAS_NOTIFICACIONES)
-            df_all = df_notif[df_notif['Usuario_Destino'] == 'all']
-
-            if len(df_all) >= 10:
-                df_all['Fecha_Hora'] = pd.to_datetime(df_all['Fecha_Hora'], errors='coerce')
-                mas_antigua = df_all.sort_values('Fecha_Hora').iloc[0]
-                row_id = df_all.index[0]
-                self._delete_rows([row_id])
-
-            return self._agregar_notificacion_individual(
-                notification_type, message, 'all', claim_id, action
-            )
-
-        except Exception as e:
-            st.error(f"Error al agregar notificación global: {str(e)}")
-            return False
-
-
-    def _agregar_notificacion_individual(self, notification_type, message, user_target, claim_id=None, action=None):
-        new_id = self._get_next_id()
-        if new_id is None:
-            return False
-
-        new_notification = [
-            new_id,
-            notification_type,
-            NOTIFICATION_TYPES[notification_type]['priority'],
-            message,
-            str(user_target),
-            str(claim_id) if claim_id else "",
-            format_fecha(ahora_argentina()),
-            False,
-            action or ""
-        ]
-
-        for attempt in range(self.max_retries):
-            success, error = api_manager.safe_sheet_operation(
-                self.sheet.append_row,
-                new_notification
-            )
-            if success:
-                return True
-            time.sleep(1)
-
-        st.error(f"Fallo al agregar notificación para {user_target}")
-        return False
+        ok, error = agregar_notificacion(
+            self.sheet, notification_type, message, user_target, claim_id, action,
+            reintentos=self.max_retries
+        )
+        if not ok:
+            st.error(f"Error al agregar notificación: {error}")
+        return ok
 
     def get_for_user(self, username, unread_only=True, limit=MAX_NOTIFICATIONS):
         try:
@@ -0,0 +1,44 @@
+# components/panel_api.py
+"""
+Panel de depuración de la API (solo con DEBUG_MODE): costo del rerun actual,
+carga promedio por página y exportación del log de trazas.
+"""
+import pandas as pd
+import streamlit as st
+
+from utils.trazas_api import registro_trazas, rerun_actual
+
+
+def render_panel_api():
+    """Resumen de llamadas a Google Sheets en el sidebar"""
+    rerun = rerun_actual()
+    resumen = registro_trazas.resumir(registro_trazas.trazas(rerun=rerun)) if rerun else None
+
+    with st.sidebar.expander("🛰️ API · trazas", expanded=False):
+        if resumen:
+            st.caption(f"Rerun #{rerun} (hasta este punto del script)")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Llamadas", resumen["llamadas"])
+            col2.metric("KB", f"{resumen['bytes'] / 1024:.0f}")
+            col3.metric("ms", f"{resumen['latencia_ms']:.0f}")
+            if resumen["espera_ms"]:
+                st.caption(f"⏳ Espera por rate limiting: {resumen['espera_ms']:.0f} ms")
+            if resumen["por_operacion"]:
+                st.dataframe(
+                    pd.DataFrame.from_dict(resumen["por_operacion"], orient="index"),
+                    use_container_width=True
+                )
+
+        por_pagina = registro_trazas.resumen_por_pagina()
+        if por_pagina:
+            st.caption("Promedio por rerun de cada página")
+            st.dataframe(pd.DataFrame.from_dict(por_pagina, orient="index"), use_container_width=True)
+
+        formato = st.radio("Formato", ["jsonl", "csv"], horizontal=True, key="trazas_formato")
+        st.download_button(
+            "⬇️ Exportar trazas",
+            data=registro_trazas.exportar(formato),
+            file_name=f"trazas_api.{formato}",
+            mime="application/json" if formato == "jsonl" else "text/csv",
+            use_container_width=True
+        )
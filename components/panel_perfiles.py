@@ -0,0 +1,55 @@
+# components/panel_perfiles.py
+"""
+Panel de depuración de renderizado (solo con DEBUG_MODE): tiempos por
+componente y perfil a pedido de la próxima ejecución.
+"""
+import os
+
+import pandas as pd
+import streamlit as st
+
+from utils.perfilado import (
+    estadisticas_render, reiniciar_estadisticas, solicitar_perfil, ultimo_perfil
+)
+
+COMPONENTES = [
+    "render_nuevo_reclamo",
+    "render_gestion_reclamos",
+    "render_cierre_reclamos",
+    "render_planificacion_grupos",
+    "render_impresion_reclamos",
+    "render_gestion_clientes",
+    "render_resumen_jornada",
+]
+
+
+def render_panel_perfiles():
+    """Tiempos de render por componente en el sidebar"""
+    with st.sidebar.expander("⏱️ Render · perfiles", expanded=False):
+        estadisticas = estadisticas_render()
+        if estadisticas:
+            st.dataframe(pd.DataFrame.from_dict(estadisticas, orient="index"), use_container_width=True)
+            if st.button("Reiniciar estadísticas", key="perfil_reiniciar", use_container_width=True):
+                reiniciar_estadisticas()
+        else:
+            st.caption("Todavía no hay ejecuciones medidas")
+
+        componente = st.selectbox("Componente", COMPONENTES, key="perfil_componente")
+        motor = st.radio("Motor", ["cprofile", "pyinstrument"], horizontal=True, key="perfil_motor")
+        if st.button("Perfilar próxima ejecución", key="perfil_pedir", use_container_width=True):
+            solicitar_perfil(componente, motor)
+            st.caption("Se perfilará la próxima vez que se muestre el componente")
+
+        perfil = ultimo_perfil(componente)
+        if perfil:
+            st.caption(f"Último perfil ({perfil['motor']}): {os.path.basename(perfil['ruta'])}")
+            st.code(perfil["resumen"], language="text")
+            if os.path.exists(perfil["ruta"]):
+                with open(perfil["ruta"], "rb") as f:
+                    st.download_button(
+                        "⬇️ Descargar perfil",
+                        data=f.read(),
+                        file_name=os.path.basename(perfil["ruta"]),
+                        use_container_width=True,
+                        key="perfil_descargar"
+                    )
@@ -1,38 +1,25 @@
 # components/reclamos/cierre.py
 
-import time
 from datetime import datetime
 import pytz
 import pandas as pd
 import streamlit as st
 
-from utils.date_utils import format_fecha, ahora_argentina, parse_fecha
-from utils.api_manager import api_manager
-from utils.data_manager import batch_update_sheet
+from utils.date_utils import format_fecha, parse_fecha
+from utils.perfilado import perfilar_render
+from utils.escritura_versionada import agregar_aviso, avisar_conflictos, describir_resultado
+from utils.transiciones_reclamos import cerrar_reclamos, reabrir_reclamos, reasignar_reclamos
 from config.settings import (
     SECTORES_DISPONIBLES,
     TECNICOS_DISPONIBLES,
-    COLUMNAS_RECLAMOS,
     DEBUG_MODE
 )
 
-# === Helpers para mapear nombre de columna -> letra de Excel ===
-def _excel_col_letter(n: int) -> str:
-    letters = ""
-    while n:
-        n, rem = divmod(n - 1, 26)
-        letters = chr(65 + rem) + letters
-    return letters
-
-def _col_letter(col_name: str) -> str:
-    # Usa la lista oficial de columnas de la app
-    idx = COLUMNAS_RECLAMOS.index(col_name) + 1
-    return _excel_col_letter(idx)
-
 def mostrar_overlay_cargando(mensaje="Procesando..."):
     """Muestra un spinner simple de Streamlit"""
     return st.spinner(mensaje)
 
+@perfilar_render
 def render_cierre_reclamos(df_reclamos, df_clientes, sheet_reclamos, sheet_clientes, user):
     result = {
         'needs_refresh': False,
@@ -40,15 +27,6 @@ def render_cierre_reclamos(df_reclamos, df_clientes, sheet_reclamos, sheet_clien
         'data_updated': False
     }
     
-    # 🚩 Si venimos de un cambio (resuelto/pendiente), forzar refresh de datos
-    if st.session_state.get('force_refresh'):
-        st.session_state['force_refresh'] = False
-        return {
-            'needs_refresh': True,
-            'message': 'Datos actualizados',
-            'data_updated': True
-        }
-
     st.subheader("✅ Cierre de reclamos en curso")
 
     try:
@@ -129,23 +107,16 @@ def _mostrar_reasignacion_tecnico(df_reclamos, sheet_reclamos):
     if st.button("💾 Guardar nuevo técnico", key="guardar_tecnico"):
         with st.spinner("Actualizando técnico..."):
             try:
-                fila_index = reclamo.name + 2
                 nuevo_tecnico = ", ".join(nuevo_tecnico_multiselect).upper()
 
-                col_tecnico = _col_letter("Técnico")
-                col_estado  = _col_letter("Estado")
-
-                updates = [{"range": f"{col_tecnico}{fila_index}", "values": [[nuevo_tecnico]]}]
-                if reclamo['Estado'] == "Pendiente":
-                    updates.append({"range": f"{col_estado}{fila_index}", "values": [["En curso"]]})
-
-                success, error = api_manager.safe_sheet_operation(
-                    batch_update_sheet,
-                    sheet_reclamos,
-                    updates,
-                    is_batch=True
+                pendientes = [reclamo["ID Reclamo"]] if reclamo['Estado'] == "Pendiente" else []
+                resultado, error = reasignar_reclamos(
+                    sheet_reclamos, [reclamo["ID Reclamo"]], nuevo_tecnico, pendientes
                 )
-                
+                if avisar_conflictos(resultado):
+                    return True
+                success = not error
+
                 if success:
                     st.success("✅ Técnico actualizado correctamente.")
                     if 'notification_manager' in st.session_state and nuevo_tecnico:
@@ -228,157 +199,125 @@ def _mostrar_reclamos_en_curso(df_reclamos, df_clientes, sheet_reclamos, sheet_c
         ]
 
     st.write("### 📋 Reclamos en curso:")
-    df_mostrar = en_curso[[
+
+    # Precinto actual de cada cliente (por Nº Cliente) y su ID para propagar cambios
+    clientes = df_clientes.assign(**{"Nº Cliente": df_clientes["Nº Cliente"].astype(str).str.strip()})
+    clientes = clientes.drop_duplicates("Nº Cliente").set_index("Nº Cliente")
+
+    df_editor = en_curso[[
+        "ID Reclamo",
         "Fecha y hora",       # ingreso
-        "Fecha_formateada",   # cierre
         "Nº Cliente",
         "Nombre",
         "Sector",
         "Tipo de reclamo",
         "Técnico"
-    ]].copy()
-
-    df_mostrar = df_mostrar.rename(columns={
-        "Fecha y hora": "Ingreso",
-        "Fecha_formateada": "Cierre"
-    })
-
-    st.dataframe(df_mostrar, use_container_width=True, height=400,
-                column_config={
-                    "Ingreso": st.column_config.TextColumn("Ingreso", help="Fecha de ingreso"),
-                    "Cierre": st.column_config.TextColumn("Cierre", help="Fecha de cierre (si está resuelto)"),
-                    "Sector": st.column_config.TextColumn("Sector", help="Número de sector asignado")
-                })
-
-    st.markdown("### ✏️ Acciones por reclamo:")
-    
-    cambios = False
-    
-    for i, row in en_curso.iterrows():
-        with st.container():
-            col1, col2, col3 = st.columns([3, 1, 1])
-
-            with col1:
-                st.markdown(f"**#{row['Nº Cliente']} - {row['Nombre']}**")
-                st.markdown(f"📅 Ingreso: {format_fecha(row['Fecha y hora'])}")
-                st.markdown(f"📅 Cierre: {row.get('Fecha_formateada', '') or '—'}")
-                st.markdown(f"📍 Sector: {row.get('Sector', 'N/A')}")
-                st.markdown(f"📌 {row['Tipo de reclamo']}")
-                st.markdown(f"👷 {row['Técnico']}")
-
-                cliente_id = str(row["Nº Cliente"]).strip()
-                cliente_info = df_clientes[df_clientes["Nº Cliente"] == cliente_id]
-                precinto_actual = cliente_info["N° de Precinto"].values[0] if not cliente_info.empty else ""
-
-                nuevo_precinto = st.text_input("🔒 Precinto", value=precinto_actual, key=f"precinto_{i}")
-
-            with col2:
-                if st.button("✅ Resuelto", key=f"resolver_{row['ID Reclamo']}", use_container_width=True):
-                    if _cerrar_reclamo(row, nuevo_precinto, precinto_actual, cliente_info, sheet_reclamos, sheet_clientes):
-                        # Guardar el filtro actual antes del rerun
-                        st.session_state.filtro_tecnicos_persistente = tecnicos_seleccionados
-                        st.session_state.force_refresh = True
-                        st.rerun()
-
-            with col3:
-                if st.button("↩️ Pendiente", key=f"volver_{row['ID Reclamo']}", use_container_width=True):
-                    if _volver_a_pendiente(row, sheet_reclamos):
-                        # Guardar el filtro actual antes del rerun
-                        st.session_state.filtro_tecnicos_persistente = tecnicos_seleccionados
-                        st.session_state.force_refresh = True
-                        st.rerun()
-
-            st.divider()
-    
-    return cambios
-
-def _cerrar_reclamo(row, nuevo_precinto, precinto_actual, cliente_info, sheet_reclamos, sheet_clientes):
-    try:
-        with st.spinner("Cerrando reclamo..."):
-            time.sleep(1)
-            fila_index = row.name + 2
-
-            col_estado           = _col_letter("Estado")
-            col_fecha_formateada = _col_letter("Fecha_formateada")
-            col_precinto         = _col_letter("N° de Precinto")
+    ]].drop_duplicates("ID Reclamo").set_index("ID Reclamo")
+    df_editor["Fecha y hora"] = df_editor["Fecha y hora"].apply(format_fecha)
+    df_editor["Precinto"] = df_editor["Nº Cliente"].map(clientes["N° de Precinto"]).fillna("").astype(str)
+    df_editor.insert(0, "Seleccionar", False)
+    df_editor = df_editor.rename(columns={"Fecha y hora": "Ingreso"})
+
+    # Todo en un formulario: seleccionar y editar precintos no dispara reruns
+    with st.form("acciones_en_curso"):
+        editado = st.data_editor(
+            df_editor,
+            use_container_width=True,
+            height=400,
+            hide_index=True,
+            disabled=["Ingreso", "Nº Cliente", "Nombre", "Sector", "Tipo de reclamo", "Técnico"],
+            column_config={
+                "Seleccionar": st.column_config.CheckboxColumn("✔", help="Incluir en la acción"),
+                "Ingreso": st.column_config.TextColumn("Ingreso", help="Fecha de ingreso"),
+                "Sector": st.column_config.TextColumn("Sector", help="Número de sector asignado"),
+                "Precinto": st.column_config.TextColumn("🔒 Precinto", help="Se guarda al resolver")
+            },
+            key="editor_en_curso"
+        )
+
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            accion = st.radio(
+                "✏️ Acción",
+                ["✅ Resuelto", "↩️ Pendiente", "👷 Reasignar técnico"],
+                horizontal=True,
+                key="accion_en_curso"
+            )
+            todos = st.checkbox(f"Aplicar a los {len(df_editor)} reclamos filtrados", key="todos_en_curso")
+        with col2:
+            nuevos_tecnicos = st.multiselect(
+                "👷 Técnicos (solo para reasignar)",
+                options=TECNICOS_DISPONIBLES,
+                key="tecnicos_en_curso"
+            )
 
-            fecha_resolucion = ahora_argentina().strftime('%d/%m/%Y %H:%M')
+        aplicar = st.form_submit_button("💾 Aplicar a los seleccionados", use_container_width=True)
 
-            updates = [
-                {"range": f"{col_estado}{fila_index}", "values": [["Resuelto"]]},
-                {"range": f"{col_fecha_formateada}{fila_index}", "values": [[fecha_resolucion]]},
-            ]
+    if not aplicar:
+        return False
 
-            if nuevo_precinto.strip() and nuevo_precinto != precinto_actual:
-                updates.append({"range": f"{col_precinto}{fila_index}", "values": [[nuevo_precinto.strip()]]})
+    seleccion = editado if todos else editado[editado["Seleccionar"]]
+    if seleccion.empty:
+        st.warning("⚠️ No hay reclamos seleccionados.")
+        return False
 
-            success, error = api_manager.safe_sheet_operation(
-                batch_update_sheet,
-                sheet_reclamos,
-                updates,
-                is_batch=True
-            )
-            
-            if success:
-                if nuevo_precinto.strip() and nuevo_precinto != precinto_actual and not cliente_info.empty:
-                    index_cliente_en_clientes = cliente_info.index[0] + 2
-                    success_precinto, error_precinto = api_manager.safe_sheet_operation(
-                        sheet_clientes.update,
-                        f"F{index_cliente_en_clientes}",
-                        [[nuevo_precinto.strip()]]
+    ids = list(seleccion.index)
+    with st.spinner(f"Actualizando {len(ids)} reclamo(s)..."):
+        try:
+            if accion == "✅ Resuelto":
+                # Solo se propagan los precintos que el operador cambió
+                precintos = {
+                    id_reclamo: str(precinto)
+                    for id_reclamo, precinto in seleccion["Precinto"].items()
+                    if str(precinto or "").strip() and str(precinto) != df_editor.at[id_reclamo, "Precinto"]
+                }
+                ids_clientes = seleccion["Nº Cliente"].map(clientes["ID Cliente"]).dropna()
+                resultado, error = cerrar_reclamos(
+                    sheet_reclamos, sheet_clientes, ids,
+                    precintos=precintos,
+                    clientes={i: str(c).strip() for i, c in ids_clientes.items()}
+                )
+                # Los reclamos ya están cerrados: una falla en Clientes es un aviso, no un error
+                resultado_clientes = resultado["clientes"]
+                if resultado["error_clientes"]:
+                    agregar_aviso(
+                        f"Precinto guardado en reclamo pero no en hoja de clientes: {resultado['error_clientes']}"
                     )
-                    if not success_precinto:
-                        st.warning(f"⚠️ Precinto guardado en reclamo pero no en hoja de clientes: {error_precinto}")
-
-                st.success(f"🟢 Reclamo de {row['Nombre']} cerrado correctamente. Fecha cierre: {fecha_resolucion}")
-                return True
+                elif resultado_clientes and describir_resultado(resultado_clientes):
+                    agregar_aviso(
+                        f"Precinto guardado en reclamo pero no en hoja de clientes: {describir_resultado(resultado_clientes)}"
+                    )
+            elif accion == "↩️ Pendiente":
+                resultado, error = reabrir_reclamos(sheet_reclamos, ids)
             else:
-                st.error(f"❌ Error al actualizar: {error}")
-                if DEBUG_MODE:
-                    st.write("Detalles del error:", error)
-    except Exception as e:
-        st.error(f"❌ Error inesperado: {str(e)}")
-        if DEBUG_MODE:
-            st.exception(e)
-
-    return False
+                if not nuevos_tecnicos:
+                    st.warning("⚠️ Elegí al menos un técnico para reasignar.")
+                    return False
+                tecnicos_str = ", ".join(nuevos_tecnicos).upper()
+                resultado, error = reasignar_reclamos(sheet_reclamos, ids, tecnicos_str)
+                if not error and resultado["escritos"] and 'notification_manager' in st.session_state:
+                    st.session_state.notification_manager.add(
+                        notification_type="reclamo_asignado",
+                        message=f"📌 Se reasignaron {len(resultado['escritos'])} reclamos al técnico {tecnicos_str}.",
+                        user_target="all"
+                    )
 
-def _volver_a_pendiente(row, sheet_reclamos):
-    try:
-        with st.spinner("Cambiando estado..."):
-            time.sleep(1)
-            fila_index = row.name + 2
-
-            col_estado           = _col_letter("Estado")
-            col_tecnico          = _col_letter("Técnico")
-            col_fecha_formateada = _col_letter("Fecha_formateada")
-
-            updates = [
-                {"range": f"{col_estado}{fila_index}", "values": [["Pendiente"]]},
-                {"range": f"{col_tecnico}{fila_index}", "values": [[""]]},
-                {"range": f"{col_fecha_formateada}{fila_index}", "values": [[""]]},
-            ]
-
-            success, error = api_manager.safe_sheet_operation(
-                batch_update_sheet,
-                sheet_reclamos,
-                updates,
-                is_batch=True
-            )
-            
-            if success:
-                st.success(f"🔄 Reclamo de {row['Nombre']} vuelto a PENDIENTE. Se borró la fecha de cierre.")
-                return True
-            else:
+            if error:
                 st.error(f"❌ Error al actualizar: {error}")
                 if DEBUG_MODE:
                     st.write("Detalles del error:", error)
-    except Exception as e:
-        st.error(f"❌ Error inesperado: {str(e)}")
-        if DEBUG_MODE:
-            st.exception(e)
-
-    return False
+                return False
+
+            avisar_conflictos(resultado)
+        except Exception as e:
+            st.error(f"❌ Error inesperado: {str(e)}")
+            if DEBUG_MODE:
+                st.exception(e)
+            return False
+
+    # Una sola recarga para todo el lote; el filtro de técnicos se conserva
+    st.session_state.filtro_tecnicos_persistente = tecnicos_seleccionados
+    return True
 
 def _mostrar_limpieza_reclamos(df_reclamos, sheet_reclamos):
     st.markdown("---")
@@ -3,9 +3,11 @@
 import streamlit as st
 import pandas as pd
 from utils.date_utils import parse_fecha, format_fecha
-from utils.api_manager import api_manager, batch_update_sheet
+from utils.escritura_versionada import actualizar_reclamos, avisar_conflictos
+from utils.perfilado import perfilar_render
 from config.settings import SECTORES_DISPONIBLES, DEBUG_MODE
 
+@perfilar_render
 def render_gestion_reclamos(df_reclamos, df_clientes, sheet_reclamos, user):
     """
     Muestra la sección de gestión de reclamos cargados
@@ -372,37 +374,30 @@ def _actualizar_reclamo(df, sheet_reclamos, reclamo_id, updates, full_update=Fal
     
     with st.spinner("Actualizando reclamo..."):
         try:
-            fila = df[df["ID Reclamo"] == reclamo_id].index[0] + 2
-            updates_list = []
             estado_anterior = df[df["ID Reclamo"] == reclamo_id]["Estado"].values[0]
+            cambios = {}
 
             if full_update:
-                # ✅ Mapeo corregido de columnas según tu hoja
-                updates_list.extend([
-                    {"range": f"E{fila}", "values": [[updates.get('direccion', '').upper()]]},  # Dirección
-                    {"range": f"F{fila}", "values": [[str(updates.get('telefono', ''))]]},     # Teléfono
-                    {"range": f"H{fila}", "values": [[updates.get('detalles', '')]]},          # Detalles
-                    {"range": f"K{fila}", "values": [[updates.get('precinto', '')]]},          # Precinto
-                ])
+                cambios.update({
+                    "Dirección": updates.get('direccion', '').upper(),
+                    "Teléfono": str(updates.get('telefono', '')),
+                    "Detalles": updates.get('detalles', ''),
+                    "N° de Precinto": updates.get('precinto', ''),
+                })
 
-            # ✅ Estado (columna I)
-            updates_list.append({"range": f"I{fila}", "values": [[updates['estado']]]})
+            cambios["Estado"] = updates['estado']
 
-            # ✅ Técnico (columna J) - solo si se proporciona
+            # Técnico solo si se proporciona; si pasa a pendiente se limpia
             if 'tecnico' in updates:
-                updates_list.append({"range": f"J{fila}", "values": [[updates['tecnico']]]})
-
-            # Si pasa a pendiente, limpiar columna J (técnico)
+                cambios["Técnico"] = updates['tecnico']
             if updates['estado'] == "Pendiente":
-                updates_list.append({"range": f"J{fila}", "values": [[""]]})
+                cambios["Técnico"] = ""
 
-            # Guardar en Google Sheets
-            success, error = api_manager.safe_sheet_operation(
-                batch_update_sheet, 
-                sheet_reclamos, 
-                updates_list, 
-                is_batch=True
-            )
+            # Se escribe solo si la fila sigue como se leyó (si no, se recarga y se avisa)
+            resultado, error = actualizar_reclamos(sheet_reclamos, {reclamo_id: cambios})
+            if avisar_conflictos(resultado):
+                return True
+            success = not error
 
             if success:
                 st.success("✅ Reclamo actualizado correctamente.")
@@ -468,14 +463,13 @@ def _marcar_desconexion_como_resuelta(row, sheet_reclamos):
     """Marca una desconexión como resuelta en la hoja de cálculo"""
     with st.spinner("Actualizando estado..."):
         try:
-            fila = row.name + 2
-            success, error = api_manager.safe_sheet_operation(
-                sheet_reclamos.update, 
-                f"I{fila}", 
-                [["Resuelto"]]
+            resultado, error = actualizar_reclamos(
+                sheet_reclamos, {row["ID Reclamo"]: {"Estado": "Resuelto"}}
             )
-            
-            if success:
+            if avisar_conflictos(resultado):
+                return True
+
+            if not error:
                 st.success(f"✅ Desconexión de {row['Nombre']} marcada como resuelta.")
                 return True
             else:
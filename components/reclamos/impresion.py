@@ -1,16 +1,24 @@
 # components/reclamos/impresion.py
 
 import io
+import os
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 from utils.date_utils import format_fecha, parse_fecha
-from utils.pdf_utils import agregar_pie_pdf
-from utils.date_utils import ahora_argentina
-from utils.reporte_diario import *
-
+from utils.pdf_utils import (
+    pdf_listado_reclamos,
+    pdf_en_curso_por_tecnico,
+    exportar_listado_reclamos,
+    leer_exportacion,
+    preparar_reclamos_impresion,
+)
+from utils.cola_impresion import obtener_cola_impresion, TIPOS_TRABAJO
+from utils.reporte_diario import exportar_reporte_diario, FORMATOS_REPORTE
+from utils.perfilado import perfilar_render
+from config.settings import IMPRESION_HORA_PROGRAMADA, DEBUG_MODE
+
+@perfilar_render
 def render_impresion_reclamos(df_reclamos, df_clientes, user):
     """
     Muestra la sección para imprimir reclamos en formato PDF
@@ -55,6 +63,15 @@ def render_impresion_reclamos(df_reclamos, df_clientes, user):
                     "👤 Incluir mi nombre en el PDF",
                     value=True
                 )
+            st.checkbox(
+                "💾 Exportar a archivo (listados grandes)",
+                value=False,
+                key="pdf_modo_archivo",
+                help="Genera el PDF en disco con límite de tamaño y reutiliza el archivo si el listado no cambió"
+            )
+
+        # Trabajos en segundo plano (incluye la impresión programada de la mañana)
+        _mostrar_cola_impresion(df_merged, solo_pendientes, user if incluir_usuario else None)
 
         # ===== REORGANIZACIÓN HORIZONTAL =====
         
@@ -95,18 +112,26 @@ def render_impresion_reclamos(df_reclamos, df_clientes, user):
         
         with col6:
             # === NUEVA SECCIÓN: Reporte Diario ===
-            st.markdown("### 📄 Generar Reporte Diario (PNG)")
-            
-            if st.button("🖼️ Generar imagen del día", use_container_width=True):
+            st.markdown("### 📄 Generar Reporte Diario")
+
+            formato = st.radio(
+                "Formato:",
+                list(FORMATOS_REPORTE),
+                horizontal=True,
+                key="formato_reporte_diario"
+            )
+
+            if st.button("🖼️ Generar reporte del día", use_container_width=True):
                 # Usar el dataframe que recibió el componente (más confiable y testeable)
-                img_buffer = generar_reporte_diario_imagen(df_reclamos)
-                fecha_hoy = ahora_argentina().strftime("%Y-%m-%d")
+                buffer, nombre_archivo, mime = exportar_reporte_diario(
+                    df_reclamos, formato, st.session_state.get("df_version")
+                )
                 
                 st.download_button(
                     label="⬇️ Descargar Reporte Diario",
-                    data=img_buffer,
-                    file_name=f"reporte_diario_{fecha_hoy}.png",
-                    mime="image/png",
+                    data=buffer,
+                    file_name=nombre_archivo,
+                    mime=mime,
                     use_container_width=True
                 )
                 result['message'] = "Reporte diario generado correctamente"
@@ -123,26 +148,74 @@ def render_impresion_reclamos(df_reclamos, df_clientes, user):
 
 def _preparar_datos(df_reclamos, df_clientes, user):
     """Prepara y combina los datos para impresión incluyendo info de usuario"""
-    df_pdf = df_reclamos.copy()
-    
-    # Procesamiento de fechas
-    df_pdf["Fecha y hora"] = pd.to_datetime(
-        df_pdf["Fecha y hora"], 
-        dayfirst=True, 
-        errors='coerce'
-    )
+    df_pdf = preparar_reclamos_impresion(df_reclamos, df_clientes)
     
     # Agregar información del usuario a los datos
     df_pdf["Usuario_impresion"] = user.get('nombre', 'Sistema')
-    
-    # Merge con clientes (optimizado)
-    return pd.merge(
-        df_pdf,
-        df_clientes[["Nº Cliente", "N° de Precinto"]].drop_duplicates(),
-        on="Nº Cliente",
-        how="left",
-        suffixes=("", "_cliente")
-    )
+    return df_pdf
+
+def _mostrar_cola_impresion(df_merged, solo_pendientes, usuario=None):
+    """Permite encolar impresiones en segundo plano y descargar las ya generadas"""
+    cola = obtener_cola_impresion()
+    trabajos = cola.listar()
+    listos = sum(1 for t in trabajos if t["estado"] == "Listo")
+
+    with st.expander(f"🗂️ Impresiones en segundo plano ({listos} listas)", expanded=listos > 0):
+        col1, col2, col3 = st.columns([3, 1, 1])
+        with col1:
+            tipo = st.selectbox(
+                "Trabajo:",
+                list(TIPOS_TRABAJO),
+                format_func=lambda t: TIPOS_TRABAJO[t][0],
+                key="cola_tipo_trabajo"
+            )
+        parametros = {
+            "orden": st.session_state.get("orden_todos_pendientes", "Tipo de reclamo"),
+            "tipos": st.session_state.get("select_tipos_pdf", []),
+            "solo_pendientes": solo_pendientes,
+        }
+        with col2:
+            st.write("")
+            if st.button("➕ Encolar", key="cola_encolar", use_container_width=True):
+                if tipo == "por_tipo" and not parametros["tipos"]:
+                    st.warning("Seleccioná al menos un tipo en 'Por tipo de reclamo'.")
+                else:
+                    cola.encolar(
+                        tipo, parametros, df_merged=df_merged,
+                        usuario=usuario.get('nombre', 'Sistema') if usuario else None
+                    )
+                    st.rerun()
+        with col3:
+            st.write("")
+            if st.button("🔄 Actualizar", key="cola_actualizar", use_container_width=True):
+                st.rerun()
+
+        if IMPRESION_HORA_PROGRAMADA:
+            st.caption(f"Todos los días a las {IMPRESION_HORA_PROGRAMADA} se preparan automáticamente los listados del turno.")
+
+        if not trabajos:
+            st.info("No hay trabajos de impresión registrados.")
+            return
+
+        for trabajo in trabajos:
+            col1, col2, col3 = st.columns([4, 2, 2])
+            origen = "⏰" if trabajo["programado"] else "👤"
+            with col1:
+                cantidad = f" · {trabajo['cantidad']} reclamos" if trabajo["cantidad"] is not None else ""
+                st.markdown(f"{origen} **{trabajo['descripcion']}** · {trabajo['creado'].strftime('%d/%m %H:%M')}{cantidad}")
+            with col2:
+                st.markdown(trabajo["estado"] if trabajo["estado"] != "Error" else f"❌ {trabajo['error']}")
+            with col3:
+                if trabajo["estado"] == "Listo" and os.path.exists(trabajo["ruta"]):
+                    with open(trabajo["ruta"], "rb") as f:
+                        st.download_button(
+                            "⬇️ Descargar",
+                            data=f,
+                            file_name=trabajo["nombre_archivo"],
+                            mime="application/pdf",
+                            key=f"cola_descargar_{trabajo['id']}",
+                            use_container_width=True
+                        )
 
 def _mostrar_reclamos_pendientes(df_merged):
     """Muestra tabla de reclamos pendientes con mejor formato"""
@@ -216,21 +289,14 @@ def _generar_pdf_todos_pendientes(df_merged, usuario=None):
     st.info(f"📋 {len(df_pendientes)} reclamos pendientes")
     
     if st.button("📄 Generar PDF", key="pdf_todos_pendientes", use_container_width=True):
-        buffer = _crear_pdf_reclamos(
-            df_pendientes, 
-            titulo,
-            usuario
-        )
-        
         nombre_archivo = f"todos_reclamos_pendientes_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-        
-        st.download_button(
-            label="⬇️ Descargar PDF",
-            data=buffer,
-            file_name=nombre_archivo,
-            mime="application/pdf",
-            help=f"Descargar {len(df_pendientes)} reclamos pendientes",
-            use_container_width=True
+
+        _entregar_pdf(
+            df_pendientes,
+            titulo,
+            nombre_archivo,
+            usuario,
+            ayuda=f"Descargar {len(df_pendientes)} reclamos pendientes"
         )
         
         return f"PDF generado con {len(df_pendientes)} reclamos pendientes (ordenados por {orden.lower()})"
@@ -270,21 +336,14 @@ def _generar_pdf_por_tipo(df_merged, solo_pendientes, usuario=None):
     st.info(f"📋 {len(reclamos_filtrados)} reclamos encontrados")
 
     if st.button("📄 Generar PDF", key="pdf_tipo", use_container_width=True):
-        buffer = _crear_pdf_reclamos(
-            reclamos_filtrados, 
-            f"RECLAMOS - {', '.join(tipos_seleccionados)}",
-            usuario
-        )
-        
         nombre_archivo = f"reclamos_{'_'.join(t.lower().replace(' ', '_') for t in tipos_seleccionados)}.pdf"
-        
-        st.download_button(
-            label="⬇️ Descargar PDF",
-            data=buffer,
-            file_name=nombre_archivo,
-            mime="application/pdf",
-            help=f"Descargar {len(reclamos_filtrados)} reclamos",
-            use_container_width=True
+
+        _entregar_pdf(
+            reclamos_filtrados,
+            f"RECLAMOS - {', '.join(tipos_seleccionados)}",
+            nombre_archivo,
+            usuario,
+            ayuda=f"Descargar {len(reclamos_filtrados)} reclamos"
         )
         
         return f"PDF generado con {len(reclamos_filtrados)} reclamos de tipo {', '.join(tipos_seleccionados)}"
@@ -321,19 +380,12 @@ def _generar_pdf_manual(df_merged, solo_pendientes, usuario=None):
     st.info(f"📋 {len(selected)} reclamos seleccionados")
 
     if st.button("📄 Generar PDF", key="pdf_manual", use_container_width=True):
-        buffer = _crear_pdf_reclamos(
+        _entregar_pdf(
             df_filtrado.loc[selected],
             f"RECLAMOS SELECCIONADOS",
-            usuario
-        )
-        
-        st.download_button(
-            label="⬇️ Descargar PDF",
-            data=buffer,
-            file_name="reclamos_seleccionados.pdf",
-            mime="application/pdf",
-            help=f"Descargar {len(selected)} reclamos",
-            use_container_width=True
+            "reclamos_seleccionados.pdf",
+            usuario,
+            ayuda=f"Descargar {len(selected)} reclamos"
         )
         
         return f"PDF generado con {len(selected)} reclamos seleccionados"
@@ -356,20 +408,14 @@ def _generar_pdf_desconexiones(df_merged, usuario=None):
     st.info(f"📋 {len(df_desconexiones)} desconexiones encontradas")
 
     if st.button("📄 Generar PDF", key="pdf_desconexiones", use_container_width=True):
-        buffer = _crear_pdf_reclamos(
-            df_desconexiones, 
-            "LISTADO DE CLIENTES PARA DESCONEXIÓN",
-            usuario
-        )
         nombre_archivo = f"desconexiones_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
 
-        st.download_button(
-            label="⬇️ Descargar PDF",
-            data=buffer,
-            file_name=nombre_archivo,
-            mime="application/pdf",
-            help=f"Descargar {len(df_desconexiones)} desconexiones",
-            use_container_width=True
+        _entregar_pdf(
+            df_desconexiones,
+            "LISTADO DE CLIENTES PARA DESCONEXIÓN",
+            nombre_archivo,
+            usuario,
+            ayuda=f"Descargar {len(df_desconexiones)} desconexiones"
         )
 
         return f"PDF generado con {len(df_desconexiones)} desconexiones pendientes"
@@ -389,59 +435,11 @@ def _generar_pdf_en_curso_por_tecnico(df_merged, usuario=None):
         return None
 
     df_en_curso["Técnico"] = df_en_curso["Técnico"].fillna("Sin técnico").str.upper()
-    reclamos_por_tecnico = df_en_curso.groupby("Técnico")
 
     st.info(f"📋 {len(df_en_curso)} reclamos en curso")
 
     if st.button("📄 Generar PDF", key="pdf_en_curso_tecnico", use_container_width=True):
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.pagesizes import A4
-        import io
-
-        buffer = io.BytesIO()
-        c = canvas.Canvas(buffer, pagesize=A4)
-        width, height = A4
-        y = height - 40
-        hoy = datetime.now().strftime('%d/%m/%Y')
-
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(40, y, f"RECLAMOS EN CURSO - {hoy}")
-        if usuario:
-            c.setFont("Helvetica", 10)
-            c.drawString(width - 200, y, f"Por: {usuario.get('nombre', 'Sistema')}")
-        y -= 30
-
-        for tecnico, reclamos in reclamos_por_tecnico:
-            if y < 100:
-                agregar_pie_pdf(c, width, height)
-                c.showPage()
-                y = height - 40
-                c.setFont("Helvetica-Bold", 16)
-                c.drawString(40, y, f"RECLAMOS EN CURSO - {hoy}")
-                y -= 30
-
-            c.setFont("Helvetica-Bold", 13)
-            c.drawString(40, y, f"👷 Técnico: {tecnico} ({len(reclamos)})")
-            y -= 20
-
-            c.setFont("Helvetica", 11)
-            for _, row in reclamos.iterrows():
-                texto = f"{row['Nº Cliente']} - {row['Tipo de reclamo']} - Sector {row['Sector']}"
-                c.drawString(50, y, texto)
-                y -= 15
-                if y < 60:
-                    agregar_pie_pdf(c, width, height)
-                    c.showPage()
-                    y = height - 40
-
-            # Línea divisoria después de los reclamos de cada técnico
-            c.setFont("Helvetica", 10)
-            c.drawString(40, y, "-" * 80)
-            y -= 20
-
-        agregar_pie_pdf(c, width, height)
-        c.save()
-        buffer.seek(0)
+        buffer = pdf_en_curso_por_tecnico(df_en_curso, usuario)
 
         st.download_button(
             label="⬇️ Descargar PDF",
@@ -456,62 +454,35 @@ def _generar_pdf_en_curso_por_tecnico(df_merged, usuario=None):
 
     return None
 
-def _crear_pdf_reclamos(df_reclamos, titulo, usuario=None):
-    import io
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.pagesizes import A4
-    from utils.pdf_utils import agregar_pie_pdf
-    from datetime import datetime
-
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-    y = height - 40
-    hoy = datetime.now().strftime('%d/%m/%Y %H:%M')
-
-    # Encabezado
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(40, y, titulo)
-    y -= 20
-
-    c.setFont("Helvetica", 12)
-    c.drawString(40, y, f"Generado el: {hoy}")
-    if usuario:
-        c.drawString(width - 200, y, f"Por: {usuario.get('nombre', 'Sistema')}")
-    y -= 30
-
-    for _, reclamo in df_reclamos.iterrows():
-        if y < 120:
-            agregar_pie_pdf(c, width, height)
-            c.showPage()
-            y = height - 40
-            c.setFont("Helvetica-Bold", 16)
-            c.drawString(40, y, titulo + " (cont.)")
-            y -= 30
-
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(40, y, f"{reclamo['Nº Cliente']} - {reclamo['Nombre']}")
-        y -= 15
-
-        c.setFont("Helvetica", 11)
-        fecha_pdf = reclamo['Fecha y hora'].strftime('%d/%m/%Y %H:%M') if not pd.isna(reclamo['Fecha y hora']) else 'Sin fecha'
-        lineas = [
-            f"Fecha: {fecha_pdf}",
-            f"Dirección: {reclamo['Dirección']} - Tel: {reclamo['Teléfono']}",
-            f"Sector: {reclamo['Sector']} - Precinto: {reclamo.get('N° de Precinto') or 'N/A'}",
-            f"Tipo: {reclamo['Tipo de reclamo']}",
-            f"Detalles: {reclamo['Detalles'][:100]}..." if len(reclamo['Detalles']) > 100 else f"Detalles: {reclamo['Detalles']}"
-        ]
-
-        for linea in lineas:
-            c.drawString(40, y, linea)
-            y -= 12
-
-        y -= 5
-        c.line(40, y, width - 40, y)
-        y -= 15
+def _entregar_pdf(df_reclamos, titulo, nombre_archivo, usuario=None, ayuda=None):
+    """Entrega el listado como descarga; en modo archivo, desde el PDF exportado en disco"""
+    if st.session_state.get("pdf_modo_archivo"):
+        ruta, error = exportar_listado_reclamos(df_reclamos, titulo, nombre_archivo, usuario)
+        if error:
+            st.error(f"❌ No se pudo exportar el PDF: {error}")
+            return False
+        # Los bytes se leen recién al hacer clic (no en cada rerun); mientras dura la
+        # descarga Streamlit los tiene en su almacén de medios: no hay entrega por streaming
+        st.download_button(
+            label="⬇️ Descargar PDF",
+            data=lambda: leer_exportacion(ruta),
+            file_name=nombre_archivo,
+            mime="application/pdf",
+            help=ayuda,
+            use_container_width=True
+        )
+        return True
+
+    st.download_button(
+        label="⬇️ Descargar PDF",
+        data=_crear_pdf_reclamos(df_reclamos, titulo, usuario),
+        file_name=nombre_archivo,
+        mime="application/pdf",
+        help=ayuda,
+        use_container_width=True
+    )
+    return True
 
-    agregar_pie_pdf(c, width, height)
-    c.save()
-    buffer.seek(0)
-    return buffer
\ No newline at end of file
+def _crear_pdf_reclamos(df_reclamos, titulo, usuario=None):
+    """Genera el listado de reclamos con el motor de plantillas (cacheado por contenido)"""
+    return pdf_listado_reclamos(df_reclamos, titulo, usuario)
\ No newline at end of file
@@ -5,6 +5,8 @@ from datetime import datetime
 from utils.date_utils import ahora_argentina, format_fecha, parse_fecha
 from utils.api_manager import api_manager
 from utils.data_manager import batch_update_sheet
+from utils.perfilado import perfilar_render
+from components.notifications import get_cached_notifications
 from config.settings import (
     SECTORES_DISPONIBLES,
     TIPOS_RECLAMO,
@@ -61,6 +63,7 @@ def generar_id_unico():
     return str(uuid.uuid4())[:8].upper()
 
 # --- FUNCIÓN PRINCIPAL OPTIMIZADA ---
+@perfilar_render
 def render_nuevo_reclamo(df_reclamos, df_clientes, sheet_reclamos, sheet_clientes, current_user=None):
     """
     Muestra la sección para cargar nuevos reclamos
@@ -278,7 +281,7 @@ def _procesar_envio_formulario(estado, nombre, direccion, telefono, sector, tipo
                         claim_id=id_reclamo
                     )
                 
-                st.cache_data.clear()
+                get_cached_notifications.clear()
 
                 # 🔄 Forzar recarga para limpiar el formulario y mostrar reclamo activo
                 st.rerun()
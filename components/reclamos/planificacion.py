@@ -1,19 +1,23 @@
 # components/reclamos/planificacion.py
 
-import io
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from utils.date_utils import parse_fecha, format_fecha
-from utils.api_manager import api_manager, batch_update_sheet
-from utils.pdf_utils import agregar_pie_pdf
+from utils.date_utils import parse_fecha, format_fecha, ahora_argentina
+from utils.escritura_versionada import actualizar_reclamos, agregar_aviso, avisar_conflictos
+from utils.data_manager import invalidar_hojas, version_datos
+from utils.pdf_utils import pdf_asignaciones_grupos, seccion_grupo
+from utils.planificacion_store import (
+    PlanificacionDesactualizada, SesionPlanificacion, listar_sesiones, normalizar_admin
+)
+from utils.capacidad import historial_agregado, proyectar_backlog, recomendar_grupos
+from utils.perfilado import perfilar_render
 from config.settings import (
     SECTORES_DISPONIBLES,
     TECNICOS_DISPONIBLES,
     MATERIALES_POR_RECLAMO,
-    ROUTER_POR_SECTOR
+    ROUTER_POR_SECTOR,
+    CAPACIDAD_HORIZONTE_MAX
 )
 
 GRUPOS_POSIBLES = [f"Grupo {letra}" for letra in "ABCDE"]
@@ -35,16 +39,51 @@ ZONAS_COMPATIBLES = {
     "Zona 5": ["Zona 1", "Zona 3"]
 }
 
-def inicializar_estado_grupos():
-    if "asignaciones_grupos" not in st.session_state:
-        st.session_state.asignaciones_grupos = {g: [] for g in GRUPOS_POSIBLES}
-    if "tecnicos_grupos" not in st.session_state:
-        st.session_state.tecnicos_grupos = {g: [] for g in GRUPOS_POSIBLES}
+def inicializar_estado_grupos(user=None):
+    """
+    Inicializa el estado de planificación desde la sesión persistida (fecha + admin).
+    Solo relee el snapshot si otra pestaña/sesión lo modificó.
+    """
+    user = user or {}
+    fecha = ahora_argentina().strftime('%Y-%m-%d')
+    admin = user.get('username') or user.get('nombre', '')
+    sesion = st.session_state.get("planificacion_sesion")
+
+    if sesion is None or sesion.fecha != fecha or sesion.admin != normalizar_admin(admin):
+        sesion = SesionPlanificacion(fecha, admin, GRUPOS_POSIBLES)
+        st.session_state.planificacion_sesion = sesion
+        st.session_state.planificacion_mtime = None
+
+    mtime = sesion.mtime()
+    if "planificacion_estado" not in st.session_state or st.session_state.planificacion_mtime != mtime:
+        estado = sesion.cargar()
+        st.session_state.planificacion_estado = estado
+        st.session_state.planificacion_mtime = mtime
+        st.session_state.asignaciones_grupos = estado["asignaciones"]
+        st.session_state.tecnicos_grupos = estado["tecnicos"]
+
     if "vista_simulacion" not in st.session_state:
         st.session_state.vista_simulacion = False
     if "simulacion_asignaciones" not in st.session_state:
         st.session_state.simulacion_asignaciones = {}
 
+def _registrar_cambios(operaciones):
+    """Aplica diffs a la planificación y los persiste en la sesión local"""
+    if not operaciones:
+        return
+    sesion = st.session_state.planificacion_sesion
+    try:
+        estado = sesion.registrar(st.session_state.planificacion_estado, operaciones)
+    except PlanificacionDesactualizada:
+        # Otra pestaña guardó antes: se muestra su versión en lugar de pisarla
+        estado = sesion.cargar()
+        agregar_aviso("La planificación se modificó en otra pestaña o por otro usuario. "
+                      "Se cargó la versión guardada: revisá y repetí el cambio.")
+    st.session_state.planificacion_estado = estado
+    st.session_state.planificacion_mtime = sesion.mtime()
+    st.session_state.asignaciones_grupos = estado["asignaciones"]
+    st.session_state.tecnicos_grupos = estado["tecnicos"]
+
 def agrupar_zonas_completas(zonas, grupos, df_reclamos, permitir_redistribucion=True):
     """
     Distribuye ZONAS COMPLETAS entre grupos, con redistribución opcional para muchos grupos
@@ -294,13 +333,17 @@ def distribuir_por_tipo(df_reclamos, grupos_activos):
 def _mostrar_asignacion_tecnicos(grupos_activos):
     """Muestra la interfaz para asignar técnicos a grupos"""
     st.markdown("### 👷 Asignar técnicos a cada grupo")
-    for grupo in list(st.session_state.tecnicos_grupos.keys())[:grupos_activos]:
-        st.session_state.tecnicos_grupos[grupo] = st.multiselect(
+    cambios = []
+    for grupo in GRUPOS_POSIBLES[:grupos_activos]:
+        seleccion = st.multiselect(
             f"{grupo} - Técnicos asignados",
             TECNICOS_DISPONIBLES,
             default=st.session_state.tecnicos_grupos[grupo],
             key=f"tecnicos_{grupo}"
         )
+        if seleccion != st.session_state.tecnicos_grupos[grupo]:
+            cambios.append({"op": "tecnicos", "grupo": grupo, "valor": seleccion})
+    _registrar_cambios(cambios)
 
 
 def _mostrar_reclamos_disponibles(df_reclamos, grupos_activos):
@@ -358,7 +401,7 @@ def _mostrar_reclamos_disponibles(df_reclamos, grupos_activos):
                 button_key = f"asignar_{grupo}_{row['ID Reclamo']}_{idx}"
                 if cols_grupo[i].button(f"➡️{grupo[-1]} ({tecnicos_str})", key=button_key):
                     if row["ID Reclamo"] not in asignados:
-                        st.session_state.asignaciones_grupos[grupo].append(row["ID Reclamo"])
+                        _registrar_cambios([{"op": "asignar", "grupo": grupo, "id": row["ID Reclamo"]}])
                         st.rerun()
 
             with col1.expander("🔍 Ver detalles"):
@@ -392,13 +435,110 @@ def _format_fecha_reclamo(fecha):
         return "Fecha inválida"
 
 def _limpiar_asignaciones(df_reclamos):
-    ids_validos = set(df_reclamos["ID Reclamo"].astype(str).unique())
-    for grupo in st.session_state.asignaciones_grupos:
-        st.session_state.asignaciones_grupos[grupo] = [
-            id for id in st.session_state.asignaciones_grupos[grupo] 
-            if str(id) in ids_validos
-        ]
+    """
+    Quita de la planificación los reclamos que ya no existen en la hoja.
+    Solo revalida cuando cambian los datos o la versión del plan.
+    """
+    estado = st.session_state.planificacion_estado
+    clave = (st.session_state.get("df_version") or version_datos(df_reclamos), estado["version"])
+    if st.session_state.get("planificacion_validada") == clave:
+        return
+
+    asignados = [(g, rid) for g, ids in estado["asignaciones"].items() for rid in ids]
+    if asignados:
+        ids_validos = set(df_reclamos["ID Reclamo"].astype(str).unique())
+        _registrar_cambios([
+            {"op": "quitar", "grupo": g, "id": rid}
+            for g, rid in asignados if str(rid) not in ids_validos
+        ])
+
+    st.session_state.planificacion_validada = (clave[0], st.session_state.planificacion_estado["version"])
+
+def _mostrar_planificaciones_guardadas(user):
+    """Permite ver y copiar la planificación guardada de otro administrador"""
+    sesion = st.session_state.planificacion_sesion
+    otros = [a for a in listar_sesiones(sesion.fecha) if a != sesion.admin]
+    if not otros:
+        return
+
+    with st.expander("📂 Planificaciones de otros administradores (hoy)"):
+        admin_origen = st.selectbox("Administrador", otros, key="planificacion_otro_admin")
+        otra = SesionPlanificacion(sesion.fecha, admin_origen, GRUPOS_POSIBLES).cargar()
+
+        for grupo in GRUPOS_POSIBLES:
+            if otra["asignaciones"][grupo]:
+                tecnicos = ", ".join(otra["tecnicos"][grupo]) or "Sin técnicos"
+                st.markdown(f"- **{grupo}** ({tecnicos}): {len(otra['asignaciones'][grupo])} reclamos")
+
+        if st.button("📥 Copiar a mi planificación", key="copiar_planificacion"):
+            operaciones = [{"op": "reemplazar", "asignaciones": otra["asignaciones"]}]
+            operaciones += [
+                {"op": "tecnicos", "grupo": g, "valor": otra["tecnicos"][g]} for g in GRUPOS_POSIBLES
+            ]
+            _registrar_cambios(operaciones)
+            st.success(f"✅ Planificación de {admin_origen} copiada.")
+            st.rerun()
+
+def _mostrar_planificacion_capacidad(df_reclamos):
+    """Proyección multi-día del backlog y recomendación de grupos según el historial"""
+    with st.expander("📈 Planificación de capacidad (próximos días)"):
+        version = st.session_state.get("df_version") or version_datos(df_reclamos)
+        historial = historial_agregado(df_reclamos, version)
+        df_pendientes = df_reclamos[df_reclamos["Estado"] == "Pendiente"]
+
+        col1, col2 = st.columns(2)
+        with col1:
+            dias = st.slider("📅 Días a proyectar", 1, CAPACIDAD_HORIZONTE_MAX, 5, key="capacidad_dias")
+        with col2:
+            tecnicos = st.multiselect(
+                "👷 Técnicos disponibles",
+                TECNICOS_DISPONIBLES,
+                default=[t for t in TECNICOS_DISPONIBLES if t not in ("Oficina", "Base")],
+                key="capacidad_tecnicos"
+            )
+
+        st.caption(
+            f"Ingreso promedio: {historial['ingreso_diario']:.1f} reclamos/día • "
+            f"Resolución media: {historial['horas_media']:.1f} h"
+        )
+
+        if not tecnicos:
+            st.info("Seleccioná al menos un técnico para proyectar.")
+            return
+
+        recomendacion = recomendar_grupos(historial, df_pendientes, tecnicos, dias, max_grupos=len(GRUPOS_POSIBLES))
+        if recomendacion["dias_para_vaciar"]:
+            st.success(
+                f"✅ Recomendado: {recomendacion['cantidad_grupos']} grupos "
+                f"(backlog vacío en {recomendacion['dias_para_vaciar']} días)"
+            )
+        else:
+            st.warning(
+                f"⚠️ Ni con {recomendacion['cantidad_grupos']} grupos se vacía el backlog en {dias} días"
+            )
+
+        for grupo, cuadrilla in zip(GRUPOS_POSIBLES, recomendacion["cuadrillas"]):
+            st.markdown(f"- **{grupo}**: {', '.join(cuadrilla)}")
 
+        proyeccion = recomendacion["proyeccion"]
+        st.line_chart(proyeccion.set_index("Día")[["Backlog final"]])
+        st.dataframe(proyeccion, use_container_width=True, hide_index=True)
+
+        # Comparar con la planificación actual
+        actuales = [st.session_state.tecnicos_grupos[g] for g in GRUPOS_POSIBLES if st.session_state.tecnicos_grupos[g]]
+        if actuales:
+            actual = proyectar_backlog(historial, df_pendientes, actuales, dias)
+            st.caption(f"Con los grupos actuales el backlog termina en {actual['Backlog final'].iloc[-1]:.1f} reclamos equivalentes.")
+
+        if st.button("👷 Aplicar composición recomendada", key="aplicar_capacidad"):
+            cuadrillas = recomendacion["cuadrillas"] + [[]] * (len(GRUPOS_POSIBLES) - len(recomendacion["cuadrillas"]))
+            _registrar_cambios([
+                {"op": "tecnicos", "grupo": g, "valor": cuadrilla}
+                for g, cuadrilla in zip(GRUPOS_POSIBLES, cuadrillas)
+            ])
+            st.rerun()
+
+@perfilar_render
 def render_planificacion_grupos(df_reclamos, sheet_reclamos, user):
     if user.get('rol') != 'admin':
         st.warning("⚠️ Solo los administradores pueden acceder a esta sección")
@@ -407,8 +547,11 @@ def render_planificacion_grupos(df_reclamos, sheet_reclamos, user):
     st.subheader("📋 Asignación de reclamos a grupos de trabajo")
 
     try:
-        inicializar_estado_grupos()
+        inicializar_estado_grupos(user)
         _limpiar_asignaciones(df_reclamos)
+        _mostrar_planificaciones_guardadas(user)
+
+        _mostrar_planificacion_capacidad(df_reclamos)
 
         grupos_activos = st.slider("🔢 Cantidad de grupos de trabajo activos", 1, 5, 2)
 
@@ -451,16 +594,16 @@ def render_planificacion_grupos(df_reclamos, sheet_reclamos, user):
 
             # Solo opción de confirmar, sin generar PDF en la simulación
             if st.button("💾 Confirmar y guardar esta asignación"):
-                for g in GRUPOS_POSIBLES:
-                    st.session_state.asignaciones_grupos[g] = []
-                        
-                st.session_state.asignaciones_grupos = st.session_state.simulacion_asignaciones
+                _registrar_cambios([{
+                    "op": "reemplazar",
+                    "asignaciones": st.session_state.simulacion_asignaciones
+                }])
                 st.session_state.vista_simulacion = False
                 st.success("✅ Asignaciones aplicadas.")
                 st.rerun()
 
         if st.button("🔄 Refrescar reclamos"):
-            st.cache_data.clear()
+            invalidar_hojas()
             return {'needs_refresh': True}
 
         _mostrar_asignacion_tecnicos(grupos_activos)
@@ -522,7 +665,7 @@ def _mostrar_reclamos_asignados(df_pendientes, grupos_activos):
                 col1.markdown(f"**Reclamo ID: {reclamo_id} (ya no está pendiente)**")
 
             if col2.button("❌ Quitar", key=f"quitar_{grupo}_{reclamo_id}_{idx}"):
-                st.session_state.asignaciones_grupos[grupo].remove(reclamo_id)
+                _registrar_cambios([{"op": "quitar", "grupo": grupo, "id": reclamo_id}])
                 st.rerun()
 
             st.divider()
@@ -574,7 +717,7 @@ def _guardar_cambios(df_reclamos, sheet_reclamos, grupos_activos):
         return False
 
     with st.spinner("Actualizando reclamos..."):
-        updates = []
+        cambios = {}
         notificaciones = []
 
         for grupo in GRUPOS_POSIBLES[:grupos_activos]:
@@ -584,30 +727,34 @@ def _guardar_cambios(df_reclamos, sheet_reclamos, grupos_activos):
 
             if reclamos_ids:
                 for reclamo_id in reclamos_ids:
-                    fila = df_reclamos[df_reclamos["ID Reclamo"] == reclamo_id]
-                    if not fila.empty:
-                        index = fila.index[0] + 2
-                        updates.append({"range": f"I{index}", "values": [["En curso"]]})
-                        updates.append({"range": f"J{index}", "values": [[tecnicos_str]]})
+                    cambios[reclamo_id] = {"Estado": "En curso", "Técnico": tecnicos_str}
 
                 notificaciones.append({
                     "grupo": grupo,
                     "tecnicos": tecnicos_str,
-                    "cantidad": len(reclamos_ids)
+                    "reclamos": list(reclamos_ids)
                 })
 
-        if updates:
-            success, error = api_manager.safe_sheet_operation(batch_update_sheet, sheet_reclamos, updates, is_batch=True)
-            if success:
-                st.success("✅ Reclamos actualizados correctamente en la hoja.")
+        if cambios:
+            # Los reclamos que otro usuario cambió mientras tanto no se pisan
+            resultado, error = actualizar_reclamos(sheet_reclamos, cambios)
+            if not error:
+                avisar_conflictos(resultado)
+                escritos = resultado["escritos"]
+                if escritos:
+                    st.success(f"✅ {len(escritos)} reclamo(s) actualizados correctamente en la hoja.")
                 if 'notification_manager' in st.session_state:
                     for n in notificaciones:
-                        mensaje = f"📋 Se asignaron {n['cantidad']} reclamos a {n['grupo']} (Técnicos: {n['tecnicos']})."
+                        cantidad = sum(1 for r in n["reclamos"] if r in escritos)
+                        if not cantidad:
+                            continue
+                        mensaje = f"📋 Se asignaron {cantidad} reclamos a {n['grupo']} (Técnicos: {n['tecnicos']})."
                         st.session_state.notification_manager.add(
                             notification_type="reclamo_asignado",
                             message=mensaje,
                             user_target="all"
                         )
+                # Se recarga igual: el aviso de conflictos se muestra con los datos actualizados
                 return True
             else:
                 st.error("❌ Error al actualizar: " + str(error))
@@ -617,81 +764,23 @@ def _guardar_cambios(df_reclamos, sheet_reclamos, grupos_activos):
 
 def _generar_pdf_asignaciones(grupos_activos, materiales_por_grupo, df_pendientes):
     """Genera un PDF con las asignaciones de grupos"""
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-    y = height - 40
     hoy = datetime.now().strftime('%d/%m/%Y')
+    df_por_id = df_pendientes.drop_duplicates("ID Reclamo").set_index("ID Reclamo", drop=False)
 
+    secciones = []
     for grupo in GRUPOS_POSIBLES[:grupos_activos]:
-        reclamos_ids = st.session_state.asignaciones_grupos[grupo]
+        reclamos_ids = [r for r in st.session_state.asignaciones_grupos[grupo] if r in df_por_id.index]
         if not reclamos_ids:
             continue
-
-        tecnicos = st.session_state.tecnicos_grupos[grupo]
-        agregar_pie_pdf(c, width, height)
-        c.showPage()
-        y = height - 40
-
-        tipos = df_pendientes[df_pendientes["ID Reclamo"].isin(reclamos_ids)]["Tipo de reclamo"].value_counts()
-        resumen_tipos = " - ".join([f"{v} {k}" for k, v in tipos.items()])
-
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(40, y, f"{grupo} - Técnicos: {', '.join(tecnicos)} (Asignado el {hoy})")
-        y -= 20
-        c.setFont("Helvetica", 12)
-        c.drawString(40, y, resumen_tipos)
-        y -= 25
-
-        for reclamo_id in reclamos_ids:
-            reclamo_data = df_pendientes[df_pendientes["ID Reclamo"] == reclamo_id]
-            if not reclamo_data.empty:
-                reclamo = reclamo_data.iloc[0]
-                c.setFont("Helvetica-Bold", 14)
-                c.drawString(40, y, f"{reclamo['Nº Cliente']} - {reclamo['Nombre']}")
-                y -= 15
-                c.setFont("Helvetica", 11)
-
-                fecha_pdf = reclamo['Fecha y hora'].strftime('%d/%m/%Y %H:%M') if not pd.isna(reclamo['Fecha y hora']) else 'Sin fecha'
-                lineas = [
-                    f"Fecha: {fecha_pdf}",
-                    f"Dirección: {reclamo['Dirección']} - Tel: {reclamo['Teléfono']}",
-                    f"Sector: {reclamo['Sector']} - Precinto: {reclamo.get('N° de Precinto', 'N/A')}",
-                    f"Tipo: {reclamo['Tipo de reclamo']}",
-                    f"Detalles: {reclamo['Detalles'][:100]}..." if len(reclamo['Detalles']) > 100 else f"Detalles: {reclamo['Detalles']}",
-                ]
-                for linea in lineas:
-                    c.drawString(40, y, linea)
-                    y -= 12
-
-                y -= 8
-                c.line(40, y, width - 40, y)
-                y -= 15
-
-                if y < 100:
-                    agregar_pie_pdf(c, width, height)
-                    c.showPage()
-                    y = height - 40
-                    c.setFont("Helvetica-Bold", 16)
-                    c.drawString(40, y, f"{grupo} (cont.)")
-                    y -= 25
-
-        materiales = materiales_por_grupo.get(grupo, {})
-        if materiales:
-            y -= 10
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(40, y, "Materiales mínimos estimados:")
-            y -= 15
-            c.setFont("Helvetica", 11)
-            for mat, cant in materiales.items():
-                c.drawString(40, y, f"- {cant} {mat.replace('_', ' ').title()}")
-                y -= 12
-
-        y -= 20
-
-    agregar_pie_pdf(c, width, height)
-    c.save()
-    buffer.seek(0)
+        secciones.append(seccion_grupo(
+            grupo,
+            st.session_state.tecnicos_grupos[grupo],
+            df_por_id.loc[reclamos_ids],
+            materiales_por_grupo.get(grupo, {}),
+            hoy,
+        ))
+
+    buffer = pdf_asignaciones_grupos(secciones)
 
     st.download_button(
         label="📄 Descargar PDF de asignaciones",
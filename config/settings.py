@@ -13,6 +13,7 @@ WORKSHEET_USUARIOS = "usuarios"
 WORKSHEET_NOTIFICACIONES = "Notificaciones"
 
 MAX_NOTIFICATIONS = 10  # Máximo de notificaciones a mostrar en UI
+NOTIFICACIONES_MAX_GLOBALES = 10  # Notificaciones para 'all' que se conservan en la hoja (se borra la más vieja)
 
 # Tipos de notificación
 NOTIFICATION_TYPES = {
@@ -24,7 +25,9 @@ NOTIFICATION_TYPES = {
     "daily_reminder": {"priority": "baja", "icon": "📅"},
     "nuevo_reclamo": {"priority": "media", "icon": "🆕"},
     "reclamo_asignado": {"priority": "media", "icon": "👷"},
-    "trabajo_asignado": {"priority": "media", "icon": "🛠️"}
+    "trabajo_asignado": {"priority": "media", "icon": "🛠️"},
+    "sla_en_curso": {"priority": "alta", "icon": "⏰"},
+    "sla_desconexion": {"priority": "media", "icon": "🔌"}
 }
 
 # Columnas para la hoja de notificaciones
@@ -158,12 +161,88 @@ MATERIALES_POR_RECLAMO = {
     "Desconexion a Pedido": {}
 }
 
+# --------------------------
+# PLANIFICACIÓN DE CAPACIDAD
+# --------------------------
+CAPACIDAD_DIAS_INGRESO = 30  # Ventana (días) para estimar el ingreso diario de reclamos
+CAPACIDAD_APORTE_DEFAULT = 3.0  # Reclamos/día asumidos para un técnico sin historial
+CAPACIDAD_HORIZONTE_MAX = 14  # Máximo de días a proyectar desde la UI
+
 # --------------------------
 # SEGURIDAD Y API
 # --------------------------
 API_DELAY = 2.0  # Segundos entre llamadas a la API
 BATCH_DELAY = 2.0  # Segundos entre operaciones batch
 SESSION_TIMEOUT = 1800  # 30 minutos de inactividad para cerrar sesión
+AUTH_DIRECTORIO_TTL = 300  # Segundos que se reutiliza el directorio de usuarios en memoria
+DATOS_TTL = 15  # Segundos que se reutiliza una hoja cargada si este proceso no la modificó (cambios externos)
+AUTH_PBKDF2_ITERACIONES = 120_000  # Iteraciones PBKDF2-SHA256 para contraseñas nuevas
+AUTH_MIGRAR_HASHES = True  # Reemplazar contraseñas en texto plano por su hash al iniciar sesión
+SESSION_COOKIE = "fusion_sesion"  # Cookie con el identificador opaco de la sesión (nunca va en la URL)
+
+# --------------------------
+# ALMACENAMIENTO LOCAL
+# --------------------------
+LOCAL_DATA_DIR = ".fusion_data"  # Carpeta local para datos auxiliares (no versionada)
+PLANIFICACION_DIR = f"{LOCAL_DATA_DIR}/planificacion"  # Sesiones de planificación por fecha/admin
+PLANIFICACION_MAX_LOG = 200  # Diffs acumulados antes de compactar el log de una sesión
+SESSION_STORE_PATH = f"{LOCAL_DATA_DIR}/sesiones.json"  # Sesiones vigentes (hash del identificador -> usuario, vencimiento)
+OFFLINE_ENV_VAR = "FUSION_OFFLINE"  # Si está definida se usa el backend local en lugar de Google Sheets
+OFFLINE_DIR = f"{LOCAL_DATA_DIR}/offline"  # Hojas del backend local (un CSV por hoja); FUSION_OFFLINE=<ruta> lo reemplaza
+
+# --------------------------
+# GENERACIÓN DE PDFs
+# --------------------------
+PDF_CACHE_MAX = 32  # PDFs generados que se conservan en memoria (por hash de contenido)
+PDF_PARALELO_MIN_PAGINAS = 20  # A partir de esta cantidad de páginas se dibuja en paralelo
+PDF_PROCESOS = None  # Procesos para el render en paralelo (None = cantidad de núcleos)
+EXPORTS_DIR = f"{LOCAL_DATA_DIR}/exports"  # PDFs exportados a archivo (fuera de static/: tienen datos personales)
+PDF_EXPORT_MAX_MB = 50  # Tamaño máximo de un PDF exportado
+PDF_EXPORT_TTL = 3600  # Segundos que se conserva un PDF exportado
+PDF_EXPORT_TRAMO = 50  # Páginas que se dibujan juntas al exportar (cada tramo va a su propio archivo)
+
+# --------------------------
+# REPORTE DIARIO
+# --------------------------
+REPORTE_CORTE_MINUTOS = 5  # Resolución del corte horario del reporte (misma franja = misma caché)
+REPORTE_CACHE_MAX = 16  # Reportes renderizados que se conservan en memoria
+
+# --------------------------
+# VIGILANCIA DE SLA
+# --------------------------
+SLA_INTERVALO = 300  # Segundos entre evaluaciones del vigilante
+SLA_HORAS_SIN_TECNICO = 36  # Horas sin técnico asignado antes de avisar
+SLA_HORAS_EN_CURSO = 48  # Horas en curso antes de avisar
+SLA_HORAS_DESCONEXION = 24  # Horas con una desconexión pendiente antes de avisar
+SLA_ESTADO_PATH = f"{LOCAL_DATA_DIR}/sla_avisados.json"  # Reclamos ya avisados por regla
+
+# --------------------------
+# SERIES HISTÓRICAS DE KPIs
+# --------------------------
+KPI_DIR = f"{LOCAL_DATA_DIR}/kpis"  # Archivos parquet append-only (diario/ y horario/)
+KPI_MAX_PARTES = 50  # Partes acumuladas antes de compactar en un solo archivo
+KPI_DIAS_TENDENCIA = 7  # Franjas que se comparan para calcular tendencias
+RESOLUCION_PRECISION = 0.01  # Error relativo de los percentiles de tiempo de resolución
+CUBO_VERSIONES = 4  # Cubos de métricas que se conservan (uno por versión de datos en uso)
+
+# --------------------------
+# COLA DE IMPRESIÓN
+# --------------------------
+IMPRESION_DIR = f"{LOCAL_DATA_DIR}/impresiones"  # Artefactos generados en segundo plano (por fecha)
+IMPRESION_HILOS = 2  # Trabajos de impresión simultáneos
+IMPRESION_HORA_PROGRAMADA = "07:00"  # Hora (Argentina) de la impresión diaria automática (None = desactivada)
+IMPRESION_DIAS_RETENCION = 7  # Días que se conservan los PDFs generados
+IMPRESION_MAX_TRABAJOS = 50  # Trabajos que se muestran en el registro de la cola
+
+# --------------------------
+# TELEMETRÍA
+# --------------------------
+TELEMETRIA_HOST = "127.0.0.1"  # Interfaz del endpoint /metrics (solo local por defecto)
+TELEMETRIA_PUERTO = None  # Puerto del endpoint en formato Prometheus (None = desactivado)
+TELEMETRIA_ARCHIVO = None  # Archivo .prom reescrito periódicamente (p. ej. f"{LOCAL_DATA_DIR}/fusion.prom")
+TELEMETRIA_INTERVALO = 15  # Segundos entre escrituras del archivo
+TELEMETRIA_RESPALDOS = 3  # Copias anteriores del archivo que se conservan (fusion.prom.1, .2, ...)
+API_CUOTA_POR_MINUTO = 300  # Cuota de solicitudes por minuto del proyecto en la API de Sheets
 
 # --------------------------
 # FUNCIONES DE UTILIDAD
@@ -185,9 +264,17 @@ def rol_tiene_permiso(rol, permiso_requerido):
 # --------------------------
 COLOR_ADMIN = "#FF5733"  # Naranja
 COLOR_OFICINA = "#338AFF"  # Azul
+ESTILOS_ESTATICOS = True  # Publicar la hoja minificada en static/ (False = CSS en línea en cada rerun)
+ESTILOS_DIR = "static/css"  # Hojas publicadas como fusion.<hash>.css (servidas por enableStaticServing)
+ESTILOS_URL = "app/static/css"  # Ruta pública de ESTILOS_DIR
 
 # --------------------------
 # MODO DEPURACIÓN
 # --------------------------
 # Modo de depuración (True/False)
-DEBUG_MODE = False  # Cambiar a True si necesitas ver mensajes de depuración
\ No newline at end of file
+DEBUG_MODE = False  # Cambiar a True si necesitas ver mensajes de depuración
+TRAZA_API_MAX = 5000  # Llamadas a la API que se conservan en el buffer de trazas
+TRAZA_API_MUESTRA_FILAS = 50  # Filas muestreadas para estimar los bytes de una lectura grande
+PERFIL_MUESTRAS = 200  # Ejecuciones por componente que se conservan para las estadísticas de render
+PERFIL_MEMORIA = False  # Medir asignaciones de cada render con tracemalloc (agrega costo)
+PERFIL_DIR = f"{LOCAL_DATA_DIR}/perfiles"  # Salidas de cProfile/pyinstrument pedidas desde el panel
@@ -0,0 +1,271 @@
+# utils/almacenamiento_local.py
+"""
+Backend de almacenamiento offline con la misma interfaz que gspread.
+
+Permite correr la aplicación, los benchmarks y los datos sintéticos sin red
+ni credenciales: cada hoja es un CSV en disco (una carpeta por planilla) que
+se mantiene en memoria y se reescribe de forma atómica en cada modificación.
+
+Se activa con la variable de entorno OFFLINE_ENV_VAR (ver ApiManager.initialize).
+Solo implementa las operaciones de Worksheet que usa la aplicación.
+"""
+import csv
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import OFFLINE_DIR
+
+_A1 = re.compile(r"^([A-Z]*)(\d*)$")
+
+
+class HojaNoEncontrada(Exception):
+    """Equivalente a gspread.exceptions.WorksheetNotFound"""
+
+
+def letra_a_columna(letras: str) -> int:
+    """'A' -> 1, 'AA' -> 27"""
+    numero = 0
+    for letra in letras:
+        numero = numero * 26 + (ord(letra) - ord("A") + 1)
+    return numero
+
+
+def columna_a_letra(numero: int) -> str:
+    """1 -> 'A', 27 -> 'AA'"""
+    letras = ""
+    while numero > 0:
+        numero, resto = divmod(numero - 1, 26)
+        letras = chr(ord("A") + resto) + letras
+    return letras
+
+
+def parsear_rango(rango: str) -> Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]:
+    """
+    Convierte un rango A1 en (fila_ini, col_ini, fila_fin, col_fin), 1-based.
+
+    Las partes omitidas quedan en None ('B:B' no tiene filas, '3:3' no tiene columnas).
+    """
+    rango = rango.split("!")[-1].replace("$", "").upper()
+    inicio, _, fin = rango.partition(":")
+    fin = fin or inicio
+
+    def _celda(ref):
+        m = _A1.match(ref)
+        if not m:
+            raise ValueError(f"Rango no válido: {rango}")
+        letras, fila = m.groups()
+        return (int(fila) if fila else None), (letra_a_columna(letras) if letras else None)
+
+    fila_ini, col_ini = _celda(inicio)
+    fila_fin, col_fin = _celda(fin)
+    return fila_ini, col_ini, fila_fin, col_fin
+
+
+class HojaLocal:
+    """Worksheet en memoria respaldada por un CSV"""
+
+    def __init__(self, path: str, titulo: str):
+        self.path = path
+        self.title = titulo
+        self._filas: Optional[List[List[str]]] = None
+        self._lock = threading.RLock()
+
+    # --- Persistencia ---
+
+    def _datos(self) -> List[List[str]]:
+        if self._filas is None:
+            try:
+                with open(self.path, "r", encoding="utf-8", newline="") as f:
+                    self._filas = [fila for fila in csv.reader(f)]
+            except FileNotFoundError:
+                self._filas = []
+        return self._filas
+
+    def _guardar(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(self._filas)
+        os.replace(tmp, self.path)
+
+    def _agregar_al_archivo(self, filas: List[List[str]]) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(filas)
+
+    @staticmethod
+    def _texto(valor: Any) -> str:
+        if valor is None:
+            return ""
+        if isinstance(valor, bool):
+            return "TRUE" if valor else "FALSE"
+        return str(valor)
+
+    def _escribir(self, fila: int, col: int, valor: Any) -> None:
+        datos = self._datos()
+        while len(datos) < fila:
+            datos.append([])
+        registro = datos[fila - 1]
+        if len(registro) < col:
+            registro.extend([""] * (col - len(registro)))
+        registro[col - 1] = self._texto(valor)
+
+    # --- Interfaz de gspread.Worksheet ---
+
+    @property
+    def row_count(self) -> int:
+        return len(self._datos())
+
+    @property
+    def col_count(self) -> int:
+        return max((len(f) for f in self._datos()), default=0)
+
+    def get_all_values(self, *args, **kwargs) -> List[List[str]]:
+        """Matriz rectangular (como la API: filas completadas con '')"""
+        with self._lock:
+            ancho = self.col_count
+            return [fila + [""] * (ancho - len(fila)) for fila in self._datos()]
+
+    def get(self, rango: str, **kwargs) -> List[List[str]]:
+        fila_ini, col_ini, fila_fin, col_fin = parsear_rango(rango)
+        with self._lock:
+            datos = self._datos()
+            fila_ini, fila_fin = fila_ini or 1, fila_fin or len(datos)
+            col_ini, col_fin = col_ini or 1, col_fin or self.col_count
+            resultado = []
+            for fila in datos[fila_ini - 1:fila_fin]:
+                tramo = fila[col_ini - 1:col_fin]
+                resultado.append(tramo + [""] * (col_fin - col_ini + 1 - len(tramo)))
+            return resultado
+
+    def batch_get(self, rangos: List[str], **kwargs) -> List[List[List[str]]]:
+        with self._lock:
+            return [self.get(r) for r in rangos]
+
+    def row_values(self, fila: int, **kwargs) -> List[str]:
+        with self._lock:
+            datos = self._datos()
+            return list(datos[fila - 1]) if 0 < fila <= len(datos) else []
+
+    def col_values(self, col: int, **kwargs) -> List[str]:
+        with self._lock:
+            return [f[col - 1] if len(f) >= col else "" for f in self._datos()]
+
+    def append_row(self, valores: List[Any], **kwargs) -> Dict[str, Any]:
+        return self.append_rows([valores], **kwargs)
+
+    def append_rows(self, filas: List[List[Any]], **kwargs) -> Dict[str, Any]:
+        nuevas = [[self._texto(v) for v in fila] for fila in filas]
+        with self._lock:
+            datos = self._datos()
+            inicio = len(datos) + 1
+            datos.extend(nuevas)
+            self._agregar_al_archivo(nuevas)
+        return {"updates": {"updatedRange": f"{self.title}!A{inicio}", "updatedRows": len(nuevas)}}
+
+    def update_cell(self, fila: int, col: int, valor: Any) -> Dict[str, Any]:
+        with self._lock:
+            self._escribir(fila, col, valor)
+            self._guardar()
+        return {"updatedCells": 1}
+
+    def _actualizar_rango(self, rango: str, valores: List[List[Any]]) -> int:
+        fila_ini, col_ini, _, _ = parsear_rango(rango)
+        fila_ini, col_ini = fila_ini or 1, col_ini or 1
+        celdas = 0
+        for i, fila in enumerate(valores):
+            for j, valor in enumerate(fila):
+                self._escribir(fila_ini + i, col_ini + j, valor)
+                celdas += 1
+        return celdas
+
+    def update(self, *args, **kwargs) -> Dict[str, Any]:
+        """Acepta update(valores, rango) y la firma anterior update(rango, valores)"""
+        if args and isinstance(args[0], str):
+            rango, valores = args[0], args[1] if len(args) > 1 else kwargs.get("values")
+        else:
+            valores = args[0] if args else kwargs.get("values")
+            rango = args[1] if len(args) > 1 else kwargs.get("range_name", "A1")
+        if valores and not isinstance(valores[0], (list, tuple)):
+            valores = [valores]
+        with self._lock:
+            celdas = self._actualizar_rango(rango, valores or [])
+            self._guardar()
+        return {"updatedCells": celdas}
+
+    def batch_update(self, datos: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            celdas = sum(self._actualizar_rango(d["range"], d["values"]) for d in datos)
+            self._guardar()
+        return {"totalUpdatedCells": celdas}
+
+    def delete_rows(self, inicio: int, fin: Optional[int] = None) -> Dict[str, Any]:
+        with self._lock:
+            del self._datos()[inicio - 1:(fin or inicio)]
+            self._guardar()
+        return {}
+
+    def clear(self) -> Dict[str, Any]:
+        with self._lock:
+            self._filas = []
+            self._guardar()
+        return {}
+
+    def reemplazar(self, filas: List[List[Any]]) -> None:
+        """Carga masiva (no existe en gspread): reemplaza todo el contenido"""
+        with self._lock:
+            self._filas = [[self._texto(v) for v in fila] for fila in filas]
+            self._guardar()
+
+
+class LibroLocal:
+    """Spreadsheet: una carpeta con un CSV por hoja"""
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        self._hojas: Dict[str, HojaLocal] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, titulo: str) -> str:
+        return os.path.join(self.directorio, f"{titulo}.csv")
+
+    def _hoja(self, titulo: str) -> HojaLocal:
+        with self._lock:
+            if titulo not in self._hojas:
+                self._hojas[titulo] = HojaLocal(self._path(titulo), titulo)
+            return self._hojas[titulo]
+
+    def worksheet(self, titulo: str) -> HojaLocal:
+        if titulo not in self._hojas and not os.path.exists(self._path(titulo)):
+            raise HojaNoEncontrada(titulo)
+        return self._hoja(titulo)
+
+    def worksheets(self) -> List[HojaLocal]:
+        try:
+            nombres = sorted(n[:-4] for n in os.listdir(self.directorio) if n.endswith(".csv"))
+        except OSError:
+            nombres = []
+        return [self._hoja(n) for n in sorted(set(nombres) | set(self._hojas))]
+
+    def add_worksheet(self, title: str, rows: int = 0, cols: int = 0, **kwargs) -> HojaLocal:
+        hoja = self._hoja(title)
+        if not os.path.exists(hoja.path):
+            hoja.reemplazar([])
+        return hoja
+
+
+class ClienteLocal:
+    """Reemplazo de gspread.Client: open_by_key devuelve un LibroLocal"""
+
+    def __init__(self, base_dir: str = OFFLINE_DIR):
+        self.base_dir = base_dir
+        self._libros: Dict[str, LibroLocal] = {}
+        self._lock = threading.Lock()
+
+    def open_by_key(self, sheet_id: str) -> LibroLocal:
+        with self._lock:
+            if sheet_id not in self._libros:
+                self._libros[sheet_id] = LibroLocal(os.path.join(self.base_dir, sheet_id))
+            return self._libros[sheet_id]
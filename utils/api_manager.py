@@ -2,9 +2,22 @@
 Módulo para gestión segura de datos con Google Sheets
 Versión final fusionada
 """
+import logging
+import os
 import streamlit as st
 import time
 from typing import Any, List, Dict, Union, Optional, Tuple
+from config.settings import OFFLINE_ENV_VAR, OFFLINE_DIR
+from utils.trazas_api import registro_trazas, describir_rango, estimar_bytes
+from utils.telemetria import observar_api
+
+logger = logging.getLogger(__name__)
+
+# Métodos de hoja que modifican datos: invalidan los snapshots cargados de esa hoja
+OPERACIONES_ESCRITURA = frozenset({
+    "append_row", "append_rows", "update", "update_cell", "batch_update",
+    "delete_rows", "insert_row", "insert_rows", "clear",
+})
 
 class ApiManager:
     """Gestor de operaciones seguras con Google Sheets API"""
@@ -15,9 +28,29 @@ class ApiManager:
         self.last_call_time = 0
         self.min_call_interval = 0.1  # 100ms entre llamadas
         self.client = None
+        self.offline = False
+        self._hojas: Dict[Tuple[str, str], Any] = {}  # (sheet_id, worksheet) -> hoja abierta
+        self._generaciones: Dict[str, int] = {}  # título de hoja -> escrituras hechas por este proceso
+
+    def _initialize_offline(self, valor: str) -> Tuple[bool, Optional[str]]:
+        """Backend local (sin red ni credenciales) para desarrollo y benchmarks"""
+        from utils.almacenamiento_local import ClienteLocal
+
+        directorio = OFFLINE_DIR if valor.lower() in ("1", "true", "si", "sí") else valor
+        if not (isinstance(self.client, ClienteLocal) and self.client.base_dir == directorio):
+            self.client = ClienteLocal(directorio)
+            self._hojas.clear()
+        self.offline = True
+        return True, None
 
     def initialize(self) -> Tuple[bool, Optional[str]]:
-        """Inicializa el manager y establece conexión"""
+        """Inicializa el manager y establece conexión (una vez por proceso; luego no hace nada)"""
+        modo_offline = os.environ.get(OFFLINE_ENV_VAR, "").strip()
+        if modo_offline:
+            return self._initialize_offline(modo_offline)
+        if self.client is not None and not self.offline:
+            return True, None
+
         try:
             from google.oauth2 import service_account
             import gspread
@@ -58,42 +91,102 @@ class ApiManager:
             )
             
             self.client = gspread.authorize(creds)
+            self.offline = False
+            self._hojas.clear()
             return True, None
             
         except Exception as e:
             self.client = None
             return False, f"Error inicializando API: {str(e)}"
 
+    def _trazar(self, *args, **kwargs) -> None:
+        """Registra la llamada en las trazas y en las métricas del proceso (nunca falla)"""
+        try:
+            observar_api(registro_trazas.registrar(*args, **kwargs))
+        except Exception:
+            logger.debug("No se pudo registrar la traza de la API", exc_info=True)
+
+    def _trazar_operacion(self, operacion: str, hoja, args: tuple, kwargs: dict, resultado: Any,
+                          duracion: float, espera: float, error: Optional[str] = None) -> None:
+        """Traza una operación de hoja; describir o medir la llamada no puede afectar su resultado"""
+        try:
+            rango = describir_rango(operacion, args, kwargs)
+            bytes_ = estimar_bytes(operacion, args, resultado) if error is None else 0
+        except Exception:
+            rango, bytes_ = "desconocido", 0
+        self._trazar(operacion, getattr(hoja, "title", None), rango, bytes_, duracion, espera, error=error)
+
+    def generacion(self, titulo: Optional[str]) -> int:
+        """Cantidad de escrituras que este proceso hizo sobre la hoja (cambia con cada una)"""
+        return self._generaciones.get(titulo, 0)
+
     def open_sheet(self, sheet_id: str, worksheet_name: str):
-        """Abre una hoja de cálculo específica"""
+        """Abre una hoja de cálculo específica (la referencia se reutiliza entre reruns)"""
         if not self.client:
             st.error("API Manager no inicializado: client = None")
             return None
+        worksheet = self._hojas.get((sheet_id, worksheet_name))
+        if worksheet is not None:
+            return worksheet
+        inicio = time.perf_counter()
         try:
             spreadsheet = self.client.open_by_key(sheet_id)
-            return spreadsheet.worksheet(worksheet_name)
+            worksheet = spreadsheet.worksheet(worksheet_name)
+            self._trazar("open_sheet", worksheet_name, "metadatos", 0, time.perf_counter() - inicio)
+            self._hojas[(sheet_id, worksheet_name)] = worksheet
+            return worksheet
         except Exception as e:
+            self._trazar("open_sheet", worksheet_name, "metadatos", 0,
+                         time.perf_counter() - inicio, error=str(e))
             st.error(f"Error abriendo hoja {worksheet_name}: {str(e)}")
             return None
 
     def safe_sheet_operation(self, func, *args, **kwargs) -> Tuple[Any, Optional[str]]:
-        """Ejecuta operación segura sobre la API con control de rate limiting"""
+        """
+        Ejecuta operación segura sobre la API con control de rate limiting.
+
+        Solo los métodos de una hoja cuentan como llamadas a la API (se
+        limitan, se cuentan y se trazan). Las funciones auxiliares que a su
+        vez llaman a safe_sheet_operation se ejecutan directamente, para no
+        contar dos veces la misma llamada.
+        """
+        kwargs.pop("is_batch", None)  # Compatibilidad: ningún método de gspread lo acepta
+        hoja = getattr(func, "__self__", None)
+        if hoja is None:
+            try:
+                return func(*args, **kwargs), None
+            except Exception as e:
+                return None, f"Error en operación API: {str(e)}"
+
+        operacion = getattr(func, "__name__", "desconocida")
+        if operacion in OPERACIONES_ESCRITURA:
+            # Antes de escribir: aunque falle, la hoja pudo quedar modificada en parte
+            titulo = getattr(hoja, "title", None)
+            self._generaciones[titulo] = self._generaciones.get(titulo, 0) + 1
+        espera = 0.0
+        inicio = None
         try:
             current_time = time.time()
             time_since_last_call = current_time - self.last_call_time
 
             if time_since_last_call < self.min_call_interval:
-                time.sleep(self.min_call_interval - time_since_last_call)
+                espera = self.min_call_interval - time_since_last_call
+                time.sleep(espera)
 
             self.total_calls += 1
             self.last_call_time = time.time()
 
+            inicio = time.perf_counter()
             result = func(*args, **kwargs)
-            return result, None
         except Exception as e:
             self.error_count += 1
+            self._trazar_operacion(operacion, hoja, args, kwargs, None,
+                                   time.perf_counter() - inicio if inicio else 0.0, espera, error=str(e))
             return None, f"Error en operación API: {str(e)}"
 
+        self._trazar_operacion(operacion, hoja, args, kwargs, result, time.perf_counter() - inicio, espera)
+        return result, None
+
     def get_stats(self) -> Dict[str, Any]:
         """Devuelve estadísticas de uso de la API"""
         return {
@@ -145,7 +238,7 @@ def update_cell(worksheet, row: int, col: int, value: Any) -> Tuple[bool, Option
         return False, f"Error update_cell: {str(e)}"
 
 def initialize_api() -> bool:
-    """Inicializa la API automáticamente al importar"""
+    """Inicializa la API (app.py lo hace al comienzo de cada rerun con api_manager.initialize())"""
     success, error = api_manager.initialize()
     if not success and st.secrets.get("DEBUG_MODE", False):
         st.warning(f"API no inicializada: {error}")
@@ -155,6 +248,3 @@ def init_api_session_state():
     """Inicializa variables de sesión relacionadas con la API."""
     if "api_initialized" not in st.session_state:
         st.session_state.api_initialized = True
-
-# Inicializar al importar
-initialize_api()
@@ -0,0 +1,254 @@
+# utils/capacidad.py
+"""
+Motor de planificación de capacidad multi-día para grupos de técnicos.
+
+El historial de reclamos se pre-agrega una sola vez por versión de datos
+(tiempos de resolución por tipo y aporte diario por técnico). Las
+proyecciones trabajan solo sobre esas tablas chicas, por lo que se mantienen
+interactivas aunque la hoja acumule años de reclamos.
+"""
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from utils.date_utils import ahora_argentina, parse_fechas_series
+from utils.telemetria import cache_medida
+from config.settings import (
+    CAPACIDAD_DIAS_INGRESO,
+    CAPACIDAD_APORTE_DEFAULT,
+)
+
+
+def separar_tecnicos(serie: pd.Series) -> pd.Series:
+    """Convierte 'JUAN, MAXI' en filas individuales (explode) normalizadas en mayúsculas"""
+    tecnicos = (
+        serie.fillna("").astype(str).str.upper()
+        .str.split(",")
+        .explode()
+        .str.strip()
+    )
+    return tecnicos[tecnicos != ""]
+
+
+def normalizar_grupo_tecnicos(serie: pd.Series) -> pd.Series:
+    """Clave estable de la cuadrilla: 'maxi, Juan' y 'JUAN,MAXI' -> 'JUAN, MAXI'"""
+    return (
+        serie.fillna("").astype(str).str.upper().str.split(",")
+        .map(lambda ts: ", ".join(sorted(t.strip() for t in ts if t.strip())))
+    )
+
+
+def calcular_horas_resolucion(df_reclamos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula el tiempo de resolución (horas) de cada reclamo resuelto.
+
+    Usa 'Fecha y hora' como apertura y 'Fecha_formateada' como cierre
+    (la completa cierre.py al marcar el reclamo como resuelto).
+
+    Returns:
+        DataFrame con columnas Tipo de reclamo, Sector, Técnico, apertura, cierre, horas
+    """
+    columnas = ["Tipo de reclamo", "Sector", "Técnico", "apertura", "cierre", "horas"]
+    if df_reclamos.empty or "Fecha_formateada" not in df_reclamos.columns:
+        return pd.DataFrame(columns=columnas)
+
+    resueltos = df_reclamos[
+        df_reclamos["Estado"].astype(str).str.strip().str.lower() == "resuelto"
+    ]
+    df = pd.DataFrame({
+        "Tipo de reclamo": resueltos["Tipo de reclamo"].fillna("Sin tipo").astype(str).str.strip(),
+        "Sector": resueltos["Sector"].astype(str).str.strip(),
+        "Técnico": resueltos["Técnico"].fillna("").astype(str),
+        "apertura": parse_fechas_series(resueltos["Fecha y hora"]),
+        "cierre": parse_fechas_series(resueltos["Fecha_formateada"]),
+    })
+    df["horas"] = (df["cierre"] - df["apertura"]).dt.total_seconds() / 3600
+    return df[df["horas"].notna() & (df["horas"] >= 0)][columnas]
+
+
+@cache_medida("historial_agregado", st.cache_data(show_spinner=False))
+def historial_agregado(_df_reclamos: pd.DataFrame, version: str) -> Dict[str, Any]:
+    """
+    Pre-agrega el historial de resoluciones (memoizado por versión de datos).
+
+    Returns:
+        dict con:
+            horas_por_tipo: horas medias de resolución por tipo
+            horas_por_tipo_tecnico: horas medias por (tipo, técnico)
+            aporte_tecnico: reclamos/día que aporta cada técnico
+            rendimiento_cuadrilla: reclamos/día de una cuadrilla según su tamaño
+            ingreso_diario: reclamos nuevos por día (media reciente)
+            horas_media: media global de horas de resolución
+    """
+    tiempos = calcular_horas_resolucion(_df_reclamos)
+
+    horas_media = float(tiempos["horas"].mean()) if not tiempos.empty else 0.0
+    horas_por_tipo = tiempos.groupby("Tipo de reclamo")["horas"].mean()
+
+    por_tecnico = tiempos.drop(columns="Técnico").join(separar_tecnicos(tiempos["Técnico"]), how="inner")
+    horas_por_tipo_tecnico = por_tecnico.groupby(["Tipo de reclamo", "Técnico"])["horas"].agg(["mean", "count"])
+
+    # Aporte individual: reclamos cerrados por la cuadrilla en el día / tamaño de la cuadrilla
+    aporte_tecnico = pd.Series(dtype=float)
+    rendimiento_cuadrilla = pd.Series(dtype=float)
+    if not tiempos.empty:
+        cuadrillas = tiempos.assign(
+            dia=tiempos["cierre"].dt.normalize(),
+            tamano=tiempos["Técnico"].str.count(",") + 1,
+        )
+        cuadrillas = cuadrillas[cuadrillas["Técnico"].str.strip() != ""]
+        diario = cuadrillas.groupby(["Técnico", "dia"]).agg(cant=("horas", "size"), tamano=("tamano", "first"))
+        diario["aporte"] = diario["cant"] / diario["tamano"]
+        rendimiento_cuadrilla = diario.groupby("tamano")["cant"].mean()
+        diario = diario.reset_index()
+        diario = diario.drop(columns="Técnico").join(separar_tecnicos(diario["Técnico"]), how="inner")
+        aporte_tecnico = diario.groupby(["Técnico", "dia"])["aporte"].sum().groupby(level=0).mean()
+
+    ingreso_diario = 0.0
+    aperturas = parse_fechas_series(_df_reclamos["Fecha y hora"]) if "Fecha y hora" in _df_reclamos else pd.Series(dtype="datetime64[ns]")
+    if aperturas.notna().any():
+        hoy = pd.Timestamp(ahora_argentina()).tz_localize(None).normalize()
+        desde = hoy - pd.Timedelta(days=CAPACIDAD_DIAS_INGRESO)
+        recientes = aperturas[(aperturas >= desde) & (aperturas < hoy)]
+        ingreso_diario = len(recientes) / CAPACIDAD_DIAS_INGRESO
+
+    return {
+        "horas_por_tipo": horas_por_tipo.to_dict(),
+        "horas_por_tipo_tecnico": horas_por_tipo_tecnico,
+        "aporte_tecnico": aporte_tecnico.to_dict(),
+        "rendimiento_cuadrilla": {int(k): float(v) for k, v in rendimiento_cuadrilla.items()},
+        "ingreso_diario": ingreso_diario,
+        "horas_media": horas_media,
+    }
+
+
+def _peso_por_tipo(historial: Dict[str, Any], tipo: str) -> float:
+    """Dificultad relativa del tipo (1.0 = reclamo promedio)"""
+    media = historial["horas_media"]
+    if not media:
+        return 1.0
+    return historial["horas_por_tipo"].get(tipo, media) / media
+
+
+def capacidad_grupo(historial: Dict[str, Any], tecnicos: List[str]) -> float:
+    """
+    Reclamos/día que puede resolver un grupo.
+
+    Parte del rendimiento histórico de cuadrillas del mismo tamaño y lo ajusta
+    por el aporte relativo de los técnicos que la integran.
+    """
+    if not tecnicos:
+        return 0.0
+
+    rendimiento = historial["rendimiento_cuadrilla"]
+    tamano = len(tecnicos)
+    if rendimiento:
+        cercano = min(rendimiento, key=lambda k: abs(k - tamano))
+        base = rendimiento[cercano]
+    else:
+        base = CAPACIDAD_APORTE_DEFAULT
+
+    aporte = historial["aporte_tecnico"]
+    aporte_medio = (sum(aporte.values()) / len(aporte)) if aporte else CAPACIDAD_APORTE_DEFAULT
+    factores = [aporte.get(t.strip().upper(), aporte_medio) / aporte_medio for t in tecnicos]
+    return base * sum(factores) / len(factores)
+
+
+def proyectar_backlog(
+    historial: Dict[str, Any],
+    df_pendientes: pd.DataFrame,
+    grupos: List[List[str]],
+    dias: int,
+    ingreso_diario: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Proyecta la evolución del backlog pendiente para los próximos días.
+
+    El backlog se mide en "reclamos equivalentes" (ponderados por la dificultad
+    histórica de cada tipo) para que 10 conexiones no pesen igual que 10 sintonías.
+
+    Args:
+        historial: Resultado de historial_agregado
+        df_pendientes: Reclamos pendientes actuales
+        grupos: Lista de grupos, cada uno con su lista de técnicos
+        dias: Horizonte de proyección
+        ingreso_diario: Reclamos nuevos por día (por defecto el histórico)
+
+    Returns:
+        DataFrame con Día, Backlog inicial, Ingresos, Resueltos y Backlog final
+    """
+    if ingreso_diario is None:
+        ingreso_diario = historial["ingreso_diario"]
+
+    pesos = df_pendientes["Tipo de reclamo"].map(lambda t: _peso_por_tipo(historial, t))
+    backlog = float(pesos.sum())
+    capacidad = sum(capacidad_grupo(historial, g) for g in grupos if g)
+
+    hoy = ahora_argentina().date()
+    filas = []
+    for d in range(1, dias + 1):
+        inicial = backlog
+        resueltos = min(inicial + ingreso_diario, capacidad)
+        backlog = max(0.0, inicial + ingreso_diario - capacidad)
+        filas.append({
+            "Día": hoy + timedelta(days=d),
+            "Backlog inicial": round(inicial, 1),
+            "Ingresos": round(ingreso_diario, 1),
+            "Resueltos": round(resueltos, 1),
+            "Backlog final": round(backlog, 1),
+        })
+    return pd.DataFrame(filas)
+
+
+def _armar_cuadrillas(tecnicos: List[str], cantidad_grupos: int) -> List[List[str]]:
+    """Reparte técnicos ordenados por aporte en forma de serpentina para equilibrar grupos"""
+    grupos = [[] for _ in range(cantidad_grupos)]
+    for i, tecnico in enumerate(tecnicos):
+        vuelta, pos = divmod(i, cantidad_grupos)
+        indice = pos if vuelta % 2 == 0 else cantidad_grupos - 1 - pos
+        grupos[indice].append(tecnico)
+    return grupos
+
+
+def recomendar_grupos(
+    historial: Dict[str, Any],
+    df_pendientes: pd.DataFrame,
+    tecnicos_disponibles: List[str],
+    dias: int,
+    max_grupos: int = 5,
+) -> Dict[str, Any]:
+    """
+    Recomienda la cantidad de grupos y su composición para vaciar el backlog.
+
+    Elige la menor cantidad de grupos cuyo backlog proyectado llega a cero dentro
+    del horizonte; si ninguna lo logra, la que termina con menos backlog.
+
+    Returns:
+        dict con cantidad_grupos, cuadrillas, proyeccion y dias_para_vaciar (None si no se vacía)
+    """
+    aporte = historial["aporte_tecnico"]
+    tecnicos = sorted(
+        tecnicos_disponibles,
+        key=lambda t: aporte.get(t.strip().upper(), CAPACIDAD_APORTE_DEFAULT),
+        reverse=True,
+    )
+
+    mejor = None
+    for cantidad in range(1, min(max_grupos, len(tecnicos)) + 1):
+        cuadrillas = _armar_cuadrillas(tecnicos, cantidad)
+        proyeccion = proyectar_backlog(historial, df_pendientes, cuadrillas, dias)
+        vacios = proyeccion.index[proyeccion["Backlog final"] <= 0]
+        dias_para_vaciar = int(vacios[0]) + 1 if len(vacios) else None
+        candidato = {
+            "cantidad_grupos": cantidad,
+            "cuadrillas": cuadrillas,
+            "proyeccion": proyeccion,
+            "dias_para_vaciar": dias_para_vaciar,
+        }
+        if dias_para_vaciar is not None:
+            return candidato
+        if mejor is None or proyeccion["Backlog final"].iloc[-1] < mejor["proyeccion"]["Backlog final"].iloc[-1]:
+            mejor = candidato
+    return mejor
@@ -0,0 +1,327 @@
+# utils/cola_impresion.py
+"""
+Cola de trabajos de impresión en segundo plano.
+
+Los PDFs habituales (todos los pendientes, por tipo, desconexiones y en curso
+por técnico) se generan en un pool de hilos y quedan guardados en una caché
+local de artefactos. Un planificador los prepara antes del turno de la mañana
+para que estén listos para descargar al empezar el día.
+
+La cola se crea al arrancar la app (no al abrir la página de impresión) y
+el registro de trabajos se guarda en IMPRESION_DIR: los que quedaron sin
+terminar al reiniciar el proceso se vuelven a encolar. El motor de PDFs se
+importa recién al generar el primer trabajo.
+
+El planificador también borra cada minuto los PDFs exportados vencidos
+(EXPORTS_DIR, PDF_EXPORT_TTL): tienen datos de clientes y no deben quedar
+esperando a la próxima exportación.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from utils.date_utils import ahora_argentina
+from config.settings import (
+    IMPRESION_DIR,
+    IMPRESION_HILOS,
+    IMPRESION_HORA_PROGRAMADA,
+    IMPRESION_DIAS_RETENCION,
+    IMPRESION_MAX_TRABAJOS,
+    EXPORTS_DIR,
+    PDF_EXPORT_TTL,
+)
+
+ESTADOS_TRABAJO = ("En cola", "Generando", "Listo", "Error")
+
+
+def limpiar_exportaciones(ahora: Optional[float] = None) -> int:
+    """Elimina exportaciones vencidas (PDF_EXPORT_TTL). Devuelve cuántas se borraron"""
+    ahora = ahora or time.time()
+    borradas = 0
+    try:
+        nombres = os.listdir(EXPORTS_DIR)
+    except OSError:
+        return 0
+    for nombre in nombres:
+        ruta = os.path.join(EXPORTS_DIR, nombre)
+        try:
+            if os.path.isfile(ruta) and ahora - os.stat(ruta).st_mtime > PDF_EXPORT_TTL:
+                os.remove(ruta)
+                borradas += 1
+        except OSError:
+            continue
+    return borradas
+
+
+# ==================== DEFINICIÓN DE TRABAJOS ====================
+
+def _filtrar_estado(df: pd.DataFrame, estado: str) -> pd.DataFrame:
+    return df[df["Estado"].astype(str).str.strip().str.lower() == estado]
+
+
+def _trabajo_todos_pendientes(df: pd.DataFrame, parametros: Dict[str, Any]):
+    from utils.pdf_utils import PlantillaPagina, Seccion, bloques_reclamos
+    orden = parametros.get("orden", "Tipo de reclamo")
+    df_pendientes = _filtrar_estado(df, "pendiente").sort_values(orden)
+    criterio = "TIPO" if orden == "Tipo de reclamo" else "SECTOR"
+    plantilla = PlantillaPagina(f"TODOS LOS RECLAMOS PENDIENTES (ORDENADOS POR {criterio})")
+    return plantilla, [Seccion(bloques_reclamos(df_pendientes))], "todos_reclamos_pendientes.pdf", len(df_pendientes)
+
+
+def _trabajo_por_tipo(df: pd.DataFrame, parametros: Dict[str, Any]):
+    from utils.pdf_utils import PlantillaPagina, Seccion, bloques_reclamos
+    tipos = list(parametros.get("tipos", []))
+    if parametros.get("solo_pendientes", True):
+        df = _filtrar_estado(df, "pendiente")
+    df_tipos = df[df["Tipo de reclamo"].isin(tipos)]
+    nombre = f"reclamos_{'_'.join(t.lower().replace(' ', '_') for t in tipos)}.pdf"
+    plantilla = PlantillaPagina(f"RECLAMOS - {', '.join(tipos)}")
+    return plantilla, [Seccion(bloques_reclamos(df_tipos))], nombre, len(df_tipos)
+
+
+def _trabajo_desconexiones(df: pd.DataFrame, parametros: Dict[str, Any]):
+    from utils.pdf_utils import PlantillaPagina, Seccion, bloques_reclamos
+    df_desc = df[
+        (df["Tipo de reclamo"].astype(str).str.strip().str.lower() == "desconexion a pedido") &
+        (df["Estado"].astype(str).str.strip().str.lower() == "desconexión")
+    ]
+    plantilla = PlantillaPagina("LISTADO DE CLIENTES PARA DESCONEXIÓN")
+    return plantilla, [Seccion(bloques_reclamos(df_desc))], "desconexiones.pdf", len(df_desc)
+
+
+def _trabajo_en_curso_tecnico(df: pd.DataFrame, parametros: Dict[str, Any]):
+    from utils.pdf_utils import PlantillaPagina, secciones_por_tecnico
+    df_en_curso = _filtrar_estado(df, "en curso").copy()
+    df_en_curso["Técnico"] = df_en_curso["Técnico"].fillna("Sin técnico").str.upper()
+    hoy = ahora_argentina().strftime('%d/%m/%Y')
+    plantilla = PlantillaPagina(f"RECLAMOS EN CURSO - {hoy}", con_fecha=False)
+    return plantilla, secciones_por_tecnico(df_en_curso), "reclamos_en_curso_tecnicos.pdf", len(df_en_curso)
+
+
+TIPOS_TRABAJO: Dict[str, Tuple[str, Callable]] = {
+    "todos_pendientes": ("Todos los pendientes", _trabajo_todos_pendientes),
+    "por_tipo": ("Por tipo de reclamo", _trabajo_por_tipo),
+    "desconexiones": ("Desconexiones a pedido", _trabajo_desconexiones),
+    "en_curso_tecnico": ("En curso por técnico", _trabajo_en_curso_tecnico),
+}
+
+# Trabajos que se preparan automáticamente antes del turno
+TRABAJOS_PROGRAMADOS = [
+    ("todos_pendientes", {"orden": "Tipo de reclamo"}),
+    ("todos_pendientes", {"orden": "Sector"}),
+    ("desconexiones", {}),
+    ("en_curso_tecnico", {}),
+]
+
+
+def _cargar_datos_impresion() -> pd.DataFrame:
+    """Lee reclamos y clientes directamente de la hoja (para trabajos programados)"""
+    from utils.api_manager import api_manager
+    from utils.data_manager import safe_get_sheet_data
+    from utils.pdf_utils import preparar_reclamos_impresion
+    from config.settings import (
+        SHEET_ID, WORKSHEET_RECLAMOS, WORKSHEET_CLIENTES, COLUMNAS_RECLAMOS, COLUMNAS_CLIENTES
+    )
+
+    sheet_reclamos = api_manager.open_sheet(SHEET_ID, WORKSHEET_RECLAMOS)
+    sheet_clientes = api_manager.open_sheet(SHEET_ID, WORKSHEET_CLIENTES)
+    if sheet_reclamos is None or sheet_clientes is None:
+        raise RuntimeError("No se pudo abrir la hoja de reclamos o de clientes")
+    df_reclamos = safe_get_sheet_data(sheet_reclamos, COLUMNAS_RECLAMOS)
+    df_clientes = safe_get_sheet_data(sheet_clientes, COLUMNAS_CLIENTES)
+    return preparar_reclamos_impresion(df_reclamos, df_clientes)
+
+
+# ==================== COLA ====================
+
+class ColaImpresion:
+    """Pool de hilos con registro de trabajos y planificador diario"""
+
+    def __init__(self, base_dir: str = IMPRESION_DIR, hora_programada: Optional[str] = IMPRESION_HORA_PROGRAMADA):
+        self.base_dir = base_dir
+        self.hora_programada = hora_programada
+        self._executor = ThreadPoolExecutor(max_workers=IMPRESION_HILOS, thread_name_prefix="impresion")
+        self._trabajos: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._ultima_programada: Optional[str] = None
+        self._path_registro = os.path.join(base_dir, "trabajos.json")
+        self._planificador: Optional[threading.Thread] = None
+        self._restaurar_registro()
+        if hora_programada:
+            self._planificador = threading.Thread(target=self._bucle_planificador, name="impresion-planificador", daemon=True)
+            self._planificador.start()
+
+    def encolar(self, tipo: str, parametros: Optional[Dict[str, Any]] = None,
+                df_merged: Optional[pd.DataFrame] = None, usuario: Optional[str] = None,
+                programado: bool = False) -> str:
+        """
+        Agrega un trabajo a la cola.
+
+        Args:
+            tipo: Clave de TIPOS_TRABAJO
+            parametros: Parámetros del trabajo (orden, tipos, solo_pendientes)
+            df_merged: Datos ya preparados; si es None se leen de la hoja al ejecutar
+            usuario: Nombre a mostrar en el PDF
+
+        Returns:
+            ID del trabajo
+        """
+        if tipo not in TIPOS_TRABAJO:
+            raise ValueError(f"Tipo de trabajo no válido: {tipo}. Opciones: {list(TIPOS_TRABAJO)}")
+
+        trabajo = {
+            "id": uuid.uuid4().hex[:8],
+            "tipo": tipo,
+            "descripcion": TIPOS_TRABAJO[tipo][0],
+            "parametros": dict(parametros or {}),
+            "usuario": usuario,
+            "programado": programado,
+            "estado": "En cola",
+            "creado": ahora_argentina(),
+            "terminado": None,
+            "ruta": None,
+            "nombre_archivo": None,
+            "cantidad": None,
+            "error": None,
+        }
+        with self._lock:
+            self._trabajos[trabajo["id"]] = trabajo
+            self._recortar_registro()
+            self._guardar_registro()
+        self._executor.submit(self._ejecutar, trabajo, df_merged)
+        return trabajo["id"]
+
+    def listar(self) -> List[Dict[str, Any]]:
+        """Trabajos registrados, del más reciente al más antiguo"""
+        with self._lock:
+            trabajos = [dict(t) for t in self._trabajos.values()]
+        return sorted(trabajos, key=lambda t: t["creado"], reverse=True)
+
+    def detener(self) -> None:
+        self._detener.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _ejecutar(self, trabajo: Dict[str, Any], df_merged: Optional[pd.DataFrame]) -> None:
+        from utils.pdf_utils import guardar_pdf
+
+        trabajo["estado"] = "Generando"
+        try:
+            df = df_merged if df_merged is not None else _cargar_datos_impresion()
+            plantilla, secciones, nombre, cantidad = TIPOS_TRABAJO[trabajo["tipo"]][1](df, trabajo["parametros"])
+            plantilla.autor = trabajo["usuario"]
+
+            fecha = trabajo["creado"].strftime("%Y-%m-%d")
+            ruta = os.path.join(self.base_dir, fecha, f"{trabajo['creado'].strftime('%H%M')}_{trabajo['id']}_{nombre}")
+            guardar_pdf(plantilla, secciones, ruta)
+
+            trabajo.update(ruta=ruta, nombre_archivo=nombre, cantidad=cantidad, estado="Listo")
+        except Exception as e:
+            trabajo.update(estado="Error", error=str(e))
+        finally:
+            trabajo["terminado"] = ahora_argentina()
+            with self._lock:
+                self._guardar_registro()
+
+    def _guardar_registro(self) -> None:
+        """Persiste el registro de trabajos y la última impresión programada (llamar con el lock)"""
+        def serializar(t):
+            return {**t, "creado": t["creado"].isoformat(),
+                    "terminado": t["terminado"].isoformat() if t["terminado"] else None}
+
+        datos = {"ultima_programada": self._ultima_programada,
+                 "trabajos": [serializar(t) for t in self._trabajos.values()]}
+        try:
+            os.makedirs(self.base_dir, exist_ok=True)
+            temporal = f"{self._path_registro}.tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(datos, f, ensure_ascii=False)
+            os.replace(temporal, self._path_registro)
+        except OSError:
+            pass
+
+    def _restaurar_registro(self) -> None:
+        """Carga el registro guardado y vuelve a encolar lo que quedó sin terminar"""
+        try:
+            with open(self._path_registro, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._ultima_programada = datos.get("ultima_programada")
+        pendientes = []
+        for t in datos.get("trabajos", []):
+            try:
+                t["creado"] = datetime.fromisoformat(t["creado"])
+                t["terminado"] = datetime.fromisoformat(t["terminado"]) if t.get("terminado") else None
+            except (KeyError, TypeError, ValueError):
+                continue
+            if t.get("tipo") not in TIPOS_TRABAJO:
+                continue
+            self._trabajos[t["id"]] = t
+            if t["estado"] in ("En cola", "Generando"):
+                t["estado"] = "En cola"
+                pendientes.append(t)
+        # Los datos en memoria de la sesión que los pidió se perdieron: se leen de la hoja
+        for t in pendientes:
+            self._executor.submit(self._ejecutar, t, None)
+
+    def _recortar_registro(self) -> None:
+        """Mantiene como máximo IMPRESION_MAX_TRABAJOS entradas (descarta las terminadas más viejas)"""
+        sobrantes = len(self._trabajos) - IMPRESION_MAX_TRABAJOS
+        if sobrantes <= 0:
+            return
+        terminados = sorted(
+            (t for t in self._trabajos.values() if t["estado"] in ("Listo", "Error")),
+            key=lambda t: t["creado"],
+        )
+        for t in terminados[:sobrantes]:
+            del self._trabajos[t["id"]]
+
+    def _limpiar_artefactos(self) -> None:
+        """Borra las carpetas de días anteriores a la retención configurada"""
+        limite = (ahora_argentina() - pd.Timedelta(days=IMPRESION_DIAS_RETENCION)).strftime("%Y-%m-%d")
+        try:
+            carpetas = os.listdir(self.base_dir)
+        except OSError:
+            return
+        for carpeta in carpetas:
+            if carpeta < limite:
+                ruta = os.path.join(self.base_dir, carpeta)
+                for nombre in os.listdir(ruta):
+                    try:
+                        os.remove(os.path.join(ruta, nombre))
+                    except OSError:
+                        pass
+                try:
+                    os.rmdir(ruta)
+                except OSError:
+                    pass
+
+    def _bucle_planificador(self) -> None:
+        """Encola los trabajos programados una vez por día y borra las exportaciones vencidas"""
+        while not self._detener.wait(60):
+            limpiar_exportaciones()
+            ahora = ahora_argentina()
+            hoy = ahora.strftime("%Y-%m-%d")
+            if self._ultima_programada == hoy or ahora.strftime("%H:%M") < self.hora_programada:
+                continue
+            self._ultima_programada = hoy
+            with self._lock:
+                self._guardar_registro()
+            self._limpiar_artefactos()
+            for tipo, parametros in TRABAJOS_PROGRAMADOS:
+                self.encolar(tipo, parametros, programado=True)
+
+
+@st.cache_resource
+def obtener_cola_impresion() -> ColaImpresion:
+    """Cola única por proceso (compartida entre sesiones; app.py la crea al arrancar)"""
+    return ColaImpresion()
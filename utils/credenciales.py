@@ -0,0 +1,285 @@
+# utils/credenciales.py
+"""
+Credenciales de usuarios: hashes salados y directorio en memoria.
+
+- Contraseñas con PBKDF2-SHA256 y sal aleatoria, formato
+  "pbkdf2_sha256$<iteraciones>$<sal>$<hash>" (base64)
+- Comparación en tiempo constante (hmac.compare_digest)
+- Directorio de usuarios cacheado con TTL: el login no descarga la hoja en cada intento
+- Sesiones del lado del servidor con vencimiento y revocación: el navegador
+  solo guarda un identificador opaco (cookie) atado a la huella del cliente,
+  y el rol se toma siempre del directorio
+"""
+import base64
+import functools
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import pandas as pd
+import streamlit as st
+
+from utils.api_manager import api_manager
+from utils.data_manager import safe_get_sheet_data
+from utils.telemetria import cache_medida
+from config.settings import (
+    COLUMNAS_USUARIOS,
+    PERMISOS_POR_ROL,
+    AUTH_PBKDF2_ITERACIONES,
+    AUTH_DIRECTORIO_TTL,
+    AUTH_MIGRAR_HASHES,
+    SESSION_TIMEOUT,
+    SESSION_STORE_PATH,
+)
+
+PREFIJO_HASH = "pbkdf2_sha256"
+COLUMNA_PASSWORD = COLUMNAS_USUARIOS.index("password") + 1
+
+
+def hash_password(password: str, salt: Optional[bytes] = None, iteraciones: int = AUTH_PBKDF2_ITERACIONES) -> str:
+    """Genera el hash almacenable de una contraseña"""
+    salt = salt or os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iteraciones)
+    return "$".join([
+        PREFIJO_HASH,
+        str(iteraciones),
+        base64.b64encode(salt).decode("ascii"),
+        base64.b64encode(digest).decode("ascii"),
+    ])
+
+
+def es_hash(almacenado: str) -> bool:
+    return str(almacenado).startswith(f"{PREFIJO_HASH}$")
+
+
+def verificar_password(password: str, almacenado: str) -> bool:
+    """
+    Verifica una contraseña contra el valor guardado (tiempo constante).
+
+    Acepta también contraseñas heredadas en texto plano para permitir la migración.
+    """
+    almacenado = str(almacenado or "")
+    if not es_hash(almacenado):
+        return bool(almacenado) and hmac.compare_digest(password.encode("utf-8"), almacenado.encode("utf-8"))
+    try:
+        _, iteraciones, salt_b64, hash_b64 = almacenado.split("$")
+        esperado = base64.b64decode(hash_b64)
+        calculado = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), base64.b64decode(salt_b64), int(iteraciones))
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(calculado, esperado)
+
+
+@cache_medida("cargar_directorio", st.cache_data(ttl=AUTH_DIRECTORIO_TTL, show_spinner=False))
+def cargar_directorio(_sheet_usuarios) -> Dict[str, Dict[str, Any]]:
+    """
+    Directorio de usuarios normalizado (cacheado con TTL y compartido entre sesiones).
+
+    Returns:
+        dict username -> {password, nombre, rol, activo, fila}
+    """
+    df = safe_get_sheet_data(_sheet_usuarios, COLUMNAS_USUARIOS)
+    if df.empty:
+        return {}
+
+    df = pd.DataFrame({
+        "username": df["username"].astype(str).str.strip().str.lower(),
+        "password": df["password"].astype(str).str.strip(),
+        "nombre": df["nombre"].astype(str),
+        "rol": df["rol"].astype(str).str.strip().str.lower(),
+        "activo": df["activo"].astype(str).str.upper().isin(["SI", "TRUE", "1", "SÍ", "VERDADERO"]),
+        "fila": df.index + 2,  # encabezado en la fila 1
+    })
+    return {r["username"]: r for r in df.to_dict("records") if r["username"]}
+
+
+@functools.lru_cache(maxsize=1)
+def _hash_ficticio() -> str:
+    return hash_password("", salt=b"\0" * 16)
+
+
+def invalidar_directorio() -> None:
+    """Fuerza la recarga del directorio (p. ej. después de modificar usuarios)"""
+    cargar_directorio.clear()
+
+
+def _migrar_hash(sheet_usuarios, usuario: Dict[str, Any], password: str) -> None:
+    """Reemplaza una contraseña en texto plano por su hash tras un login correcto"""
+    nuevo = hash_password(password)
+    _, error = api_manager.safe_sheet_operation(
+        sheet_usuarios.update_cell, int(usuario["fila"]), COLUMNA_PASSWORD, nuevo
+    )
+    if not error:
+        invalidar_directorio()
+
+
+def _user_info(usuario: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "username": usuario["username"],
+        "nombre": usuario["nombre"],
+        "rol": usuario["rol"],
+        "permisos": PERMISOS_POR_ROL.get(usuario["rol"], {}).get('permisos', []),
+    }
+
+
+def autenticar(username: str, password: str, sheet_usuarios) -> Optional[Dict[str, Any]]:
+    """
+    Única ruta de verificación de credenciales.
+
+    Returns:
+        user_info (username, nombre, rol, permisos) o None si no son válidas
+    """
+    usuario = cargar_directorio(sheet_usuarios).get(username.strip().lower())
+    if usuario is None:
+        # Mismo costo que un usuario existente para no revelar cuáles existen
+        verificar_password(password, _hash_ficticio())
+        return None
+
+    if not verificar_password(password.strip(), usuario["password"]) or not usuario["activo"]:
+        return None
+
+    if AUTH_MIGRAR_HASHES and not es_hash(usuario["password"]):
+        _migrar_hash(sheet_usuarios, usuario, password.strip())
+
+    return _user_info(usuario)
+
+
+# --------------------------
+# SESIONES DEL SERVIDOR
+# --------------------------
+# El navegador solo guarda un identificador aleatorio y opaco; usuario,
+# vencimiento y huella del cliente quedan en el servidor (se guarda el hash del
+# identificador, no el identificador), así una sesión se puede revocar, no sirve
+# desde otro navegador y el rol nunca sale del token.
+
+_lock_sesiones = threading.Lock()
+_sesiones: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def _clave_sesion(sesion_id: str) -> str:
+    return hashlib.sha256(sesion_id.encode("utf-8")).hexdigest()
+
+
+def _cargar_sesiones() -> Dict[str, Dict[str, Any]]:
+    """Sesiones vigentes (se leen del archivo una vez por proceso; llamar con el lock)"""
+    global _sesiones
+    if _sesiones is None:
+        try:
+            with open(SESSION_STORE_PATH, "r", encoding="utf-8") as f:
+                _sesiones = json.load(f)
+        except (OSError, ValueError):
+            _sesiones = {}
+    ahora = time.time()
+    for clave in [c for c, s in _sesiones.items() if s.get("exp", 0) <= ahora]:
+        del _sesiones[clave]
+    return _sesiones
+
+
+def _guardar_sesiones() -> None:
+    """Escritura atómica del almacén de sesiones (llamar con el lock)"""
+    os.makedirs(os.path.dirname(SESSION_STORE_PATH) or ".", exist_ok=True)
+    temporal = f"{SESSION_STORE_PATH}.tmp"
+    fd = os.open(temporal, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(_sesiones, f)
+    os.replace(temporal, SESSION_STORE_PATH)
+
+
+def crear_sesion(username: str, huella: str = "", duracion: int = SESSION_TIMEOUT) -> str:
+    """Registra una sesión nueva atada a la huella del cliente y devuelve su identificador"""
+    sesion_id = secrets.token_urlsafe(32)
+    with _lock_sesiones:
+        _cargar_sesiones()[_clave_sesion(sesion_id)] = {
+            "u": username, "h": huella, "exp": int(time.time()) + duracion
+        }
+        _guardar_sesiones()
+    return sesion_id
+
+
+def leer_sesion(sesion_id: Optional[str], huella: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Args:
+        huella: si se indica, debe coincidir con la del cliente que creó la sesión
+
+    Returns:
+        {"username", "exp"} o None si la sesión no existe, venció, fue revocada
+        o pertenece a otro cliente
+    """
+    if not sesion_id:
+        return None
+    with _lock_sesiones:
+        sesion = _cargar_sesiones().get(_clave_sesion(sesion_id))
+    if sesion is None:
+        return None
+    if huella is not None and not hmac.compare_digest(sesion.get("h", ""), huella):
+        return None
+    return {"username": sesion["u"], "exp": int(sesion["exp"])}
+
+
+def rotar_sesion(sesion_id: str, huella: str, duracion: int = SESSION_TIMEOUT) -> Optional[str]:
+    """
+    Reemplaza el identificador de una sesión (al retomarla desde la cookie):
+    el anterior deja de valer aunque se haya filtrado.
+
+    Returns:
+        El identificador nuevo, o None si la sesión ya no es válida o es de otro cliente
+    """
+    with _lock_sesiones:
+        sesiones = _cargar_sesiones()
+        sesion = sesiones.get(_clave_sesion(sesion_id))
+        if sesion is None or not hmac.compare_digest(sesion.get("h", ""), huella):
+            return None
+        del sesiones[_clave_sesion(sesion_id)]
+        nuevo_id = secrets.token_urlsafe(32)
+        sesiones[_clave_sesion(nuevo_id)] = {"u": sesion["u"], "h": huella, "exp": int(time.time()) + duracion}
+        _guardar_sesiones()
+    return nuevo_id
+
+
+def renovar_sesion(sesion_id: str, duracion: int = SESSION_TIMEOUT) -> Optional[int]:
+    """Extiende el vencimiento; devuelve el nuevo o None si la sesión ya no es válida"""
+    with _lock_sesiones:
+        sesion = _cargar_sesiones().get(_clave_sesion(sesion_id))
+        if sesion is None:
+            return None
+        sesion["exp"] = int(time.time()) + duracion
+        _guardar_sesiones()
+        return sesion["exp"]
+
+
+def revocar_sesion(sesion_id: Optional[str]) -> None:
+    if not sesion_id:
+        return
+    with _lock_sesiones:
+        if _cargar_sesiones().pop(_clave_sesion(sesion_id), None) is not None:
+            _guardar_sesiones()
+
+
+def revocar_sesiones_usuario(username: str) -> int:
+    """Cierra todas las sesiones de un usuario (p. ej. al desactivarlo)"""
+    with _lock_sesiones:
+        sesiones = _cargar_sesiones()
+        claves = [c for c, s in sesiones.items() if s["u"] == username]
+        for clave in claves:
+            del sesiones[clave]
+        if claves:
+            _guardar_sesiones()
+    return len(claves)
+
+
+def usuario_vigente(username: str, sheet_usuarios) -> Optional[Dict[str, Any]]:
+    """
+    user_info actual según el directorio (rol y nombre de la hoja, no de la sesión).
+
+    Returns:
+        None si el usuario ya no existe o está inactivo
+    """
+    usuario = cargar_directorio(sheet_usuarios).get(str(username).strip().lower())
+    if usuario is None or not usuario["activo"]:
+        return None
+    return _user_info(usuario)
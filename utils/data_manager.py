@@ -2,9 +2,18 @@
 Gestor de datos para operaciones con Google Sheets
 Versión mejorada con manejo robusto de datos
 """
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
 import pandas as pd
 import streamlit as st
 from utils.api_manager import api_manager
+from config.settings import DATOS_TTL
+
+# Última carga de cada hoja, compartida por las sesiones del proceso
+_lock_hojas = threading.Lock()
+_hojas_cargadas: Dict[str, Dict[str, Any]] = {}  # título -> {"df", "version", "generacion", "momento"}
 
 def safe_get_sheet_data(_sheet, columnas=None):
     """
@@ -191,6 +200,109 @@ def update_cell(sheet, row, col, value):
     except Exception as e:
         return False, str(e)
 
+def version_datos(df):
+    """
+    Calcula una huella barata del contenido de un DataFrame.
+
+    Sirve como clave de "versión de datos" para memoizar cálculos derivados:
+    mientras la hoja no cambie, la versión es la misma en cada rerun.
+
+    Args:
+        df: DataFrame a versionar
+
+    Returns:
+        String con la versión (cantidad de filas + hash del contenido)
+    """
+    if df is None or df.empty:
+        return "vacio"
+    try:
+        hashes = pd.util.hash_pandas_object(df, index=True)
+    except TypeError:
+        hashes = pd.util.hash_pandas_object(df.astype(str), index=True)
+    return f"{len(df)}-{int(hashes.sum()) & 0xFFFFFFFFFFFFFFFF:016x}"
+
+def cargar_hoja(sheet, columnas=None) -> Tuple[pd.DataFrame, str]:
+    """
+    DataFrame de la hoja y su versión (version_datos), calculada una vez por carga.
+
+    La hoja se relee solo si este proceso la modificó desde la última carga
+    (ver ApiManager.generacion) o si pasaron DATOS_TTL segundos, para ver los
+    cambios hechos desde otros procesos o directamente en Sheets. Cada llamada
+    devuelve una copia: las páginas modifican columnas en el lugar.
+    """
+    titulo = getattr(sheet, "title", None)
+    generacion = api_manager.generacion(titulo)
+    with _lock_hojas:
+        carga = _hojas_cargadas.get(titulo)
+    if carga is None or carga["generacion"] != generacion or time.time() - carga["momento"] >= DATOS_TTL:
+        df = safe_get_sheet_data(sheet, columnas)
+        carga = {"df": df, "version": version_datos(df), "generacion": generacion, "momento": time.time()}
+        if not df.empty:  # Una lectura fallida no se reutiliza
+            with _lock_hojas:
+                _hojas_cargadas[titulo] = carga
+    return carga["df"].copy(), carga["version"]
+
+
+def _texto_celda(valor: Any) -> str:
+    """Valor tal como lo devuelve get_all_values después de escribirlo"""
+    if valor is None:
+        return ""
+    if isinstance(valor, bool):
+        return "TRUE" if valor else "FALSE"
+    return str(valor)
+
+
+def aplicar_escritura(sheet, generacion: int, cambios: Dict[str, Tuple[int, Dict[str, Any]]],
+                      columna_id: str) -> Optional[Tuple[str, str, pd.DataFrame]]:
+    """
+    Refleja en la carga compartida una escritura ya confirmada, sin releer la hoja.
+
+    Solo aplica si esa escritura es la única que hizo el proceso desde
+    generacion (el valor de ApiManager.generacion antes de escribir) y si
+    cada fila de la carga tiene el ID esperado; si no, la carga se descarta y
+    la hoja se relee en el próximo rerun.
+
+    Args:
+        cambios: ID del registro -> (fila de la hoja, {columna: valor escrito})
+
+    Returns:
+        (versión anterior, versión nueva, filas modificadas de la carga nueva) o None
+    """
+    titulo = getattr(sheet, "title", None)
+    with _lock_hojas:
+        carga = _hojas_cargadas.get(titulo)
+        if carga is None:
+            return None
+        actual = api_manager.generacion(titulo)
+        df = carga["df"]
+        indices = [fila - 2 for fila, _ in cambios.values()]
+        valida = (
+            carga["generacion"] == generacion and actual == generacion + 1
+            and all(
+                0 <= fila - 2 < len(df) and str(df.at[fila - 2, columna_id]).strip() == id_registro
+                for id_registro, (fila, _) in cambios.items()
+            )
+        )
+        if not valida:
+            _hojas_cargadas.pop(titulo, None)
+            return None
+
+        # Copia: las sesiones que ya tomaron la carga anterior no ven el cambio a mitad de un rerun
+        df = df.copy()
+        for fila, valores in cambios.values():
+            for columna, valor in valores.items():
+                df.at[fila - 2, columna] = _texto_celda(valor)
+        version = f"{carga['version']}+{actual}"
+        _hojas_cargadas[titulo] = {"df": df, "version": version, "generacion": actual, "momento": carga["momento"]}
+        return carga["version"], version, df.loc[indices]
+
+
+def invalidar_hojas() -> None:
+    """Fuerza a releer todas las hojas en la próxima carga"""
+    with _lock_hojas:
+        _hojas_cargadas.clear()
+
+
 # Alias para compatibilidad con código existente
 safe_normalize = lambda df, column: df  # Función simplificada ya que pandas maneja bien los tipos
 
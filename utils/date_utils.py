@@ -10,6 +10,22 @@ from typing import Union, Optional
 # Configuración de zona horaria (constante global)
 ARGENTINA_TZ = pytz.timezone("America/Argentina/Buenos_Aires")
 
+# Lista de formatos compatibles (ordenados por probabilidad de uso)
+FORMATOS_FECHA = [
+    '%d/%m/%Y %H:%M:%S',  # 25/12/2023 14:30:45
+    '%d-%m-%Y %H:%M:%S',  # 25-12-2023 14:30:45
+    '%d/%m/%Y %H:%M',     # 25/12/2023 14:30
+    '%d-%m-%Y %H:%M',     # 25-12-2023 14:30
+    '%Y-%m-%d %H:%M:%S',  # 2023-12-25 14:30:45 (ISO)
+    '%Y/%m/%d %H:%M:%S',  # 2023/12/25 14:30:45
+    '%d/%m/%Y',           # 25/12/2023
+    '%d-%m-%Y',           # 25-12-2023
+    '%Y%m%d %H:%M:%S',    # 20231225 14:30:45
+    '%Y%m%d',             # 20231225
+]
+
+_VALORES_VACIOS = ["", "nan", "NaN", "NaT", "None", "NONE", "null"]
+
 def ahora_argentina() -> datetime:
     """Devuelve la fecha y hora actual en zona horaria Argentina"""
     return datetime.now(ARGENTINA_TZ)
@@ -49,22 +65,8 @@ def parse_fecha(
     if not fecha_str:
         return pd.NaT
     
-    # Lista de formatos compatibles (ordenados por probabilidad de uso)
-    formatos = [
-        '%d/%m/%Y %H:%M:%S',  # 25/12/2023 14:30:45
-        '%d-%m-%Y %H:%M:%S',  # 25-12-2023 14:30:45
-        '%d/%m/%Y %H:%M',     # 25/12/2023 14:30
-        '%d-%m-%Y %H:%M',     # 25-12-2023 14:30
-        '%Y-%m-%d %H:%M:%S',  # 2023-12-25 14:30:45 (ISO)
-        '%Y/%m/%d %H:%M:%S',  # 2023/12/25 14:30:45
-        '%d/%m/%Y',           # 25/12/2023
-        '%d-%m-%Y',           # 25-12-2023
-        '%Y%m%d %H:%M:%S',    # 20231225 14:30:45
-        '%Y%m%d',             # 20231225
-    ]
-    
     # Intentar con cada formato
-    for fmt in formatos:
+    for fmt in FORMATOS_FECHA:
         try:
             dt = datetime.strptime(fecha_str, fmt)
             # Si el formato no incluye hora, establecer medianoche
@@ -174,4 +176,60 @@ def diferencia_fechas(
         
         return unidades.get(unidad.lower(), segundos / 3600)
     except Exception:
-        return None
\ No newline at end of file
+        return None
+
+def parse_fechas_series(serie: pd.Series) -> pd.Series:
+    """
+    Versión vectorizada de parse_fecha para columnas completas.
+
+    Prueba cada formato de FORMATOS_FECHA sobre las celdas que todavía no se
+    pudieron interpretar y deja el resto a pandas con dayfirst=True.
+
+    Args:
+        serie: Serie con fechas en strings (formatos mezclados) o datetimes
+
+    Returns:
+        Serie datetime64 sin zona horaria, expresada en hora Argentina
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        if getattr(serie.dt, "tz", None) is not None:
+            return serie.dt.tz_convert(ARGENTINA_TZ).dt.tz_localize(None)
+        return serie
+
+    no_nulos = serie.dropna()
+    if not no_nulos.empty and isinstance(no_nulos.iloc[0], datetime):
+        # Columnas ya convertidas con parse_fecha (datetimes con zona horaria)
+        return _a_naive_argentina(serie)
+
+    texto = serie.astype(str).str.strip()
+    texto = texto.where(~texto.isin(_VALORES_VACIOS))
+
+    resultado = pd.Series(pd.NaT, index=serie.index, dtype="datetime64[ns]")
+    pendientes = texto.notna()
+
+    for fmt in FORMATOS_FECHA:
+        if not pendientes.any():
+            break
+        parseadas = pd.to_datetime(texto[pendientes], format=fmt, errors="coerce")
+        validas = parseadas.notna()
+        resultado.loc[parseadas.index[validas]] = parseadas[validas]
+        pendientes.loc[parseadas.index[validas]] = False
+
+    if pendientes.any():
+        try:
+            resto = pd.to_datetime(texto[pendientes], dayfirst=True, errors="coerce")
+            if resto.dt.tz is not None:
+                resto = resto.dt.tz_convert(ARGENTINA_TZ).dt.tz_localize(None)
+        except (AttributeError, TypeError, ValueError):
+            # Zonas horarias mezcladas: se resuelve celda por celda
+            resto = _a_naive_argentina(texto[pendientes])
+        resultado.loc[resto.index] = resto
+
+    return resultado
+
+def _a_naive_argentina(serie: pd.Series) -> pd.Series:
+    """Aplica parse_fecha celda por celda y quita la zona horaria"""
+    def _convertir(valor):
+        dt = parse_fecha(valor)
+        return pd.NaT if pd.isna(dt) else dt.replace(tzinfo=None)
+    return pd.to_datetime(serie.map(_convertir), errors="coerce")
@@ -0,0 +1,282 @@
+# utils/datos_sinteticos.py
+"""
+Generador de datos sintéticos para pruebas de escala (10k, 100k, 1M reclamos).
+
+Produce Reclamos, Clientes, usuarios y Notificaciones con los esquemas y
+catálogos de config.settings y el mismo formato de fechas que escribe la
+aplicación, más una fracción de fechas en los formatos mixtos que parse_fecha
+tiene que tolerar. Con la misma semilla y el mismo `fin` el resultado es idéntico.
+
+Uso:
+    python -m utils.datos_sinteticos --reclamos 100000 --semilla 42
+    FUSION_OFFLINE=1 streamlit run app.py
+"""
+import argparse
+import hashlib
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.date_utils import FORMATOS_FECHA, ahora_argentina
+from config.settings import (
+    COLUMNAS_RECLAMOS,
+    COLUMNAS_CLIENTES,
+    COLUMNAS_USUARIOS,
+    COLUMNAS_NOTIFICACIONES,
+    NOTIFICATION_TYPES,
+    SECTORES_DISPONIBLES,
+    TECNICOS_DISPONIBLES,
+    TIPOS_RECLAMO,
+    SHEET_ID,
+    OFFLINE_DIR,
+    WORKSHEET_RECLAMOS,
+    WORKSHEET_CLIENTES,
+    WORKSHEET_USUARIOS,
+    WORKSHEET_NOTIFICACIONES,
+)
+
+FORMATO_APP = "%d/%m/%Y %H:%M"  # format_fecha por defecto (lo que escribe nuevo.py)
+
+NOMBRES = ["JUAN", "MARIA", "CARLOS", "ANA", "JORGE", "LAURA", "LUIS", "SILVIA", "PABLO", "ROSA",
+           "DIEGO", "CLAUDIA", "MIGUEL", "NORMA", "RAUL", "GRACIELA", "SERGIO", "MONICA", "HUGO", "ELENA"]
+APELLIDOS = ["GOMEZ", "RODRIGUEZ", "FERNANDEZ", "LOPEZ", "MARTINEZ", "GONZALEZ", "PEREZ", "SANCHEZ",
+             "ROMERO", "DIAZ", "ALVAREZ", "TORRES", "RUIZ", "SOSA", "BENITEZ", "ACOSTA", "MEDINA", "HERRERA"]
+CALLES = ["SAN MARTIN", "BELGRANO", "RIVADAVIA", "SARMIENTO", "MITRE", "MORENO", "ALBERDI", "ROCA",
+          "25 DE MAYO", "9 DE JULIO", "LAS HERAS", "PELLEGRINI", "URQUIZA", "COLON", "ESPAÑA", "ITALIA"]
+DETALLES = ["SIN SEÑAL DESDE AYER", "CORTES INTERMITENTES", "SE VE CON LLUVIA", "ROUTER CON LUZ ROJA",
+            "PIDE TURNO A LA TARDE", "LLAMAR ANTES DE IR", "CABLE CORTADO EN LA VEREDA", "", "", ""]
+
+# Frecuencia relativa de cada tipo (los de falta de señal dominan el día a día)
+PESOS_TIPO = {
+    "Sin Señal Ambos": 8, "Sin Señal Cable": 10, "Sin Señal Internet": 14, "Reclamo": 12,
+    "Conexion C+I": 5, "Conexion Internet": 6, "Conexion Cable": 3, "Interferencia": 4,
+    "Sintonia": 3, "Traslado": 3, "Cambio de Equipo": 3, "Cambio de Ficha": 3,
+    "Desconexion a Pedido": 4, "Reconexion": 2,
+}
+
+
+def _pesos(valores, pesos=None, default=1.0) -> np.ndarray:
+    p = np.array([(pesos or {}).get(v, default) for v in valores], dtype=float)
+    return p / p.sum()
+
+
+def _formatear_fechas(fechas: pd.Series, rng: np.random.Generator, proporcion_mixta: float,
+                      proporcion_invalida: float = 0.0) -> pd.Series:
+    """Formatea con el formato de la app y mezcla una fracción con otros formatos o basura"""
+    textos = fechas.dt.strftime(FORMATO_APP)
+    sorteo = rng.random(len(fechas))
+    mixtas = np.flatnonzero(sorteo < proporcion_mixta)
+    formatos = rng.integers(0, len(FORMATOS_FECHA), size=len(mixtas))
+    for i, fmt in enumerate(FORMATOS_FECHA):
+        posiciones = mixtas[formatos == i]
+        if len(posiciones):
+            textos.iloc[posiciones] = fechas.iloc[posiciones].dt.strftime(fmt)
+    invalidas = np.flatnonzero((sorteo >= proporcion_mixta) & (sorteo < proporcion_mixta + proporcion_invalida))
+    if len(invalidas):
+        textos.iloc[invalidas] = rng.choice(["", "nan", "sin fecha"], size=len(invalidas))
+    return textos
+
+
+def _ids_hex(rng: np.random.Generator, cantidad: int) -> np.ndarray:
+    """IDs únicos de 8 caracteres hexadecimales (como generar_id_unico)"""
+    valores = rng.choice(0xFFFFFFFF, size=cantidad, replace=False)
+    return np.char.upper(np.char.mod("%08x", valores))
+
+
+def generar_clientes(cantidad: int, rng: np.random.Generator, fin: datetime) -> pd.DataFrame:
+    numeros = rng.choice(np.arange(1000, 1000 + cantidad * 3), size=cantidad, replace=False)
+    nombres = (pd.Series(rng.choice(APELLIDOS, cantidad)) + " " + pd.Series(rng.choice(NOMBRES, cantidad)))
+    direcciones = pd.Series(rng.choice(CALLES, cantidad)) + " " + pd.Series(rng.integers(1, 3000, cantidad)).astype(str)
+    con_precinto = rng.random(cantidad) < 0.6
+    modificacion = pd.Series(pd.Timestamp(fin) - pd.to_timedelta(rng.integers(0, 730 * 24 * 60, cantidad), unit="min"))
+
+    return pd.DataFrame({
+        "Nº Cliente": numeros.astype(str),
+        "Sector": rng.choice(SECTORES_DISPONIBLES, cantidad),
+        "Nombre": nombres,
+        "Dirección": direcciones,
+        "Teléfono": pd.Series(rng.integers(3_564_000_000, 3_564_999_999, cantidad)).astype(str),
+        "N° de Precinto": np.where(con_precinto, pd.Series(rng.integers(100_000, 999_999, cantidad)).astype(str), ""),
+        "ID Cliente": _ids_hex(rng, cantidad),
+        "Última Modificación": modificacion.dt.strftime(FORMATO_APP),
+    })[COLUMNAS_CLIENTES]
+
+
+def generar_reclamos(cantidad: int, clientes: pd.DataFrame, usuarios: pd.DataFrame, rng: np.random.Generator,
+                     fin: datetime, dias: int = 365, proporcion_mixta: float = 0.1,
+                     proporcion_invalida: float = 0.001) -> pd.DataFrame:
+    fin = pd.Timestamp(fin)
+
+    # Pocos clientes concentran muchos reclamos (ley de potencia)
+    rango = np.arange(1, len(clientes) + 1)
+    elegidos = clientes.iloc[rng.choice(len(clientes), size=cantidad, p=(1 / (rango + 10)) / (1 / (rango + 10)).sum())]
+    elegidos = elegidos.reset_index(drop=True)
+
+    # Ingresos en horario comercial, más densos en los días recientes (de -(dias - 1) a 0 = hoy)
+    dia = np.floor(dias * rng.power(1.5, cantidad)).astype(int) - (dias - 1)
+    hora = np.clip(rng.normal(12, 3, cantidad), 7, 21)
+    ingreso = pd.Series(fin.normalize() + pd.to_timedelta(dia, unit="D") + pd.to_timedelta(hora, unit="h")
+                        + pd.to_timedelta(rng.integers(0, 60, cantidad), unit="s"))
+    ingreso = ingreso.mask(ingreso >= fin, ingreso - pd.Timedelta(days=1)).sort_values(ignore_index=True)
+    antiguedad = (fin - ingreso).dt.total_seconds().to_numpy() / 86400
+
+    tipos = rng.choice(TIPOS_RECLAMO, size=cantidad, p=_pesos(TIPOS_RECLAMO, PESOS_TIPO, default=1.0))
+
+    # Estado según antigüedad: lo viejo está resuelto, lo reciente pendiente o en curso
+    sorteo = rng.random(cantidad)
+    estado = np.select(
+        [
+            (antiguedad > 3) & (sorteo < 0.95), antiguedad > 3,
+            (antiguedad > 1) & (sorteo < 0.60), (antiguedad > 1) & (sorteo < 0.85), antiguedad > 1,
+            sorteo < 0.20, sorteo < 0.70,
+        ],
+        ["Resuelto", "Pendiente", "Resuelto", "En curso", "Pendiente", "Resuelto", "Pendiente"],
+        default="En curso",
+    )
+    desconexion = tipos == "Desconexion a Pedido"
+    estado = np.where(desconexion & (antiguedad < 7), "Desconexión", estado)
+
+    # Técnicos: uno o dos (cuadrilla) para reclamos en curso o resueltos
+    de_campo = [t.upper() for t in TECNICOS_DISPONIBLES if t not in ("Oficina", "Base")]
+    primero = rng.choice(de_campo, cantidad)
+    segundo = rng.choice(de_campo, cantidad)
+    cuadrilla = np.where((rng.random(cantidad) < 0.4) & (primero != segundo),
+                         np.char.add(np.char.add(primero, ", "), segundo), primero)
+    tecnico = np.where(np.isin(estado, ["En curso", "Resuelto"]), cuadrilla, "")
+
+    # Cierre: tiempo de resolución lognormal (mediana ~ 20 h), nunca en el futuro
+    horas = rng.lognormal(np.log(20), 0.9, cantidad)
+    cierre = (ingreso + pd.to_timedelta(horas, unit="h")).clip(upper=fin)
+    fecha_formateada = np.where(estado == "Resuelto", cierre.dt.strftime(FORMATO_APP), "")
+
+    atendido = usuarios["nombre"].str.upper().to_numpy()
+
+    return pd.DataFrame({
+        "Fecha y hora": _formatear_fechas(ingreso, rng, proporcion_mixta, proporcion_invalida),
+        "Nº Cliente": elegidos["Nº Cliente"],
+        "Sector": elegidos["Sector"],
+        "Nombre": elegidos["Nombre"],
+        "Dirección": elegidos["Dirección"],
+        "Teléfono": elegidos["Teléfono"],
+        "Tipo de reclamo": tipos,
+        "Detalles": rng.choice(DETALLES, cantidad),
+        "Estado": estado,
+        "Técnico": tecnico,
+        "N° de Precinto": elegidos["N° de Precinto"],
+        "Atendido por": rng.choice(atendido, cantidad),
+        "Fecha_formateada": fecha_formateada,
+        "ID Reclamo": _ids_hex(rng, cantidad),
+    })[COLUMNAS_RECLAMOS]
+
+
+def generar_usuarios(semilla: int, cantidad_oficina: int = 5) -> pd.DataFrame:
+    """Usuarios de prueba: la contraseña de cada uno es su username"""
+    from utils.credenciales import hash_password
+
+    def _sal(username):
+        return hashlib.sha256(f"{semilla}:{username}".encode("utf-8")).digest()[:16]
+
+    filas = [("admin", "Administrador", "admin")]
+    filas += [(f"oficina{i}", f"{NOMBRES[i % len(NOMBRES)].title()} Oficina", "oficina")
+              for i in range(1, cantidad_oficina + 1)]
+    return pd.DataFrame([
+        {"username": u, "password": hash_password(u, salt=_sal(u)), "nombre": n, "rol": r,
+         "activo": "SI", "modo_oscuro": "TRUE"}
+        for u, n, r in filas
+    ])[COLUMNAS_USUARIOS]
+
+
+def generar_notificaciones(cantidad: int, reclamos: pd.DataFrame, usuarios: pd.DataFrame,
+                           rng: np.random.Generator, fin: datetime) -> pd.DataFrame:
+    tipos = rng.choice(list(NOTIFICATION_TYPES), cantidad)
+    origen = reclamos.iloc[rng.integers(0, len(reclamos), cantidad)] if len(reclamos) else None
+    destino = np.where(rng.random(cantidad) < 0.5, "all", rng.choice(usuarios["username"], cantidad))
+    momento = pd.Series(pd.Timestamp(fin) - pd.to_timedelta(rng.integers(0, 30 * 24 * 60, cantidad), unit="min"))
+    ids_reclamo = origen["ID Reclamo"].to_numpy() if origen is not None else np.full(cantidad, "")
+
+    return pd.DataFrame({
+        "ID": np.arange(1, cantidad + 1).astype(str),
+        "Tipo": tipos,
+        "Prioridad": [NOTIFICATION_TYPES[t]["priority"] for t in tipos],
+        "Mensaje": [f"Reclamo {i} - {t.replace('_', ' ')}" for i, t in zip(ids_reclamo, tipos)],
+        "Usuario_Destino": destino,
+        "ID_Reclamo": ids_reclamo,
+        "Fecha_Hora": momento.sort_values(ignore_index=True).dt.strftime(FORMATO_APP),
+        "Leída": np.where(rng.random(cantidad) < 0.7, "TRUE", "FALSE"),
+        "Acción": "",
+    })[COLUMNAS_NOTIFICACIONES]
+
+
+def generar_dataset(
+    reclamos: int = 10_000,
+    clientes: Optional[int] = None,
+    notificaciones: Optional[int] = None,
+    semilla: int = 42,
+    dias: int = 365,
+    fin: Optional[datetime] = None,
+    proporcion_mixta: float = 0.1,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Genera un conjunto completo y reproducible.
+
+    Args:
+        reclamos: Cantidad de reclamos
+        clientes: Cantidad de clientes (por defecto un tercio de los reclamos)
+        notificaciones: Cantidad de notificaciones (por defecto 10% de los reclamos, máx. 5000)
+        semilla: Semilla del generador (misma semilla = mismos datos)
+        dias: Días de historia hacia atrás desde `fin`
+        fin: Momento final (por defecto ahora, sin zona horaria)
+        proporcion_mixta: Fracción de fechas en formatos alternativos
+
+    Returns:
+        dict nombre de hoja -> DataFrame con sus columnas
+    """
+    rng = np.random.default_rng(semilla)
+    fin = fin or ahora_argentina().replace(tzinfo=None, second=0, microsecond=0)
+    clientes = clientes or max(50, reclamos // 3)
+    notificaciones = notificaciones if notificaciones is not None else min(5000, reclamos // 10)
+
+    df_usuarios = generar_usuarios(semilla)
+    df_clientes = generar_clientes(clientes, rng, fin)
+    df_reclamos = generar_reclamos(reclamos, df_clientes, df_usuarios, rng, fin, dias, proporcion_mixta)
+    df_notificaciones = generar_notificaciones(notificaciones, df_reclamos, df_usuarios, rng, fin)
+
+    return {
+        WORKSHEET_RECLAMOS: df_reclamos,
+        WORKSHEET_CLIENTES: df_clientes,
+        WORKSHEET_USUARIOS: df_usuarios,
+        WORKSHEET_NOTIFICACIONES: df_notificaciones,
+    }
+
+
+def escribir_dataset(dataset: Dict[str, pd.DataFrame], base_dir: str = OFFLINE_DIR, sheet_id: str = SHEET_ID) -> None:
+    """Escribe cada hoja (encabezado + filas) en el backend offline"""
+    from utils.almacenamiento_local import ClienteLocal
+
+    libro = ClienteLocal(base_dir).open_by_key(sheet_id)
+    for nombre, df in dataset.items():
+        libro.add_worksheet(nombre).reemplazar([list(df.columns)] + df.astype(str).values.tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos en el backend offline")
+    parser.add_argument("--reclamos", type=int, default=10_000)
+    parser.add_argument("--clientes", type=int, default=None)
+    parser.add_argument("--notificaciones", type=int, default=None)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--fin", default=None, help="Momento final AAAA-MM-DD HH:MM (por defecto ahora)")
+    parser.add_argument("--dir", default=OFFLINE_DIR, help="Carpeta del backend offline")
+    args = parser.parse_args()
+
+    fin = datetime.strptime(args.fin, "%Y-%m-%d %H:%M") if args.fin else None
+    dataset = generar_dataset(args.reclamos, args.clientes, args.notificaciones, args.semilla, args.dias, fin)
+    escribir_dataset(dataset, args.dir)
+    for nombre, df in dataset.items():
+        print(f"{nombre}: {len(df)} filas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+# utils/escritura_versionada.py
+"""
+Escrituras con control de concurrencia optimista sobre Reclamos y Clientes.
+
+Cada fila del snapshot cargado tiene una versión: su número de fila y una
+huella de su contenido. Antes de escribir se relee la fila esperada (una
+sola lectura batch para todas las filas) y se confirma que sigue teniendo el
+mismo ID y la misma huella:
+- si el ID coincide pero la huella no, otro operador modificó el registro:
+  se informa como conflicto y no se pisa
+- si en esa fila hay otro ID (se insertaron o borraron filas), se vuelve a
+  ubicar el registro por la columna de IDs y se verifica ahí
+Las filas verificadas se escriben en un único batch_update y se reflejan en
+la carga compartida de la hoja (data_manager.aplicar_escritura); en
+Reclamos también derivan el cubo de métricas de la versión nueva.
+
+La verificación achica la ventana de carrera a la de una lectura seguida de
+una escritura; Sheets no ofrece escritura condicional para cerrarla del todo.
+"""
+import hashlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from utils.api_manager import api_manager
+from utils.almacenamiento_local import columna_a_letra
+from utils.data_manager import aplicar_escritura
+from utils.metricas_cubo import obtener_registro_cubos
+from utils.telemetria import cache_medida
+from config.settings import (
+    COLUMNAS_RECLAMOS,
+    COLUMNAS_CLIENTES,
+    COLUMNA_ID_RECLAMO,
+    COLUMNA_ID_CLIENTE,
+)
+
+Version = Tuple[int, str]  # (fila en la hoja, huella del contenido)
+
+
+def huella_fila(valores: Sequence[Any], cantidad: int) -> str:
+    """Huella del contenido de una fila (las celdas vacías al final cuentan como "")"""
+    celdas = ["" if v is None else str(v) for v in list(valores)[:cantidad]]
+    celdas += [""] * (cantidad - len(celdas))
+    return hashlib.blake2b("\x1f".join(celdas).encode("utf-8"), digest_size=8).hexdigest()
+
+
+@cache_medida("versiones_filas", st.cache_data(show_spinner=False))
+def versiones_filas(_df: pd.DataFrame, version: str, columnas: Tuple[str, ...], columna_id: str) -> Dict[str, Version]:
+    """
+    Versión de cada registro del snapshot, memoizada por versión de datos.
+
+    Debe calcularse sobre el DataFrame tal como se leyó de la hoja (índice =
+    fila - 2), antes de que los componentes lo normalicen.
+    """
+    if _df is None or _df.empty:
+        return {}
+    versiones: Dict[str, Version] = {}
+    filas = _df.reindex(columns=list(columnas)).itertuples(index=True, name=None)
+    posicion_id = list(columnas).index(columna_id)
+    for indice, *valores in filas:
+        id_registro = str(valores[posicion_id] or "").strip()
+        if id_registro and id_registro not in versiones:
+            versiones[id_registro] = (int(indice) + 2, huella_fila(valores, len(columnas)))
+    return versiones
+
+
+def _verificar(filas_leidas: List[List[str]], candidatos: List[Tuple[str, int, str]],
+               columnas: Sequence[str], posicion_id: int) -> Tuple[Dict[str, int], List[str], List[str]]:
+    """Separa candidatos (id, fila, huella) en verificados, conflictos y fuera de lugar"""
+    verificados, conflictos, fuera_de_lugar = {}, [], []
+    for (id_registro, fila, huella), leida in zip(candidatos, filas_leidas):
+        valores = leida[0] if leida else []
+        id_leido = str(valores[posicion_id]).strip() if len(valores) > posicion_id else ""
+        if id_leido != id_registro:
+            fuera_de_lugar.append(id_registro)
+        elif huella_fila(valores, len(columnas)) == huella:
+            verificados[id_registro] = fila
+        else:
+            conflictos.append(id_registro)
+    return verificados, conflictos, fuera_de_lugar
+
+
+def escribir_verificado(sheet, columnas: Sequence[str], columna_id: str, versiones: Dict[str, Version],
+                        cambios: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Lee, verifica y escribe en lote los cambios de varios registros.
+
+    Args:
+        sheet: Hoja a modificar
+        columnas: Columnas de la hoja, en orden (COLUMNAS_RECLAMOS o COLUMNAS_CLIENTES)
+        columna_id: Columna con el ID del registro
+        versiones: Versiones del snapshot (ver versiones_filas)
+        cambios: id -> {columna: nuevo valor}
+
+    Returns:
+        ({"escritos": {id: fila}, "conflictos": [ids], "no_encontrados": [ids],
+          "reubicados": {id: fila}}, error)
+    """
+    resultado = {"escritos": {}, "conflictos": [], "no_encontrados": [], "reubicados": {}}
+    if not cambios:
+        return resultado, None
+
+    ultima = columna_a_letra(len(columnas))
+    posicion_id = list(columnas).index(columna_id)
+    # Se verifica con el ID normalizado; el resultado se informa con las claves de cambios
+    originales = {str(id_registro).strip(): id_registro for id_registro in cambios}
+    candidatos = []
+    for normalizado, id_registro in originales.items():
+        version = versiones.get(normalizado)
+        if version is None:
+            resultado["no_encontrados"].append(id_registro)
+        else:
+            candidatos.append((normalizado, version[0], version[1]))
+    if not candidatos:
+        return resultado, None
+
+    # Una lectura para todas las filas esperadas
+    leidas, error = api_manager.safe_sheet_operation(
+        sheet.batch_get, [f"A{fila}:{ultima}{fila}" for _, fila, _ in candidatos]
+    )
+    if error:
+        return resultado, error
+    verificados, conflictos, fuera_de_lugar = _verificar(leidas, candidatos, columnas, posicion_id)
+    resultado["conflictos"] += [originales[i] for i in conflictos]
+
+    # Registros desplazados: se ubican por la columna de IDs y se verifican en su fila actual
+    if fuera_de_lugar:
+        ids_hoja, error = api_manager.safe_sheet_operation(sheet.col_values, posicion_id + 1)
+        if error:
+            return resultado, error
+        filas_por_id = {}
+        for fila, valor in enumerate(ids_hoja or [], start=1):
+            filas_por_id.setdefault(str(valor).strip(), fila)
+        reubicar = []
+        for id_registro in fuera_de_lugar:
+            fila = filas_por_id.get(id_registro)
+            if fila is None or fila == 1:
+                resultado["no_encontrados"].append(originales[id_registro])
+            else:
+                reubicar.append((id_registro, fila, versiones[id_registro][1]))
+        if reubicar:
+            leidas, error = api_manager.safe_sheet_operation(
+                sheet.batch_get, [f"A{fila}:{ultima}{fila}" for _, fila, _ in reubicar]
+            )
+            if error:
+                return resultado, error
+            movidos, conflictos, perdidos = _verificar(leidas, reubicar, columnas, posicion_id)
+            verificados.update(movidos)
+            resultado["reubicados"].update({originales[i]: fila for i, fila in movidos.items()})
+            resultado["conflictos"] += [originales[i] for i in conflictos]
+            resultado["no_encontrados"] += [originales[i] for i in perdidos]
+
+    updates = [
+        {"range": f"{columna_a_letra(list(columnas).index(columna) + 1)}{fila}", "values": [[valor]]}
+        for id_registro, fila in verificados.items()
+        for columna, valor in cambios[originales[id_registro]].items()
+    ]
+    if updates:
+        _, error = api_manager.safe_sheet_operation(sheet.batch_update, updates)
+        if error:
+            return resultado, error
+    resultado["escritos"] = {originales[i]: fila for i, fila in verificados.items()}
+    return resultado, None
+
+
+def _escribir_y_reflejar(sheet, columnas: Sequence[str], columna_id: str, versiones: Dict[str, Version],
+                         cambios: Dict[str, Dict[str, Any]]):
+    """escribir_verificado y la misma escritura aplicada a la carga compartida de la hoja"""
+    generacion = api_manager.generacion(getattr(sheet, "title", None))
+    resultado, error = escribir_verificado(sheet, columnas, columna_id, versiones, cambios)
+    reflejo = None
+    if not error and resultado["escritos"]:
+        reflejo = aplicar_escritura(sheet, generacion, {
+            str(id_registro).strip(): (fila, cambios[id_registro])
+            for id_registro, fila in resultado["escritos"].items()
+        }, columna_id)
+    return resultado, error, reflejo
+
+
+def actualizar_reclamos(sheet_reclamos, cambios: Dict[str, Dict[str, Any]],
+                        versiones: Optional[Dict[str, Version]] = None) -> Tuple[Dict[str, Any], Optional[str]]:
+    """escribir_verificado sobre Reclamos (versiones del snapshot de la sesión por defecto)"""
+    if versiones is None:
+        versiones = st.session_state.get("versiones_reclamos", {})
+    resultado, error, reflejo = _escribir_y_reflejar(
+        sheet_reclamos, COLUMNAS_RECLAMOS, COLUMNA_ID_RECLAMO, versiones, cambios
+    )
+    if reflejo:
+        # El cubo de la versión nueva sale del anterior más las filas escritas
+        obtener_registro_cubos().derivar(*reflejo)
+    return resultado, error
+
+
+def actualizar_clientes(sheet_clientes, cambios: Dict[str, Dict[str, Any]],
+                        versiones: Optional[Dict[str, Version]] = None) -> Tuple[Dict[str, Any], Optional[str]]:
+    """escribir_verificado sobre Clientes (versiones del snapshot de la sesión por defecto)"""
+    if versiones is None:
+        versiones = st.session_state.get("versiones_clientes", {})
+    resultado, error, _ = _escribir_y_reflejar(
+        sheet_clientes, COLUMNAS_CLIENTES, COLUMNA_ID_CLIENTE, versiones, cambios
+    )
+    return resultado, error
+
+
+def describir_resultado(resultado: Dict[str, Any]) -> Optional[str]:
+    """Mensaje para el operador cuando algún registro no se pudo escribir"""
+    partes = []
+    if resultado["conflictos"]:
+        partes.append(f"{len(resultado['conflictos'])} modificado(s) por otro usuario: {', '.join(map(str, resultado['conflictos']))}")
+    if resultado["no_encontrados"]:
+        partes.append(f"{len(resultado['no_encontrados'])} ya no existe(n) en la hoja: {', '.join(map(str, resultado['no_encontrados']))}")
+    if not partes:
+        return None
+    return "No se guardaron algunos registros (" + "; ".join(partes) + "). Revisalos con los datos actualizados."
+
+
+def agregar_aviso(mensaje: str) -> None:
+    """Suma un mensaje al aviso pendiente (una acción puede dejar varios)"""
+    previo = st.session_state.get("aviso_conflictos")
+    st.session_state.aviso_conflictos = f"{previo}\n\n{mensaje}" if previo else mensaje
+
+
+def avisar_conflictos(resultado: Dict[str, Any]) -> bool:
+    """
+    Guarda el aviso de conflictos para mostrarlo después de la recarga.
+
+    Returns:
+        True si hubo registros sin escribir
+    """
+    mensaje = describir_resultado(resultado)
+    if mensaje:
+        agregar_aviso(mensaje)
+    return mensaje is not None
+
+
+def mostrar_aviso_conflictos() -> None:
+    """Muestra (una vez) el aviso pendiente de la última escritura"""
+    mensaje = st.session_state.pop("aviso_conflictos", None)
+    if mensaje:
+        st.warning(f"⚠️ {mensaje}")
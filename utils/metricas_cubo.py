@@ -0,0 +1,208 @@
+# utils/metricas_cubo.py
+"""
+Cubo de métricas pre-agregado de reclamos.
+
+Mantiene conteos por Estado × Sector × Tipo × Técnico × Día y sus marginales,
+de modo que cualquier contador de la interfaz es una consulta O(1).
+
+Hay un cubo por versión de datos (los últimos CUBO_VERSIONES): una sesión
+siempre consulta el cubo de su propia versión, y un cubo publicado no se
+modifica. Se construye una vez por carga de la hoja; las escrituras
+verificadas sobre Reclamos (escritura_versionada) derivan el cubo de la
+versión nueva aplicando solo las filas escritas, sin recorrer el DataFrame.
+"""
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from utils.date_utils import parse_fechas_series
+from utils.capacidad import normalizar_grupo_tecnicos
+from config.settings import COLUMNA_ID_RECLAMO, CUBO_VERSIONES
+
+DIMENSIONES = ("estado", "sector", "tipo", "tecnico", "dia")
+
+Celda = Tuple[str, str, str, str, str]
+
+
+def _normalizar(valor) -> str:
+    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+        return ""
+    return str(valor).strip().lower()
+
+
+def claves_reclamos(df_reclamos: pd.DataFrame) -> pd.Series:
+    """
+    Calcula (vectorizado) la celda del cubo de cada reclamo.
+
+    Returns:
+        Serie indexada por ID Reclamo con tuplas (estado, sector, tipo, técnico, día)
+    """
+    if df_reclamos.empty:
+        return pd.Series(dtype=object)
+
+    def texto(columna):
+        if columna not in df_reclamos.columns:
+            return pd.Series("", index=df_reclamos.index)
+        return df_reclamos[columna].fillna("").astype(str).str.strip()
+
+    tecnicos = normalizar_grupo_tecnicos(texto("Técnico"))
+    dias = parse_fechas_series(texto("Fecha y hora")).dt.strftime("%Y-%m-%d").fillna("")
+
+    celdas = pd.Series(
+        list(zip(
+            texto("Estado").str.lower(),
+            texto("Sector"),
+            texto("Tipo de reclamo").str.lower(),
+            tecnicos,
+            dias,
+        )),
+        index=df_reclamos.index,
+    )
+
+    ids = texto(COLUMNA_ID_RECLAMO)
+    # Filas sin ID: se identifican por su posición para no perderlas del conteo
+    ids = ids.where(ids != "", "fila-" + pd.Series(range(len(ids)), index=ids.index).astype(str))
+    celdas.index = ids
+    return celdas[~celdas.index.duplicated(keep="last")]
+
+
+class CuboMetricas:
+    """Conteos por celda y marginales por dimensión de una versión de datos"""
+
+    def __init__(self, version: Optional[str] = None):
+        self.version = version
+        self.total = 0
+        self._celdas: Counter = Counter()
+        self._marginales: Dict[str, Counter] = {d: Counter() for d in DIMENSIONES}
+        self._por_id: Dict[str, Celda] = {}
+
+    @classmethod
+    def construir(cls, df_reclamos: pd.DataFrame, version: str) -> "CuboMetricas":
+        cubo = cls(version)
+        cubo.aplicar(claves_reclamos(df_reclamos).to_dict())
+        return cubo
+
+    def derivar(self, version: str, celdas: Dict[str, Celda]) -> "CuboMetricas":
+        """Cubo nuevo con los reclamos indicados dados de alta o modificados (este no cambia)"""
+        cubo = CuboMetricas(version)
+        cubo.total = self.total
+        cubo._celdas = self._celdas.copy()
+        cubo._marginales = {d: m.copy() for d, m in self._marginales.items()}
+        cubo._por_id = self._por_id.copy()
+        cubo.aplicar(celdas)
+        return cubo
+
+    # ---------- actualización (solo antes de publicar el cubo) ----------
+
+    def _sumar(self, celda: Celda, signo: int) -> None:
+        self._celdas[celda] += signo
+        if not self._celdas[celda]:
+            del self._celdas[celda]
+        for dimension, valor in zip(DIMENSIONES, celda):
+            marginal = self._marginales[dimension]
+            marginal[valor] += signo
+            if not marginal[valor]:
+                del marginal[valor]
+        self.total += signo
+
+    def registrar(self, id_reclamo: str, celda: Celda) -> None:
+        """Alta o modificación de un reclamo"""
+        anterior = self._por_id.get(id_reclamo)
+        if anterior == celda:
+            return
+        if anterior is not None:
+            self._sumar(anterior, -1)
+        self._sumar(celda, 1)
+        self._por_id[id_reclamo] = celda
+
+    def eliminar(self, id_reclamo: str) -> None:
+        anterior = self._por_id.pop(id_reclamo, None)
+        if anterior is not None:
+            self._sumar(anterior, -1)
+
+    def aplicar(self, celdas: Dict[str, Celda]) -> None:
+        for id_reclamo, celda in celdas.items():
+            self.registrar(id_reclamo, celda)
+
+    # ---------- consultas ----------
+
+    def contar(self, **filtros) -> int:
+        """
+        Cantidad de reclamos que cumplen los filtros (valores sin distinguir mayúsculas).
+
+        Con un solo filtro la consulta es O(1) sobre la marginal; con varios se
+        recorren las celdas del cubo (cantidad de combinaciones, no de reclamos).
+
+        Ejemplo: contar(estado="Pendiente"), contar(dia="2025-01-31", estado="resuelto")
+        """
+        invalidas = set(filtros) - set(DIMENSIONES)
+        if invalidas:
+            raise ValueError(f"Dimensiones no válidas: {sorted(invalidas)}. Opciones: {list(DIMENSIONES)}")
+
+        filtros = {d: (v.upper() if d == "tecnico" else _normalizar(v)) for d, v in filtros.items()}
+        if not filtros:
+            return self.total
+        if len(filtros) == 1:
+            (dimension, valor), = filtros.items()
+            return self._marginales[dimension].get(valor, 0)
+        posiciones = [(DIMENSIONES.index(d), v) for d, v in filtros.items()]
+        return sum(
+            cantidad for celda, cantidad in self._celdas.items()
+            if all(celda[i] == v for i, v in posiciones)
+        )
+
+    def marginal(self, dimension: str) -> Dict[str, int]:
+        """Conteos por cada valor de una dimensión"""
+        return dict(self._marginales[dimension])
+
+
+class RegistroCubos:
+    """Cubos de las últimas versiones de datos (por proceso, compartido entre sesiones)"""
+
+    def __init__(self, maximo: int = CUBO_VERSIONES):
+        self.maximo = maximo
+        self._cubos: "OrderedDict[str, CuboMetricas]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _publicar(self, cubo: CuboMetricas) -> CuboMetricas:
+        with self._lock:
+            self._cubos[cubo.version] = cubo
+            self._cubos.move_to_end(cubo.version)
+            while len(self._cubos) > self.maximo:
+                self._cubos.popitem(last=False)
+        return cubo
+
+    def obtener(self, df_reclamos: pd.DataFrame, version: str) -> CuboMetricas:
+        """Cubo de la versión; se construye (una vez por versión) si no está"""
+        with self._lock:
+            cubo = self._cubos.get(version)
+            if cubo is not None:
+                self._cubos.move_to_end(version)
+                return cubo
+        # Fuera del lock: dos sesiones pueden construir la misma versión, el resultado es igual
+        return self._publicar(CuboMetricas.construir(df_reclamos, version))
+
+    def derivar(self, version_anterior: str, version: str, df_filas: pd.DataFrame) -> Optional[CuboMetricas]:
+        """Publica el cubo de una versión que solo difiere de la anterior en df_filas"""
+        with self._lock:
+            anterior = self._cubos.get(version_anterior)
+        if anterior is None:
+            return None  # Se construirá cuando alguna sesión pida la versión nueva
+        return self._publicar(anterior.derivar(version, claves_reclamos(df_filas).to_dict()))
+
+
+@st.cache_resource
+def obtener_registro_cubos() -> RegistroCubos:
+    """Registro único por proceso"""
+    return RegistroCubos()
+
+
+def cubo_sincronizado(df_reclamos: pd.DataFrame, version: Optional[str] = None) -> CuboMetricas:
+    """Devuelve el cubo de la versión de datos de la sesión (no lo comparte con otras versiones)"""
+    from utils.data_manager import version_datos
+
+    version = version or st.session_state.get("df_version") or version_datos(df_reclamos)
+    return obtener_registro_cubos().obtener(df_reclamos, version)
@@ -0,0 +1,62 @@
+# utils/notificaciones.py
+"""
+Alta de notificaciones en la hoja, sin st.*.
+
+La usan NotificationManager (desde una sesión, que muestra los errores con
+st.error) y el vigilante de SLA (desde un hilo sin contexto de script, que
+los manda al log): la regla de negocio queda en un solo lugar.
+"""
+import time
+from typing import Optional, Tuple
+
+from utils.api_manager import api_manager
+from utils.date_utils import ahora_argentina, format_fecha
+from config.settings import COLUMNAS_NOTIFICACIONES, NOTIFICATION_TYPES, NOTIFICACIONES_MAX_GLOBALES
+
+
+def agregar_notificacion(sheet, notification_type: str, message: str, user_target: str = "all",
+                         claim_id: Optional[str] = None, action: Optional[str] = None,
+                         reintentos: int = 1) -> Tuple[bool, Optional[str]]:
+    """
+    Agrega una notificación con una sola lectura de la hoja.
+
+    Si es global ('all') y ya hay NOTIFICACIONES_MAX_GLOBALES, antes se borra
+    la global más vieja (la primera en la hoja).
+
+    Returns:
+        tuple: (ok, error)
+    """
+    if notification_type not in NOTIFICATION_TYPES:
+        raise ValueError(f"Tipo de notificación no válido: {notification_type}. Opciones: {list(NOTIFICATION_TYPES.keys())}")
+
+    filas, error = api_manager.safe_sheet_operation(sheet.get_all_values)
+    if error:
+        return False, f"No se pudo leer la hoja de notificaciones: {error}"
+    datos = (filas or [])[1:]
+    col_id = COLUMNAS_NOTIFICACIONES.index("ID")
+    col_destino = COLUMNAS_NOTIFICACIONES.index("Usuario_Destino")
+    ids = [int(f[col_id]) for f in datos if len(f) > col_id and str(f[col_id]).isdigit()]
+
+    globales = [i for i, f in enumerate(datos) if len(f) > col_destino and f[col_destino] == "all"]
+    if user_target == "all" and len(globales) >= NOTIFICACIONES_MAX_GLOBALES:
+        # Un fallo al borrar no impide el alta: solo queda una notificación de más
+        api_manager.safe_sheet_operation(sheet.delete_rows, globales[0] + 2)  # fila 1 = encabezado
+
+    nueva = [
+        max(ids, default=0) + 1,
+        notification_type,
+        NOTIFICATION_TYPES[notification_type]["priority"],
+        message,
+        str(user_target),
+        str(claim_id) if claim_id else "",
+        format_fecha(ahora_argentina()),
+        False,
+        action or "",
+    ]
+    for intento in range(reintentos):
+        if intento:
+            time.sleep(1)
+        _, error = api_manager.safe_sheet_operation(sheet.append_row, nueva)
+        if not error:
+            return True, None
+    return False, f"Fallo al agregar notificación para {user_target}: {error}"
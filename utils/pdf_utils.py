@@ -1,9 +1,592 @@
 # utils/pdf_utils.py
+"""
+Motor de renderizado de PDFs de reclamos.
+
+- Plantillas de página reutilizables (encabezado, continuación y pie institucional)
+- Bloques de texto pre-medidos: la paginación se calcula antes de dibujar
+- Dibujo con text objects (un setFont solo cuando cambia la fuente)
+- Caché por hash de contenido: regenerar el mismo listado devuelve los bytes ya generados;
+  la hora de "Generado el" se estampa al entregarlos (ver estampar)
+- Documentos grandes: las páginas se dibujan en paralelo (pool de procesos) y se unen con pypdf
+- Exportación a archivo: tramos de páginas dibujados directo a disco, fuera de static/
+"""
+import hashlib
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
 from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from config.settings import (
+    PDF_CACHE_MAX,
+    PDF_PARALELO_MIN_PAGINAS,
+    PDF_PROCESOS,
+    EXPORTS_DIR,
+    PDF_EXPORT_MAX_MB,
+    PDF_EXPORT_TRAMO,
+)
+
+ANCHO, ALTO = A4
+MARGEN = 40
+Y_INICIAL = ALTO - 40
+LIMITE_INFERIOR = 40
+
+PIE_TEXTO = "Fusion Cable - Chile 450 | Tel: 3725-468892"
+PIE_FUENTE = ("Courier-Bold", 10)
+
+# (fuente, tamaño, x, texto, avance vertical luego de la línea)
+Linea = Tuple[str, int, float, str, float]
+
 
 def agregar_pie_pdf(c, width, height):
     """Agrega marca de agua/pie institucional al PDF"""
-    c.setFont("Courier-Bold", 10)
-    texto = "Fusion Cable - Chile 450 | Tel: 3725-468892"
-    text_width = c.stringWidth(texto, "Courier-Bold", 10)
-    c.drawString(width - text_width - 40, 20, texto)
+    c.setFont(*PIE_FUENTE)
+    text_width = c.stringWidth(PIE_TEXTO, *PIE_FUENTE)
+    c.drawString(width - text_width - 40, 20, PIE_TEXTO)
+
+
+def _agregar_numero_pagina(c, numero, total):
+    c.setFont("Helvetica", 9)
+    c.drawString(MARGEN, 20, f"Página {numero} de {total}")
+
+
+class Bloque:
+    """Conjunto de líneas que se dibujan juntas (no se parten entre páginas)"""
+
+    __slots__ = ("lineas", "separador", "alto")
+
+    def __init__(self, lineas: List[Linea], separador: bool = False):
+        self.lineas = lineas
+        self.separador = separador
+        self.alto = sum(l[4] for l in lineas) + (20 if separador else 0)
+
+    def clave(self) -> Tuple:
+        return (tuple(self.lineas), self.separador)
+
+
+class Seccion:
+    """Grupo de bloques con título de continuación propio (p. ej. un técnico o un grupo)"""
+
+    __slots__ = ("bloques", "nueva_pagina", "titulo_continuacion")
+
+    def __init__(self, bloques: List[Bloque], nueva_pagina: bool = False, titulo_continuacion: Optional[str] = None):
+        self.bloques = bloques
+        self.nueva_pagina = nueva_pagina
+        self.titulo_continuacion = titulo_continuacion
+
+    def clave(self) -> Tuple:
+        return (tuple(b.clave() for b in self.bloques), self.nueva_pagina, self.titulo_continuacion)
+
+
+class PlantillaPagina:
+    """Encabezado del documento y de las páginas de continuación"""
+
+    def __init__(self, titulo: Optional[str] = None, autor: Optional[str] = None,
+                 con_fecha: bool = True, titulo_continuacion: Optional[str] = None):
+        self.titulo = titulo
+        self.autor = autor
+        self.con_fecha = con_fecha
+        self.titulo_continuacion = titulo_continuacion or (f"{titulo} (cont.)" if titulo else None)
+
+    def clave(self) -> Tuple:
+        return (self.titulo, self.autor, self.con_fecha, self.titulo_continuacion)
+
+    def encabezado(self, generado: str) -> Optional[Bloque]:
+        if not self.titulo:
+            return None
+        lineas = [("Helvetica-Bold", 16, MARGEN, self.titulo, 20)]
+        if self.con_fecha:
+            if self.autor:
+                lineas.append(("Helvetica", 12, ANCHO - 200, f"Por: {self.autor}", 0))
+            lineas.append(("Helvetica", 12, MARGEN, f"Generado el: {generado}", 30))
+        else:
+            if self.autor:
+                lineas.append(("Helvetica", 10, ANCHO - 200, f"Por: {self.autor}", 0))
+            lineas[0] = ("Helvetica-Bold", 16, MARGEN, self.titulo, 30)
+        return Bloque(lineas)
+
+
+def bloque_continuacion(titulo: str) -> Bloque:
+    return Bloque([("Helvetica-Bold", 16, MARGEN, titulo, 25)])
+
+
+def bloque_texto(texto: str, fuente: str = "Helvetica", tamano: int = 11,
+                 x: float = MARGEN, avance: float = 15) -> Bloque:
+    return Bloque([(fuente, tamano, x, texto, avance)])
+
+
+def _texto(valor: Any, default: str = "") -> str:
+    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+        return default
+    return str(valor)
+
+
+def bloque_reclamo(reclamo: Dict[str, Any]) -> Bloque:
+    """Bloque estándar de un reclamo (cliente, fecha, dirección, sector, tipo y detalles)"""
+    detalles = _texto(reclamo.get("Detalles"))
+    if len(detalles) > 100:
+        detalles = f"{detalles[:100]}..."
+    precinto = _texto(reclamo.get("N° de Precinto")) or "N/A"
+
+    cuerpo = [
+        f"Fecha: {reclamo.get('_fecha_pdf', 'Sin fecha')}",
+        f"Dirección: {_texto(reclamo.get('Dirección'))} - Tel: {_texto(reclamo.get('Teléfono'))}",
+        f"Sector: {_texto(reclamo.get('Sector'))} - Precinto: {precinto}",
+        f"Tipo: {_texto(reclamo.get('Tipo de reclamo'))}",
+        f"Detalles: {detalles}",
+    ]
+    lineas = [("Helvetica-Bold", 14, MARGEN, f"{_texto(reclamo.get('Nº Cliente'))} - {_texto(reclamo.get('Nombre'))}", 15)]
+    lineas += [("Helvetica", 11, MARGEN, linea, 12) for linea in cuerpo]
+    return Bloque(lineas, separador=True)
+
+
+def reclamos_a_registros(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convierte el DataFrame en registros listos para bloque_reclamo (fecha formateada en bloque)"""
+    if df.empty:
+        return []
+    fechas = df["Fecha y hora"]
+    if pd.api.types.is_datetime64_any_dtype(fechas):
+        fechas_pdf = fechas.dt.strftime('%d/%m/%Y %H:%M').fillna("Sin fecha")
+    else:
+        from utils.date_utils import format_fecha
+        fechas_pdf = fechas.map(lambda f: format_fecha(f, '%d/%m/%Y %H:%M', "Sin fecha"))
+    return df.assign(_fecha_pdf=fechas_pdf).to_dict("records")
+
+
+def preparar_reclamos_impresion(df_reclamos: pd.DataFrame, df_clientes: pd.DataFrame) -> pd.DataFrame:
+    """Convierte fechas y agrega el precinto del cliente a los reclamos a imprimir"""
+    df_pdf = df_reclamos.copy()
+    df_pdf["Fecha y hora"] = pd.to_datetime(df_pdf["Fecha y hora"], dayfirst=True, errors='coerce')
+    return pd.merge(
+        df_pdf,
+        df_clientes[["Nº Cliente", "N° de Precinto"]].drop_duplicates(),
+        on="Nº Cliente",
+        how="left",
+        suffixes=("", "_cliente")
+    )
+
+
+def bloques_reclamos(df: pd.DataFrame) -> List[Bloque]:
+    return [bloque_reclamo(r) for r in reclamos_a_registros(df)]
+
+
+# ==================== PAGINACIÓN Y DIBUJO ====================
+
+def paginar(plantilla: PlantillaPagina, secciones: Iterable[Seccion], generado: str) -> List[List[Tuple[float, Bloque]]]:
+    """
+    Reparte los bloques en páginas usando su alto pre-medido.
+
+    Returns:
+        Lista de páginas; cada página es una lista de (y, bloque)
+    """
+    paginas: List[List[Tuple[float, Bloque]]] = []
+    y = Y_INICIAL
+
+    def nueva_pagina(encabezado: Optional[Bloque]):
+        nonlocal y
+        paginas.append([])
+        y = Y_INICIAL
+        if encabezado:
+            paginas[-1].append((y, encabezado))
+            y -= encabezado.alto
+
+    nueva_pagina(plantilla.encabezado(generado))
+
+    for seccion in secciones:
+        if seccion.nueva_pagina and paginas[-1]:
+            nueva_pagina(None)
+        for bloque in seccion.bloques:
+            if y - bloque.alto < LIMITE_INFERIOR and paginas[-1]:
+                titulo = seccion.titulo_continuacion or plantilla.titulo_continuacion
+                nueva_pagina(bloque_continuacion(titulo) if titulo else None)
+            paginas[-1].append((y, bloque))
+            y -= bloque.alto
+
+    return paginas
+
+
+def _dibujar_bloque(c, y: float, bloque: Bloque) -> None:
+    texto = c.beginText()
+    fuente_actual = None
+    for fuente, tamano, x, contenido, avance in bloque.lineas:
+        if (fuente, tamano) != fuente_actual:
+            texto.setFont(fuente, tamano)
+            fuente_actual = (fuente, tamano)
+        texto.setTextOrigin(x, y)
+        texto.textOut(contenido)
+        y -= avance
+    c.drawText(texto)
+    if bloque.separador:
+        y -= 5
+        c.line(MARGEN, y, ANCHO - MARGEN, y)
+
+
+def render_paginas(paginas: List[List[Tuple[float, Bloque]]], destino=None,
+                   numero_inicial: int = 1, total: Optional[int] = None):
+    """
+    Dibuja páginas ya paginadas con pie institucional y numeración.
+
+    La página 1 se guarda sin comprimir para que estampar encuentre la marca
+    de generación en los bytes.
+
+    Args:
+        paginas: Resultado de paginar
+        destino: Archivo/buffer donde escribir (por defecto un BytesIO nuevo)
+        numero_inicial: Número de la primera página (para documentos armados por partes)
+        total: Total de páginas del documento completo
+
+    Returns:
+        El destino, posicionado al inicio
+    """
+    destino = destino if destino is not None else io.BytesIO()
+    total = total or (numero_inicial + len(paginas) - 1)
+    c = canvas.Canvas(destino, pagesize=A4)
+    for i, pagina in enumerate(paginas):
+        if numero_inicial + i == 1:
+            c.setPageCompression(0)
+        for y, bloque in pagina:
+            _dibujar_bloque(c, y, bloque)
+        agregar_pie_pdf(c, ANCHO, ALTO)
+        _agregar_numero_pagina(c, numero_inicial + i, total)
+        c.showPage()
+        if numero_inicial + i == 1:
+            c.setPageCompression(None)
+    c.save()
+    destino.seek(0)
+    return destino
+
+
+# ==================== RENDER EN PARALELO ====================
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _cantidad_procesos() -> int:
+    return PDF_PROCESOS or os.cpu_count() or 1
+
+
+def _obtener_pool() -> ProcessPoolExecutor:
+    """
+    Pool de procesos con "spawn": el servidor de Streamlit tiene varios hilos
+    (sesiones, vigilancia SLA, cola de impresión, telemetría) y hacer fork de
+    un proceso con hilos puede heredar locks tomados y colgar al hijo.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_cantidad_procesos(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _reiniciar_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _render_parte(paginas: List[List[Tuple[float, Bloque]]], numero_inicial: int, total: int) -> bytes:
+    """Trabajo de un proceso: dibuja un tramo de páginas con su numeración definitiva"""
+    return render_paginas(paginas, numero_inicial=numero_inicial, total=total).getvalue()
+
+
+def _partir_paginas(paginas: List, partes: int) -> List[Tuple[int, List]]:
+    """Divide las páginas en tramos contiguos y parejos: [(número de la primera página, páginas)]"""
+    tamano = -(-len(paginas) // partes)
+    return [(i + 1, paginas[i:i + tamano]) for i in range(0, len(paginas), tamano)]
+
+
+def render_paralelo(paginas: List[List[Tuple[float, Bloque]]], destino=None):
+    """
+    Dibuja las páginas en varios procesos y une los PDFs parciales.
+
+    La paginación ya está resuelta, así que cada tramo conoce su número de
+    página inicial y el total. Si pypdf no está instalado o el pool falla,
+    se dibuja en serie.
+    """
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        return render_paginas(paginas, destino)
+
+    pool = _obtener_pool()
+    total = len(paginas)
+    tramos = _partir_paginas(paginas, _cantidad_procesos())
+    try:
+        partes = list(pool.map(_render_parte, [t[1] for t in tramos], [t[0] for t in tramos], [total] * len(tramos)))
+    except Exception:
+        _reiniciar_pool()
+        return render_paginas(paginas, destino)
+
+    writer = PdfWriter()
+    for parte in partes:
+        writer.append(io.BytesIO(parte))
+    destino = destino if destino is not None else io.BytesIO()
+    writer.write(destino)
+    destino.seek(0)
+    return destino
+
+
+# ==================== CACHÉ POR CONTENIDO ====================
+
+_cache_pdf: "OrderedDict[str, bytes]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+# Ocupa lo mismo que una fecha '%d/%m/%Y %H:%M': estampar no mueve ningún offset del PDF
+MARCA_PENDIENTE = "__/__/____ __:__"
+
+
+def marca_generacion() -> str:
+    """Hora de generación que se imprime en el encabezado (resolución de un minuto)"""
+    return datetime.now().strftime('%d/%m/%Y %H:%M')
+
+
+def estampar(datos: bytes, generado: Optional[str] = None) -> bytes:
+    """Reemplaza la marca pendiente del encabezado por la hora de generación"""
+    generado = generado or marca_generacion()
+    marca = f"Generado el: {MARCA_PENDIENTE}".encode("latin-1")
+    return datos.replace(marca, f"Generado el: {generado}".encode("latin-1"), 1)
+
+
+def clave_contenido(plantilla: PlantillaPagina, secciones: List[Seccion]) -> str:
+    """Hash del contenido del listado (la hora de generación no forma parte)"""
+    contenido = (plantilla.clave(), tuple(s.clave() for s in secciones))
+    return hashlib.sha256(repr(contenido).encode("utf-8")).hexdigest()
+
+
+def generar_pdf(plantilla: PlantillaPagina, secciones: List[Seccion]) -> bytes:
+    """Genera (o recupera de caché) el PDF de un listado, con la hora de entrega en el encabezado"""
+    clave = clave_contenido(plantilla, secciones)
+    with _cache_lock:
+        datos = _cache_pdf.get(clave)
+        if datos is not None:
+            _cache_pdf.move_to_end(clave)
+    if datos is not None:
+        return estampar(datos)
+
+    paginas = paginar(plantilla, secciones, MARCA_PENDIENTE)
+    if len(paginas) >= PDF_PARALELO_MIN_PAGINAS:
+        datos = render_paralelo(paginas).getvalue()
+    else:
+        datos = render_paginas(paginas).getvalue()
+
+    with _cache_lock:
+        _cache_pdf[clave] = datos
+        while len(_cache_pdf) > PDF_CACHE_MAX:
+            _cache_pdf.popitem(last=False)
+    return estampar(datos)
+
+
+# ==================== EXPORTACIÓN A ARCHIVO ====================
+
+def _nombre_seguro(nombre: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in nombre)
+
+
+def _render_parte_archivo(paginas: List[List[Tuple[float, Bloque]]], numero_inicial: int, total: int, ruta: str) -> int:
+    """Trabajo de un proceso: dibuja un tramo directo a su archivo; devuelve el tamaño"""
+    with open(ruta, "wb") as salida:
+        render_paginas(paginas, salida, numero_inicial=numero_inicial, total=total)
+    return os.path.getsize(ruta)
+
+
+def _render_tramos(paginas: List[List[Tuple[float, Bloque]]], carpeta: str, limite: int) -> Tuple[List[str], Optional[str]]:
+    """
+    Dibuja las páginas de a PDF_EXPORT_TRAMO, cada tramo en su archivo.
+
+    El tamaño se controla a medida que terminan los tramos (en orden): al
+    pasar el límite se cancela el resto sin dibujarlo.
+    """
+    total = len(paginas)
+    tramos = [(i + 1, paginas[i:i + PDF_EXPORT_TRAMO], os.path.join(carpeta, f"{i:06d}.pdf"))
+              for i in range(0, total, PDF_EXPORT_TRAMO)]
+    pool = _obtener_pool() if total >= PDF_PARALELO_MIN_PAGINAS and len(tramos) > 1 else None
+    futuros = [pool.submit(_render_parte_archivo, tramo, inicio, total, ruta) for inicio, tramo, ruta in tramos] if pool else None
+
+    acumulado = 0
+    for i, (inicio, tramo, ruta) in enumerate(tramos):
+        try:
+            tamano = futuros[i].result() if futuros else _render_parte_archivo(tramo, inicio, total, ruta)
+        except BrokenProcessPool:
+            # Igual que render_paralelo: si el pool falla, el resto se dibuja en serie
+            _reiniciar_pool()
+            futuros = None
+            tamano = _render_parte_archivo(tramo, inicio, total, ruta)
+        acumulado += tamano
+        if acumulado > limite:
+            for futuro in (futuros or [])[i + 1:]:
+                futuro.cancel()
+            return [], f"El PDF supera el límite de {PDF_EXPORT_MAX_MB} MB (más de {acumulado / 1024 / 1024:.1f} MB)"
+    return [ruta for _, _, ruta in tramos], None
+
+
+def exportar_pdf(plantilla: PlantillaPagina, secciones: List[Seccion], nombre_archivo: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Genera el PDF en EXPORTS_DIR sin armar el documento completo en memoria.
+
+    La carpeta está fuera de static/: los listados tienen datos personales y
+    solo se entregan con st.download_button dentro de una sesión autenticada.
+    Cada tramo de páginas se dibuja directo a disco y el tamaño se controla
+    tramo a tramo; pypdf une las partes ya comprimidas (sin pypdf se dibuja
+    en un solo archivo y el límite se controla al final). Un listado ya
+    exportado (mismo contenido, ver clave_contenido) se reutiliza mientras
+    no venza: guarda la marca pendiente y la hora se estampa al entregarlo
+    (leer_exportacion). Los vencidos los borra la cola de impresión.
+
+    Returns:
+        tuple: (ruta, error)
+    """
+    clave = clave_contenido(plantilla, secciones)
+    nombre = f"{clave[:16]}_{_nombre_seguro(nombre_archivo)}"
+    ruta = os.path.join(EXPORTS_DIR, nombre)
+
+    if os.path.exists(ruta):
+        os.utime(ruta)
+        return ruta, None
+
+    limite = PDF_EXPORT_MAX_MB * 1024 * 1024
+    tmp = f"{ruta}.tmp"
+    try:
+        os.makedirs(EXPORTS_DIR, exist_ok=True)
+        paginas = paginar(plantilla, secciones, MARCA_PENDIENTE)
+        try:
+            from pypdf import PdfWriter
+        except ImportError:
+            PdfWriter = None
+
+        if PdfWriter is None:
+            tamano = _render_parte_archivo(paginas, 1, len(paginas), tmp)
+            if tamano > limite:
+                os.remove(tmp)
+                return None, f"El PDF supera el límite de {PDF_EXPORT_MAX_MB} MB ({tamano / 1024 / 1024:.1f} MB)"
+        else:
+            with tempfile.TemporaryDirectory(dir=EXPORTS_DIR) as carpeta:
+                partes, error = _render_tramos(paginas, carpeta, limite)
+                if error:
+                    return None, error
+                if len(partes) == 1:
+                    os.replace(partes[0], tmp)
+                else:
+                    writer = PdfWriter()
+                    for parte in partes:
+                        writer.append(parte)
+                    with open(tmp, "wb") as salida:
+                        writer.write(salida)
+        os.replace(tmp, ruta)
+    except Exception as e:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None, str(e)
+
+    return ruta, None
+
+
+def leer_exportacion(ruta: str) -> bytes:
+    """Contenido de un PDF exportado con la hora de entrega estampada"""
+    with open(ruta, "rb") as f:
+        return estampar(f.read())
+
+
+def guardar_pdf(plantilla: PlantillaPagina, secciones: List[Seccion], ruta: str) -> int:
+    """
+    Genera el PDF directamente en disco (escritura atómica).
+
+    Returns:
+        Tamaño del archivo en bytes
+    """
+    paginas = paginar(plantilla, secciones, marca_generacion())
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    tmp = f"{ruta}.tmp"
+    with open(tmp, "wb") as salida:
+        if len(paginas) >= PDF_PARALELO_MIN_PAGINAS:
+            render_paralelo(paginas, salida)
+        else:
+            render_paginas(paginas, salida)
+    os.replace(tmp, ruta)
+    return os.path.getsize(ruta)
+
+
+def exportar_listado_reclamos(df_reclamos: pd.DataFrame, titulo: str, nombre_archivo: str,
+                              usuario: Optional[dict] = None) -> Tuple[Optional[str], Optional[str]]:
+    """Versión en archivo de pdf_listado_reclamos"""
+    plantilla = PlantillaPagina(titulo, autor=usuario.get('nombre', 'Sistema') if usuario else None)
+    return exportar_pdf(plantilla, [Seccion(bloques_reclamos(df_reclamos))], nombre_archivo)
+
+
+# ==================== LISTADOS ESTÁNDAR ====================
+
+def pdf_listado_reclamos(df_reclamos: pd.DataFrame, titulo: str, usuario: Optional[dict] = None) -> io.BytesIO:
+    """Listado de reclamos con bloque completo por reclamo"""
+    plantilla = PlantillaPagina(titulo, autor=usuario.get('nombre', 'Sistema') if usuario else None)
+    return io.BytesIO(generar_pdf(plantilla, [Seccion(bloques_reclamos(df_reclamos))]))
+
+
+def secciones_por_tecnico(df_en_curso: pd.DataFrame) -> List[Seccion]:
+    """Una sección compacta por técnico (cliente - tipo - sector)"""
+    secciones = []
+    registros = df_en_curso[["Técnico", "Nº Cliente", "Tipo de reclamo", "Sector"]].to_dict("records")
+    por_tecnico: Dict[str, List[Dict[str, Any]]] = {}
+    for r in registros:
+        por_tecnico.setdefault(r["Técnico"], []).append(r)
+
+    for tecnico in sorted(por_tecnico):
+        reclamos = por_tecnico[tecnico]
+        bloques = [bloque_texto(f"Técnico: {tecnico} ({len(reclamos)})", "Helvetica-Bold", 13, avance=20)]
+        bloques += [
+            bloque_texto(f"{r['Nº Cliente']} - {r['Tipo de reclamo']} - Sector {r['Sector']}", x=50)
+            for r in reclamos
+        ]
+        bloques.append(bloque_texto("-" * 80, tamano=10, avance=20))
+        secciones.append(Seccion(bloques, titulo_continuacion=f"Técnico: {tecnico} (cont.)"))
+    return secciones
+
+
+def pdf_en_curso_por_tecnico(df_en_curso: pd.DataFrame, usuario: Optional[dict] = None) -> io.BytesIO:
+    """Reclamos en curso agrupados por técnico"""
+    hoy = datetime.now().strftime('%d/%m/%Y')
+    plantilla = PlantillaPagina(
+        f"RECLAMOS EN CURSO - {hoy}",
+        autor=usuario.get('nombre', 'Sistema') if usuario else None,
+        con_fecha=False,
+    )
+    return io.BytesIO(generar_pdf(plantilla, secciones_por_tecnico(df_en_curso)))
+
+
+def seccion_grupo(grupo: str, tecnicos: List[str], df_grupo: pd.DataFrame,
+                  materiales: Dict[str, int], fecha: str) -> Seccion:
+    """Sección de un grupo de trabajo: cabecera, reclamos y materiales estimados"""
+    tipos = df_grupo["Tipo de reclamo"].value_counts()
+    resumen_tipos = " - ".join(f"{v} {k}" for k, v in tipos.items())
+
+    bloques = [
+        bloque_texto(f"{grupo} - Técnicos: {', '.join(tecnicos)} (Asignado el {fecha})", "Helvetica-Bold", 16, avance=20),
+        bloque_texto(resumen_tipos, tamano=12, avance=25),
+    ]
+    bloques += bloques_reclamos(df_grupo)
+
+    if materiales:
+        lineas = [("Helvetica-Bold", 12, MARGEN, "Materiales mínimos estimados:", 15)]
+        lineas += [("Helvetica", 11, MARGEN, f"- {cant} {mat.replace('_', ' ').title()}", 12) for mat, cant in materiales.items()]
+        bloques.append(Bloque(lineas))
+
+    return Seccion(bloques, nueva_pagina=True, titulo_continuacion=f"{grupo} (cont.)")
+
+
+def pdf_asignaciones_grupos(secciones: List[Seccion]) -> io.BytesIO:
+    """Asignaciones por grupo (una sección por grupo, cada una desde página nueva)"""
+    return io.BytesIO(generar_pdf(PlantillaPagina(), secciones))
@@ -0,0 +1,227 @@
+# utils/perfilado.py
+"""
+Instrumentación liviana de los componentes render_*.
+
+Por cada ejecución se registra tiempo de pared, tiempo de CPU del hilo del
+script, widgets creados y llamadas a la API (de las trazas); las
+asignaciones de memoria se miden solo si tracemalloc está activo
+(PERFIL_MEMORIA o pedido puntual). tracemalloc es global al proceso: se
+arranca con la primera medición y se detiene con la última, y el pico solo
+se informa si ninguna otra medición se superpuso. Los agregados viven en
+el proceso.
+
+Un perfil completo (cProfile o pyinstrument si está instalado) se pide para
+la próxima ejecución de un componente con solicitar_perfil().
+"""
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from utils.trazas_api import llamadas_del_rerun
+from utils.telemetria import render_duracion
+from config.settings import PERFIL_MUESTRAS, PERFIL_DIR, PERFIL_MEMORIA
+
+_lock = threading.Lock()
+_muestras: Dict[str, deque] = {}
+_perfiles_pedidos: Dict[str, str] = {}  # componente -> motor
+_ultimos_perfiles: Dict[str, Dict[str, Any]] = {}
+
+# Mediciones de memoria en curso (todas bajo _lock)
+_memoria_activas = 0
+_memoria_tomas = 0  # Se incrementa con cada medición: detecta superposiciones
+_memoria_propia = False  # True si tracemalloc lo arrancó este módulo
+
+
+def _widgets_del_rerun() -> Optional[int]:
+    """Widgets registrados hasta ahora en el rerun (None fuera de Streamlit)"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return len(ctx.widget_ids_this_run) if ctx is not None else None
+    except (ImportError, AttributeError):
+        return None
+
+
+def _tomar_memoria() -> int:
+    """Empieza una medición de memoria; devuelve el número de toma"""
+    global _memoria_activas, _memoria_tomas, _memoria_propia
+    with _lock:
+        if _memoria_activas == 0:
+            _memoria_propia = not tracemalloc.is_tracing()
+            if _memoria_propia:
+                tracemalloc.start()
+        _memoria_activas += 1
+        _memoria_tomas += 1
+        if _memoria_activas == 1:
+            tracemalloc.reset_peak()
+        return _memoria_tomas
+
+
+def _soltar_memoria(toma: int) -> bool:
+    """Termina la medición; True si no se superpuso con otra"""
+    global _memoria_activas
+    with _lock:
+        exclusiva = _memoria_activas == 1 and _memoria_tomas == toma
+        _memoria_activas -= 1
+        if _memoria_activas == 0 and _memoria_propia:
+            tracemalloc.stop()
+        return exclusiva
+
+
+def solicitar_perfil(componente: str, motor: str = "cprofile") -> None:
+    """Perfila la próxima ejecución del componente ("cprofile" o "pyinstrument")"""
+    with _lock:
+        _perfiles_pedidos[componente] = motor
+
+
+def ultimo_perfil(componente: str) -> Optional[Dict[str, Any]]:
+    with _lock:
+        return _ultimos_perfiles.get(componente)
+
+
+class _Perfilador:
+    """Envuelve cProfile o pyinstrument con la misma interfaz"""
+
+    def __init__(self, motor: str):
+        self.motor = motor
+        if motor == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                self._perfil = Profiler()
+            except ImportError:
+                self.motor = "cprofile"
+        if self.motor == "cprofile":
+            self._perfil = cProfile.Profile()
+
+    def iniciar(self):
+        if self.motor == "pyinstrument":
+            self._perfil.start()
+        else:
+            self._perfil.enable()
+
+    def detener(self, componente: str) -> Dict[str, Any]:
+        os.makedirs(PERFIL_DIR, exist_ok=True)
+        base = os.path.join(PERFIL_DIR, f"{componente}-{time.strftime('%Y%m%d-%H%M%S')}")
+        if self.motor == "pyinstrument":
+            self._perfil.stop()
+            ruta = f"{base}.html"
+            with open(ruta, "w", encoding="utf-8") as f:
+                f.write(self._perfil.output_html())
+            resumen = self._perfil.output_text(unicode=True, color=False)
+        else:
+            self._perfil.disable()
+            ruta = f"{base}.prof"
+            self._perfil.dump_stats(ruta)
+            salida = io.StringIO()
+            pstats.Stats(self._perfil, stream=salida).sort_stats("cumulative").print_stats(30)
+            resumen = salida.getvalue()
+        return {"motor": self.motor, "ruta": ruta, "resumen": resumen, "momento": time.time()}
+
+
+@contextmanager
+def medir_render(componente: str):
+    """Mide un bloque de render y agrega la muestra a las estadísticas del componente"""
+    with _lock:
+        motor = _perfiles_pedidos.pop(componente, None)
+    perfilador = _Perfilador(motor) if motor else None
+
+    # Con un perfil pedido también se miden asignaciones, aunque PERFIL_MEMORIA esté apagado
+    toma = _tomar_memoria() if PERFIL_MEMORIA or perfilador is not None else None
+    memoria_inicial = tracemalloc.get_traced_memory()[0] if toma is not None else 0
+
+    widgets_inicial = _widgets_del_rerun()
+    api_inicial, api_ms_inicial = llamadas_del_rerun()
+    cpu_inicial = time.thread_time()
+    inicio = time.perf_counter()
+    if perfilador:
+        perfilador.iniciar()
+    try:
+        yield
+    finally:
+        if perfilador:
+            perfil = perfilador.detener(componente)
+            with _lock:
+                _ultimos_perfiles[componente] = perfil
+
+        muestra = {
+            "momento": time.time(),
+            "pared_ms": (time.perf_counter() - inicio) * 1000,
+            "cpu_ms": (time.thread_time() - cpu_inicial) * 1000,
+            "asignado_kb": None,
+            "pico_kb": None,
+            "widgets": None,
+            "api_llamadas": 0,
+            "api_ms": 0.0,
+        }
+        if toma is not None:
+            actual, pico = tracemalloc.get_traced_memory()
+            # Con mediciones superpuestas las cifras mezclan asignaciones de otros renders
+            if _soltar_memoria(toma):
+                muestra["asignado_kb"] = (actual - memoria_inicial) / 1024
+                muestra["pico_kb"] = (pico - memoria_inicial) / 1024
+        widgets_final = _widgets_del_rerun()
+        if widgets_inicial is not None and widgets_final is not None:
+            muestra["widgets"] = widgets_final - widgets_inicial
+        api_final, api_ms_final = llamadas_del_rerun()
+        muestra["api_llamadas"] = api_final - api_inicial
+        muestra["api_ms"] = api_ms_final - api_ms_inicial
+
+        with _lock:
+            _muestras.setdefault(componente, deque(maxlen=PERFIL_MUESTRAS)).append(muestra)
+        render_duracion.observe(muestra["pared_ms"] / 1000, componente=componente)
+
+
+def perfilar_render(funcion=None, *, nombre: Optional[str] = None):
+    """Decorador para los puntos de entrada render_* (con o sin argumentos)"""
+    def decorador(f):
+        componente = nombre or f.__name__
+
+        @functools.wraps(f)
+        def envoltura(*args, **kwargs):
+            with medir_render(componente):
+                return f(*args, **kwargs)
+        return envoltura
+
+    return decorador(funcion) if funcion is not None else decorador
+
+
+def _percentil(valores: List[float], q: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, round(q * (len(ordenados) - 1)))]
+
+
+def estadisticas_render() -> Dict[str, Dict[str, Any]]:
+    """Agregados por componente sobre las últimas PERFIL_MUESTRAS ejecuciones"""
+    with _lock:
+        copia = {c: list(m) for c, m in _muestras.items()}
+
+    resultado = {}
+    for componente, muestras in copia.items():
+        pared = [m["pared_ms"] for m in muestras]
+        widgets = [m["widgets"] for m in muestras if m["widgets"] is not None]
+        asignado = [m["asignado_kb"] for m in muestras if m["asignado_kb"] is not None]
+        resultado[componente] = {
+            "ejecuciones": len(muestras),
+            "pared_p50_ms": round(_percentil(pared, 0.5), 1),
+            "pared_p90_ms": round(_percentil(pared, 0.9), 1),
+            "pared_max_ms": round(max(pared), 1),
+            "cpu_p50_ms": round(_percentil([m["cpu_ms"] for m in muestras], 0.5), 1),
+            "api_ms_p50": round(_percentil([m["api_ms"] for m in muestras], 0.5), 1),
+            "api_llamadas_prom": round(sum(m["api_llamadas"] for m in muestras) / len(muestras), 2),
+            "widgets_prom": round(sum(widgets) / len(widgets), 1) if widgets else None,
+            "asignado_kb_prom": round(sum(asignado) / len(asignado), 1) if asignado else None,
+        }
+    return resultado
+
+
+def reiniciar_estadisticas() -> None:
+    with _lock:
+        _muestras.clear()
@@ -0,0 +1,166 @@
+# utils/planificacion_store.py
+"""
+Persistencia local de sesiones de planificación de grupos.
+
+Cada sesión se identifica por fecha y administrador y se guarda como:
+- un snapshot JSON compacto con el estado vigente (se carga en tiempo constante)
+- un log append-only de diffs versionados (una línea JSON por cambio)
+
+El log se compacta cuando supera PLANIFICACION_MAX_LOG entradas, ya que el
+snapshot siempre refleja el estado completo.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from config.settings import PLANIFICACION_DIR, PLANIFICACION_MAX_LOG
+
+_lock = threading.Lock()
+
+OPERACIONES_VALIDAS = ("asignar", "quitar", "tecnicos", "reemplazar")
+
+
+def _estado_vacio(grupos: List[str]) -> Dict[str, Any]:
+    return {
+        "version": 0,
+        "asignaciones": {g: [] for g in grupos},
+        "tecnicos": {g: [] for g in grupos},
+    }
+
+
+def _aplicar_operacion(estado: Dict[str, Any], op: Dict[str, Any]) -> None:
+    """Aplica un diff sobre el estado en memoria"""
+    tipo = op.get("op")
+    grupo = op.get("grupo")
+
+    if tipo == "asignar":
+        ids = estado["asignaciones"].setdefault(grupo, [])
+        if op["id"] not in ids:
+            ids.append(op["id"])
+    elif tipo == "quitar":
+        ids = estado["asignaciones"].setdefault(grupo, [])
+        if op["id"] in ids:
+            ids.remove(op["id"])
+    elif tipo == "tecnicos":
+        estado["tecnicos"][grupo] = list(op.get("valor", []))
+    elif tipo == "reemplazar":
+        for g in estado["asignaciones"]:
+            estado["asignaciones"][g] = []
+        for g, ids in op.get("asignaciones", {}).items():
+            estado["asignaciones"][g] = list(ids)
+    else:
+        raise ValueError(f"Operación no válida: {tipo}. Opciones: {list(OPERACIONES_VALIDAS)}")
+
+
+class PlanificacionDesactualizada(Exception):
+    """Otra pestaña u otro proceso guardó la sesión después de que se cargó este estado"""
+
+
+class SesionPlanificacion:
+    """Sesión de planificación persistida para una fecha y un administrador"""
+
+    def __init__(self, fecha: str, admin: str, grupos: List[str], base_dir: str = PLANIFICACION_DIR):
+        self.fecha = fecha
+        self.admin = normalizar_admin(admin)
+        self.grupos = list(grupos)
+        self.base_dir = os.path.join(base_dir, fecha)
+        self.path_snapshot = os.path.join(self.base_dir, f"{self.admin}.json")
+        self.path_log = os.path.join(self.base_dir, f"{self.admin}.log")
+
+    def mtime(self) -> float:
+        """Marca de modificación del snapshot (0 si todavía no existe)"""
+        try:
+            return os.stat(self.path_snapshot).st_mtime
+        except OSError:
+            return 0.0
+
+    def cargar(self) -> Dict[str, Any]:
+        """Carga el snapshot vigente sin reprocesar el historial de cambios"""
+        estado = _estado_vacio(self.grupos)
+        try:
+            with open(self.path_snapshot, "r", encoding="utf-8") as f:
+                guardado = json.load(f)
+        except (OSError, ValueError):
+            return estado
+
+        estado["version"] = int(guardado.get("version", 0))
+        for g in self.grupos:
+            estado["asignaciones"][g] = list(guardado.get("asignaciones", {}).get(g, []))
+            estado["tecnicos"][g] = list(guardado.get("tecnicos", {}).get(g, []))
+        return estado
+
+    def registrar(self, estado: Dict[str, Any], operaciones: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Aplica los diffs sobre el estado, los agrega al log y actualiza el snapshot.
+
+        Returns:
+            El estado actualizado con la nueva versión
+
+        Raises:
+            PlanificacionDesactualizada: si el snapshot guardado no tiene la versión del estado
+        """
+        if not operaciones:
+            return estado
+
+        with _lock:
+            guardada = self._version_guardada()
+            if guardada != estado["version"]:
+                raise PlanificacionDesactualizada(
+                    f"versión guardada {guardada}, versión del estado {estado['version']}"
+                )
+            os.makedirs(self.base_dir, exist_ok=True)
+            version_inicial = estado["version"]
+            lineas = []
+            for op in operaciones:
+                _aplicar_operacion(estado, op)
+                estado["version"] += 1
+                lineas.append(json.dumps({"v": estado["version"], **op}, ensure_ascii=False, separators=(",", ":")))
+
+            with open(self.path_log, "a", encoding="utf-8") as f:
+                f.write("\n".join(lineas) + "\n")
+
+            self._escribir_snapshot(estado)
+
+            if estado["version"] // PLANIFICACION_MAX_LOG > version_inicial // PLANIFICACION_MAX_LOG:
+                self._compactar_log()
+
+        return estado
+
+    def _version_guardada(self) -> int:
+        try:
+            with open(self.path_snapshot, "r", encoding="utf-8") as f:
+                return int(json.load(f).get("version", 0))
+        except (OSError, ValueError):
+            return 0
+
+    def _escribir_snapshot(self, estado: Dict[str, Any]) -> None:
+        tmp = f"{self.path_snapshot}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": estado["version"], "asignaciones": estado["asignaciones"], "tecnicos": estado["tecnicos"]},
+                f, ensure_ascii=False, separators=(",", ":")
+            )
+        os.replace(tmp, self.path_snapshot)
+
+    def _compactar_log(self) -> None:
+        """El snapshot ya contiene todo el estado: el log se reinicia"""
+        try:
+            open(self.path_log, "w", encoding="utf-8").close()
+        except OSError:
+            pass
+
+
+def normalizar_admin(admin: Optional[str]) -> str:
+    """Convierte el usuario en un nombre de archivo seguro"""
+    admin = str(admin or "sin_usuario").strip().lower()
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in admin)
+
+
+def listar_sesiones(fecha: str, base_dir: str = PLANIFICACION_DIR) -> List[str]:
+    """Lista los administradores que tienen una planificación guardada para la fecha"""
+    carpeta = os.path.join(base_dir, fecha)
+    try:
+        return sorted(n[:-5] for n in os.listdir(carpeta) if n.endswith(".json"))
+    except OSError:
+        return []
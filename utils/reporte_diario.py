@@ -1,86 +1,185 @@
 # utils/reporte_diario.py
 """
-Archivo seguro para generar Reporte Diario en PNG y debug de fechas.
-Reemplazá completamente el archivo por este contenido.
+Reporte Diario: un único pipeline de estadísticas de la jornada.
+
+Se separa en dos etapas:
+- estadísticas: memoizadas por versión de datos y corte horario; las usan
+  también el resumen de la jornada y el dashboard de métricas
+- render: PNG, PDF, CSV y JSON a partir de las mismas cifras (el PNG con
+  fuentes y plantilla base cacheadas, y cacheado por estadísticas)
 """
 
+import csv
 import io
-from datetime import datetime
-from typing import Tuple
+import json
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
 
 import pandas as pd
-from PIL import Image, ImageDraw, ImageFont
 import streamlit as st
 
-from utils.date_utils import ahora_argentina, format_fecha
-
-
-def _to_datetime_clean(series: pd.Series) -> pd.Series:
-    s = series.astype(str).str.replace(r"\s+", " ", regex=True).str.strip()
-    s = s.replace({"": None, "nan": None, "NaN": None, "NONE": None, "None": None})
-    out = pd.to_datetime(s, errors="coerce", dayfirst=True, infer_datetime_format=True)
-    if pd.api.types.is_datetime64tz_dtype(out):
-        out = out.dt.tz_convert(None).dt.tz_localize(None)
-    return out
-
-
-def _prep_df(df_reclamos: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Timestamp, pd.Timestamp]:
-    df = df_reclamos.copy()
-    df.columns = [str(c).strip() for c in df.columns]
-    for col in ("Fecha y hora", "Fecha_formateada", "Estado", "Técnico", "Tipo de reclamo"):
-        if col not in df.columns:
-            df[col] = pd.NA
-    df["Fecha y hora"] = _to_datetime_clean(df["Fecha y hora"])
-    df["Fecha_formateada"] = _to_datetime_clean(df["Fecha_formateada"])
-    df["Estado"] = df["Estado"].astype(str).str.strip().str.lower()
-    df["Técnico"] = df["Técnico"].fillna("Sin técnico").astype(str).str.strip()
-    df["Tipo de reclamo"] = df["Tipo de reclamo"].fillna("Sin tipo").astype(str).str.strip()
+from utils.date_utils import ahora_argentina, parse_fechas_series
+from utils.data_manager import version_datos
+from utils.capacidad import separar_tecnicos
+from utils.telemetria import cache_medida
+from config.settings import REPORTE_CORTE_MINUTOS, REPORTE_CACHE_MAX, SLA_HORAS_SIN_TECNICO
+
+WIDTH, HEIGHT = 1200, 1600
+BG_COLOR = (39, 40, 34)
+TEXT_COLOR = (248, 248, 242)
+HIGHLIGHT_COLOR = (249, 38, 114)
+
+
+FORMATOS_REPORTE = {
+    "PNG": ("png", "image/png"),
+    "PDF": ("pdf", "application/pdf"),
+    "CSV": ("csv", "text/csv"),
+    "JSON": ("json", "application/json"),
+}
+
+
+class EstadisticasReporte(NamedTuple):
+    """Cifras de la jornada (inmutable y hashable: sirve como clave de caché)"""
+    fecha: str
+    hora: str
+    ingresados_24h: int
+    resueltos_por_tecnico: Tuple[Tuple[str, int], ...]
+    pendientes: int
+    pendientes_por_tipo: Tuple[Tuple[str, int], ...]
+    total: int
+    cargados_hoy: int
+    por_estado: Tuple[Tuple[str, int], ...]  # estado normalizado en minúsculas
+    en_curso_por_grupo: Tuple[Tuple[str, int], ...]
+    en_curso_antiguos: Tuple[Tuple[str, str, str, str], ...]  # (nombre, cliente, desde, técnicos)
+    sin_tecnico_vencidos: int  # Pendientes/en curso sin técnico hace más de SLA_HORAS_SIN_TECNICO
+
+    def cantidad(self, estado: str) -> int:
+        """Reclamos en un estado (sin distinguir mayúsculas)"""
+        return dict(self.por_estado).get(estado.strip().lower(), 0)
+
+
+def _corte_actual() -> pd.Timestamp:
+    """Hora actual redondeada hacia abajo a REPORTE_CORTE_MINUTOS"""
     ahora_ts = pd.Timestamp(ahora_argentina()).tz_localize(None)
-    hace_24h = ahora_ts - pd.Timedelta(hours=24)
-    return df, ahora_ts, hace_24h
-
-
-def generar_reporte_diario_imagen(df_reclamos: pd.DataFrame) -> io.BytesIO:
-    df, ahora_ts, hace_24h = _prep_df(df_reclamos)
-    mask_ing_24h = df["Fecha y hora"].notna() & (df["Fecha y hora"] >= hace_24h)
-    total_ingresados_24h = int(mask_ing_24h.sum())
-    mask_res_24h = (
-        (df["Estado"] == "resuelto")
-        & df["Fecha_formateada"].notna()
-        & (df["Fecha_formateada"] >= hace_24h)
+    return ahora_ts.floor(f"{REPORTE_CORTE_MINUTOS}min")
+
+
+def _conteo(serie: pd.Series) -> Tuple[Tuple[str, int], ...]:
+    conteo = serie.value_counts()
+    return tuple((str(k), int(v)) for k, v in conteo.items())
+
+
+# Una entrada por (versión, corte horario): max_entries evita que crezca sin límite
+@cache_medida("calcular_estadisticas_reporte", st.cache_data(show_spinner=False, max_entries=16))
+def calcular_estadisticas_reporte(_df_reclamos: pd.DataFrame, version: str, corte: pd.Timestamp) -> EstadisticasReporte:
+    """
+    Calcula las cifras del reporte (memoizado por versión de datos y corte horario).
+
+    Args:
+        _df_reclamos: DataFrame de reclamos (no se hashea)
+        version: Huella de los datos (version_datos)
+        corte: Momento de referencia para la ventana de 24h
+    """
+    df = _df_reclamos
+    hace_24h = corte - pd.Timedelta(hours=24)
+    n = len(df)
+
+    def columna(nombre, default):
+        return df[nombre] if nombre in df.columns else pd.Series([default] * n, index=df.index)
+
+    ingreso = parse_fechas_series(columna("Fecha y hora", None))
+    cierre = parse_fechas_series(columna("Fecha_formateada", None))
+    estado = columna("Estado", "").astype(str).str.strip().str.lower().astype("category")
+    tecnico_raw = columna("Técnico", None).fillna("").astype(str).str.strip()
+    tecnico = tecnico_raw.where(tecnico_raw != "", "Sin técnico")
+    tipo = columna("Tipo de reclamo", None).fillna("Sin tipo").astype(str).str.strip()
+
+    mask_res_24h = (estado == "resuelto") & (cierre >= hace_24h)
+    mask_pendiente = estado == "pendiente"
+    mask_en_curso = estado == "en curso"
+    mask_sin_tecnico = (mask_pendiente | mask_en_curso) & (tecnico_raw == "")
+
+    # Grupos en curso: "juan, Maxi" y "MAXI,JUAN" cuentan como el mismo grupo
+    grupos = (
+        separar_tecnicos(columna("Técnico", None)[mask_en_curso])
+        .sort_values()
+        .groupby(level=0)
+        .agg(", ".join)
     )
-    resueltos_24h = df.loc[mask_res_24h, ["Técnico", "Estado", "Fecha_formateada"]]
-    tecnicos_resueltos = (
-        resueltos_24h.groupby("Técnico")["Estado"]
-        .count()
-        .reset_index()
-        .rename(columns={"Estado": "Cantidad"})
-        .sort_values("Cantidad", ascending=False)
+
+    antiguos = (
+        pd.DataFrame({
+            "nombre": columna("Nombre", "").astype(str),
+            "cliente": columna("Nº Cliente", "").astype(str),
+            "desde": ingreso,
+            "tecnico": tecnico,
+        })[mask_en_curso & (tecnico_raw != "")]
+        .sort_values("desde")
+        .head(3)
     )
-    pendientes = df[df["Estado"] == "pendiente"]
-    total_pendientes = int(len(pendientes))
-    pendientes_tipo = (
-        pendientes.groupby("Tipo de reclamo")["Estado"]
-        .count()
-        .reset_index()
-        .rename(columns={"Estado": "Cantidad", "Tipo de reclamo": "Tipo"})
-        .sort_values("Cantidad", ascending=False)
+
+    return EstadisticasReporte(
+        fecha=corte.strftime("%d/%m/%Y"),
+        hora=corte.strftime("%H:%M"),
+        ingresados_24h=int((ingreso >= hace_24h).sum()),
+        resueltos_por_tecnico=_conteo(tecnico[mask_res_24h]),
+        pendientes=int(mask_pendiente.sum()),
+        pendientes_por_tipo=_conteo(tipo[mask_pendiente]),
+        total=n,
+        cargados_hoy=int((ingreso.dt.normalize() == corte.normalize()).sum()),
+        por_estado=_conteo(estado[estado != ""].astype(str)),
+        en_curso_por_grupo=_conteo(grupos),
+        en_curso_antiguos=tuple(
+            (r.nombre, r.cliente, r.desde.strftime("%d/%m/%Y %H:%M") if pd.notna(r.desde) else "Sin fecha", r.tecnico)
+            for r in antiguos.itertuples(index=False)
+        ),
+        sin_tecnico_vencidos=int((mask_sin_tecnico & (ingreso < corte - pd.Timedelta(hours=SLA_HORAS_SIN_TECNICO))).sum()),
     )
 
-    WIDTH, HEIGHT = 1200, 1600
-    BG_COLOR = (39, 40, 34)
-    TEXT_COLOR = (248, 248, 242)
-    HIGHLIGHT_COLOR = (249, 38, 114)
-    img = Image.new("RGB", (WIDTH, HEIGHT), BG_COLOR)
-    draw = ImageDraw.Draw(img)
+
+def estadisticas_jornada(df_reclamos: pd.DataFrame, version: Optional[str] = None) -> EstadisticasReporte:
+    """
+    Punto de entrada del pipeline: cifras de la jornada para el corte actual.
+
+    Args:
+        df_reclamos: DataFrame de reclamos
+        version: Huella de los datos (por defecto st.session_state.df_version o version_datos)
+    """
+    version = version or st.session_state.get("df_version") or version_datos(df_reclamos)
+    return calcular_estadisticas_reporte(df_reclamos, version, _corte_actual())
+
+
+@lru_cache(maxsize=1)
+def _fuentes():
+    """Carga las fuentes TrueType una sola vez por proceso"""
+    from PIL import ImageFont  # PIL solo se carga al dibujar el PNG
+
     try:
-        font_title = ImageFont.truetype("DejaVuSans-Bold.ttf", 36)
-        font_sub = ImageFont.truetype("DejaVuSans-Bold.ttf", 28)
-        font_txt = ImageFont.truetype("DejaVuSans.ttf", 24)
+        return (
+            ImageFont.truetype("DejaVuSans-Bold.ttf", 36),
+            ImageFont.truetype("DejaVuSans-Bold.ttf", 28),
+            ImageFont.truetype("DejaVuSans.ttf", 24),
+        )
     except Exception:
-        font_title = ImageFont.load_default()
-        font_sub = ImageFont.load_default()
-        font_txt = ImageFont.load_default()
+        default = ImageFont.load_default()
+        return default, default, default
+
+
+@lru_cache(maxsize=1)
+def _plantilla_base():
+    """Lienzo de fondo reutilizable (se copia en cada render)"""
+    from PIL import Image
+    return Image.new("RGB", (WIDTH, HEIGHT), BG_COLOR)
+
+
+@cache_medida("_render_png", lru_cache(maxsize=REPORTE_CACHE_MAX))
+def _render_png(stats: EstadisticasReporte) -> bytes:
+    """Dibuja el reporte; el resultado queda cacheado por la tupla de estadísticas"""
+    from PIL import ImageDraw
+
+    font_title, font_sub, font_txt = _fuentes()
+    img = _plantilla_base().copy()
+    draw = ImageDraw.Draw(img)
 
     y = 50
     line_h = 40
@@ -90,32 +189,125 @@ def generar_reporte_diario_imagen(df_reclamos: pd.DataFrame) -> io.BytesIO:
         draw.text((50, y), str(text), font=font, fill=color)
         y += dy
 
-    fecha_str = ahora_ts.strftime("%d/%m/%Y")
-    hora_str = ahora_ts.strftime("%H:%M")
-
-    _line(f"■ Reporte Diario - {fecha_str}", font_title, HIGHLIGHT_COLOR, line_h)
-    _line(f"Generado a las {hora_str}", font_sub, TEXT_COLOR, line_h)
+    _line(f"■ Reporte Diario - {stats.fecha}", font_title, HIGHLIGHT_COLOR, line_h)
+    _line(f"Generado a las {stats.hora}", font_sub, TEXT_COLOR, line_h)
     _line("", font_txt, TEXT_COLOR, line_h // 2)
 
-    _line(f"■ Reclamos ingresados (24h): {total_ingresados_24h}", font_sub, HIGHLIGHT_COLOR, line_h)
+    _line(f"■ Reclamos ingresados (24h): {stats.ingresados_24h}", font_sub, HIGHLIGHT_COLOR, line_h)
     _line("", font_txt, TEXT_COLOR, line_h // 2)
 
     _line("■ Reporte técnico/grupo (24h):", font_sub, HIGHLIGHT_COLOR, line_h)
-    if tecnicos_resueltos.empty:
+    if not stats.resueltos_por_tecnico:
         _line("No hay reclamos resueltos en las últimas 24h", font_txt, TEXT_COLOR, line_h)
     else:
-        for _, r in tecnicos_resueltos.iterrows():
-            _line(f"{r['Técnico']}: {int(r['Cantidad'])} resueltos (24h)", font_txt, TEXT_COLOR, line_h)
+        for tecnico, cantidad in stats.resueltos_por_tecnico:
+            _line(f"{tecnico}: {cantidad} resueltos (24h)", font_txt, TEXT_COLOR, line_h)
 
     _line("", font_txt, TEXT_COLOR, line_h // 2)
-    _line(f"■ Quedan pendientes: {total_pendientes}", font_sub, HIGHLIGHT_COLOR, line_h)
-    if pendientes_tipo.empty:
+    _line(f"■ Quedan pendientes: {stats.pendientes}", font_sub, HIGHLIGHT_COLOR, line_h)
+    if not stats.pendientes_por_tipo:
         _line("Sin pendientes", font_txt, TEXT_COLOR, line_h)
     else:
-        for _, r in pendientes_tipo.iterrows():
-            _line(f"{r['Tipo']}: {int(r['Cantidad'])}", font_txt, TEXT_COLOR, line_h)
+        for tipo, cantidad in stats.pendientes_por_tipo:
+            _line(f"{tipo}: {cantidad}", font_txt, TEXT_COLOR, line_h)
 
     buffer = io.BytesIO()
     img.save(buffer, format="PNG")
-    buffer.seek(0)
-    return buffer
+    return buffer.getvalue()
+
+
+def _render_pdf(stats: EstadisticasReporte) -> bytes:
+    from utils.pdf_utils import PlantillaPagina, Seccion, bloque_texto, generar_pdf
+
+    def seccion(titulo, filas):
+        bloques = [bloque_texto(titulo, "Helvetica-Bold", 13, avance=20)]
+        bloques += [bloque_texto(f"{clave}: {valor}", x=50) for clave, valor in filas] or [bloque_texto("Sin datos", x=50)]
+        bloques.append(bloque_texto("", avance=10))
+        return Seccion(bloques)
+
+    plantilla = PlantillaPagina(f"REPORTE DIARIO - {stats.fecha} {stats.hora}", con_fecha=False)
+    secciones = [
+        seccion("Resumen", [
+            ("Reclamos ingresados (24h)", stats.ingresados_24h),
+            ("Cargados hoy", stats.cargados_hoy),
+            ("Pendientes", stats.pendientes),
+            ("Total de reclamos", stats.total),
+        ]),
+        seccion("Resueltos por técnico/grupo (24h)", stats.resueltos_por_tecnico),
+        seccion("Pendientes por tipo", stats.pendientes_por_tipo),
+        seccion("Reclamos por estado", [(e.capitalize(), c) for e, c in stats.por_estado]),
+        seccion("En curso por grupo", stats.en_curso_por_grupo),
+    ]
+    return generar_pdf(plantilla, secciones)
+
+
+def reporte_a_dict(stats: EstadisticasReporte) -> Dict:
+    """Estructura serializable del reporte (la que consume el JSON para tableros externos)"""
+    return {
+        "fecha": stats.fecha,
+        "hora": stats.hora,
+        "total": stats.total,
+        "ingresados_24h": stats.ingresados_24h,
+        "cargados_hoy": stats.cargados_hoy,
+        "pendientes": stats.pendientes,
+        "resueltos_por_tecnico_24h": dict(stats.resueltos_por_tecnico),
+        "pendientes_por_tipo": dict(stats.pendientes_por_tipo),
+        "por_estado": dict(stats.por_estado),
+        "en_curso_por_grupo": dict(stats.en_curso_por_grupo),
+        "en_curso_antiguos": [
+            {"nombre": n, "cliente": c, "desde": d, "tecnicos": t}
+            for n, c, d, t in stats.en_curso_antiguos
+        ],
+    }
+
+
+def _render_json(stats: EstadisticasReporte) -> bytes:
+    return json.dumps(reporte_a_dict(stats), ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _render_csv(stats: EstadisticasReporte) -> bytes:
+    """Formato largo: una fila por cifra (seccion, clave, valor)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["seccion", "clave", "valor"])
+    for clave in ("total", "ingresados_24h", "cargados_hoy", "pendientes"):
+        writer.writerow(["resumen", clave, getattr(stats, clave)])
+    for seccion in ("resueltos_por_tecnico", "pendientes_por_tipo", "por_estado", "en_curso_por_grupo"):
+        for clave, valor in getattr(stats, seccion):
+            writer.writerow([seccion, clave, valor])
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+_RENDERERS = {
+    "PNG": _render_png,
+    "PDF": _render_pdf,
+    "CSV": _render_csv,
+    "JSON": _render_json,
+}
+
+
+def exportar_reporte_diario(df_reclamos: pd.DataFrame, formato: str = "PNG",
+                            version: Optional[str] = None) -> Tuple[io.BytesIO, str, str]:
+    """
+    Genera el reporte diario en el formato pedido a partir del pipeline único.
+
+    Returns:
+        tuple: (buffer, nombre_archivo, mime)
+    """
+    if formato not in _RENDERERS:
+        raise ValueError(f"Formato no válido: {formato}. Opciones: {list(_RENDERERS)}")
+    stats = estadisticas_jornada(df_reclamos, version)
+    extension, mime = FORMATOS_REPORTE[formato]
+    fecha = ahora_argentina().strftime("%Y-%m-%d")
+    return io.BytesIO(_RENDERERS[formato](stats)), f"reporte_diario_{fecha}.{extension}", mime
+
+
+def generar_reporte_diario_imagen(df_reclamos: pd.DataFrame, version: Optional[str] = None) -> io.BytesIO:
+    """
+    Genera el PNG del reporte diario.
+
+    Args:
+        df_reclamos: DataFrame de reclamos
+        version: Huella de los datos (por defecto se calcula con version_datos)
+    """
+    return exportar_reporte_diario(df_reclamos, "PNG", version)[0]
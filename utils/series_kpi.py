@@ -0,0 +1,270 @@
+# utils/series_kpi.py
+"""
+Series históricas de KPIs de reclamos (diarias y horarias).
+
+Se guardan solo flujos por franja y dimensión (sector, tipo, técnico):
+ingresos, resueltos y horas de resolución acumuladas. El tiempo medio de
+resolución se deriva al leer, por lo que los archivos son compactos y nunca
+se reescriben.
+
+El backlog no sale de los archivos: las franjas guardadas congelan el técnico
+del momento y solo cuentan "Resuelto" como cierre. Se calcula siempre sobre
+los datos actuales: cada reclamo suma al ingresar y resta al salir de los
+estados activos (cualquier salida, con su fecha de cierre).
+
+Persistencia: archivos parquet append-only por frecuencia. Las franjas ya
+cerradas se agregan una sola vez; la franja en curso se calcula en memoria.
+"""
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from utils.capacidad import calcular_horas_resolucion, normalizar_grupo_tecnicos
+from utils.date_utils import ahora_argentina, parse_fechas_series
+from utils.telemetria import cache_medida
+from config.settings import KPI_DIR, KPI_MAX_PARTES, KPI_DIAS_TENDENCIA
+
+FRECUENCIAS = {"diario": "D", "horario": "h"}
+DIMENSIONES_KPI = ["sector", "tipo", "tecnico"]
+COLUMNAS_FLUJO = ["ingresos", "resueltos", "horas"]
+ESTADOS_ACTIVOS = ("Pendiente", "En curso")
+
+_lock = threading.Lock()
+
+
+def _dimensiones(sector: pd.Series, tipo: pd.Series, tecnico: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame({
+        "sector": sector.fillna("").astype(str).str.strip(),
+        "tipo": tipo.fillna("Sin tipo").astype(str).str.strip(),
+        "tecnico": normalizar_grupo_tecnicos(tecnico),
+    })
+
+
+@cache_medida("calcular_flujos", st.cache_data(show_spinner=False))
+def calcular_flujos(_df_reclamos: pd.DataFrame, version: str, frecuencia: str) -> pd.DataFrame:
+    """
+    Agrupa el historial en franjas (memoizado por versión de datos).
+
+    Returns:
+        DataFrame con bucket, sector, tipo, tecnico, ingresos, resueltos, horas
+    """
+    freq = FRECUENCIAS[frecuencia]
+    columnas = ["bucket", *DIMENSIONES_KPI, *COLUMNAS_FLUJO]
+    if _df_reclamos.empty:
+        return pd.DataFrame(columns=columnas)
+
+    df = _df_reclamos
+    ingresos = _dimensiones(df["Sector"], df["Tipo de reclamo"], df["Técnico"])
+    ingresos["bucket"] = parse_fechas_series(df["Fecha y hora"]).dt.floor(freq)
+    ingresos = ingresos.dropna(subset=["bucket"]).groupby(["bucket", *DIMENSIONES_KPI]).size().rename("ingresos")
+
+    tiempos = calcular_horas_resolucion(df)
+    resueltos = _dimensiones(tiempos["Sector"], tiempos["Tipo de reclamo"], tiempos["Técnico"])
+    resueltos["bucket"] = tiempos["cierre"].dt.floor(freq)
+    resueltos["horas"] = tiempos["horas"]
+    resueltos = resueltos.groupby(["bucket", *DIMENSIONES_KPI]).agg(
+        resueltos=("horas", "size"), horas=("horas", "sum")
+    )
+
+    flujos = pd.concat([ingresos, resueltos], axis=1).fillna(0).reset_index()
+    flujos["ingresos"] = flujos["ingresos"].astype("int32")
+    flujos["resueltos"] = flujos["resueltos"].astype("int32")
+    flujos["horas"] = flujos["horas"].astype("float32")
+    return flujos[columnas]
+
+
+@cache_medida("calcular_backlog", st.cache_data(show_spinner=False))
+def calcular_backlog(_df_reclamos: pd.DataFrame, version: str, frecuencia: str) -> pd.DataFrame:
+    """
+    Variación del backlog por franja según el estado actual (memoizado por versión).
+
+    Un reclamo suma 1 en la franja de ingreso y, si ya no está en ESTADOS_ACTIVOS,
+    resta 1 en la de cierre (Fecha_formateada; sin fecha válida, la de ingreso).
+
+    Returns:
+        DataFrame con bucket, sector, tipo, tecnico, variacion
+    """
+    freq = FRECUENCIAS[frecuencia]
+    columnas = ["bucket", *DIMENSIONES_KPI, "variacion"]
+    if _df_reclamos.empty:
+        return pd.DataFrame(columns=columnas)
+
+    df = _df_reclamos
+    dimensiones = _dimensiones(df["Sector"], df["Tipo de reclamo"], df["Técnico"])
+    apertura = parse_fechas_series(df["Fecha y hora"])
+    if "Fecha_formateada" in df.columns:
+        cierre = parse_fechas_series(df["Fecha_formateada"])
+        cierre = cierre.where(cierre >= apertura, apertura)
+    else:
+        cierre = apertura
+    cerrado = ~df["Estado"].astype(str).str.strip().isin(ESTADOS_ACTIVOS)
+
+    altas = dimensiones.assign(bucket=apertura.dt.floor(freq), variacion=1)
+    bajas = dimensiones[cerrado].assign(bucket=cierre[cerrado].dt.floor(freq), variacion=-1)
+    movimientos = pd.concat([altas, bajas], ignore_index=True).dropna(subset=["bucket"])
+    return movimientos.groupby(["bucket", *DIMENSIONES_KPI], as_index=False)["variacion"].sum()[columnas]
+
+
+class SerieKPI:
+    """Almacén append-only de una frecuencia (diario u horario)"""
+
+    def __init__(self, frecuencia: str, base_dir: str = KPI_DIR):
+        if frecuencia not in FRECUENCIAS:
+            raise ValueError(f"Frecuencia no válida: {frecuencia}. Opciones: {list(FRECUENCIAS)}")
+        self.frecuencia = frecuencia
+        self.dir = os.path.join(base_dir, frecuencia)
+        self.path_meta = os.path.join(self.dir, "_meta.json")
+
+    def hasta(self) -> Optional[pd.Timestamp]:
+        """Inicio de la primera franja todavía no persistida"""
+        try:
+            with open(self.path_meta, "r", encoding="utf-8") as f:
+                return pd.Timestamp(json.load(f)["hasta"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def partes(self) -> List[str]:
+        try:
+            return sorted(os.path.join(self.dir, n) for n in os.listdir(self.dir) if n.endswith(".parquet"))
+        except OSError:
+            return []
+
+    def actualizar(self, flujos: pd.DataFrame) -> int:
+        """
+        Persiste las franjas cerradas que todavía no están guardadas.
+
+        Returns:
+            Filas agregadas
+        """
+        corte = pd.Timestamp(ahora_argentina()).tz_localize(None).floor(FRECUENCIAS[self.frecuencia])
+        with _lock:
+            hasta = self.hasta()
+            if hasta is not None and hasta >= corte:
+                return 0
+
+            nuevas = flujos[flujos["bucket"] < corte]
+            if hasta is not None:
+                nuevas = nuevas[nuevas["bucket"] >= hasta]
+
+            os.makedirs(self.dir, exist_ok=True)
+            if not nuevas.empty:
+                nombre = f"parte-{corte.strftime('%Y%m%d%H')}.parquet"
+                nuevas.to_parquet(os.path.join(self.dir, nombre), index=False)
+
+            tmp = f"{self.path_meta}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"hasta": corte.isoformat()}, f)
+            os.replace(tmp, self.path_meta)
+
+            if len(self.partes()) > KPI_MAX_PARTES:
+                self._compactar()
+            return len(nuevas)
+
+    def _compactar(self) -> None:
+        """Une las partes en un solo archivo (mismo contenido, menos archivos)"""
+        partes = self.partes()
+        datos = pd.concat([pd.read_parquet(p) for p in partes], ignore_index=True)
+        destino = os.path.join(self.dir, f"base-{pd.Timestamp.now().strftime('%Y%m%d%H%M%S')}.parquet")
+        datos.to_parquet(destino, index=False)
+        for p in partes:
+            os.remove(p)
+
+    def leer(self) -> pd.DataFrame:
+        partes = self.partes()
+        firma = tuple((p, os.path.getmtime(p)) for p in partes)
+        return _leer_partes(firma)
+
+
+@cache_medida("_leer_partes", st.cache_data(show_spinner=False))
+def _leer_partes(firma) -> pd.DataFrame:
+    """Lectura cacheada por nombre y fecha de modificación de cada parte"""
+    if not firma:
+        return pd.DataFrame(columns=["bucket", *DIMENSIONES_KPI, *COLUMNAS_FLUJO])
+    return pd.concat([pd.read_parquet(p) for p, _ in firma], ignore_index=True)
+
+
+def serie_kpi(
+    df_reclamos: pd.DataFrame,
+    frecuencia: str = "diario",
+    version: Optional[str] = None,
+    **filtros,
+) -> pd.DataFrame:
+    """
+    Serie de KPIs filtrada por dimensión (sector=, tipo=, tecnico=).
+
+    Returns:
+        DataFrame indexado por franja con ingresos, resueltos, horas_media y backlog
+        (reclamos en estados activos al final de cada franja)
+    """
+    from utils.data_manager import version_datos
+
+    invalidas = set(filtros) - set(DIMENSIONES_KPI)
+    if invalidas:
+        raise ValueError(f"Dimensiones no válidas: {sorted(invalidas)}. Opciones: {DIMENSIONES_KPI}")
+
+    version = version or st.session_state.get("df_version") or version_datos(df_reclamos)
+    flujos = calcular_flujos(df_reclamos, version, frecuencia)
+    store = SerieKPI(frecuencia)
+
+    try:
+        store.actualizar(flujos)
+        hasta = store.hasta()
+        historico = store.leer()
+        recientes = flujos[flujos["bucket"] >= hasta] if hasta is not None else flujos.iloc[0:0]
+        datos = pd.concat([historico, recientes], ignore_index=True)
+    except ImportError:
+        # Sin motor parquet (pyarrow): se trabaja solo en memoria
+        datos = flujos
+
+    variaciones = calcular_backlog(df_reclamos, version, frecuencia)
+    for dimension, valor in filtros.items():
+        if valor is not None:
+            datos = datos[datos[dimension] == valor]
+            variaciones = variaciones[variaciones[dimension] == valor]
+
+    serie = datos.groupby("bucket")[COLUMNAS_FLUJO].sum()
+    if not serie.empty:
+        serie = serie.reindex(
+            pd.date_range(serie.index.min(), serie.index.max(), freq=FRECUENCIAS[frecuencia]),
+            fill_value=0,
+        )
+    serie.index.name = "bucket"
+    niveles = variaciones.groupby("bucket")["variacion"].sum().sort_index().cumsum()
+    serie["backlog"] = (
+        niveles.reindex(serie.index.union(niveles.index)).ffill().reindex(serie.index).fillna(0).astype("int64")
+    )
+    serie["horas_media"] = serie["horas"] / serie["resueltos"].where(serie["resueltos"] > 0)
+    return serie
+
+
+def tendencia(serie: pd.DataFrame, columna: str, periodos: int = KPI_DIAS_TENDENCIA) -> Optional[float]:
+    """
+    Variación porcentual de los últimos `periodos` contra los anteriores.
+
+    Para backlog (un nivel, no un flujo) compara el último valor con el de
+    `periodos` franjas atrás. Devuelve None si no hay historia suficiente.
+    """
+    if len(serie) < 2 * periodos:
+        return None
+    if columna == "backlog":
+        actual, previo = serie[columna].iloc[-1], serie[columna].iloc[-1 - periodos]
+    else:
+        actual = serie[columna].iloc[-periodos:].sum()
+        previo = serie[columna].iloc[-2 * periodos:-periodos].sum()
+    if not previo:
+        return None
+    return round(float((actual - previo) / abs(previo) * 100), 1)
+
+
+def tendencias_dashboard(df_reclamos: pd.DataFrame, version: Optional[str] = None) -> Dict[str, Optional[float]]:
+    """Tendencias semanales usadas por las tarjetas del dashboard"""
+    serie = serie_kpi(df_reclamos, "diario", version)
+    return {
+        "backlog": tendencia(serie, "backlog"),
+        "ingresos": tendencia(serie, "ingresos"),
+        "resueltos": tendencia(serie, "resueltos"),
+    }
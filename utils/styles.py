@@ -1,8 +1,24 @@
 # styles.py - Tema Monokai Profesional Completo
-"""Estilos CSS profesionales Monokai para Fusion CRM"""
+"""
+Estilos CSS profesionales Monokai para Fusion CRM.
 
-def get_main_styles():
-    """Devuelve estilos CSS profesionales con tema Monokai completo"""
+La hoja completa (tema, login y componentes) se minifica una vez por proceso
+y se publica en static/ con un hash de contenido en el nombre: cada rerun
+solo envía un @import de ~80 bytes y el navegador la cachea.
+"""
+import hashlib
+import os
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import streamlit as st
+
+from config.settings import ESTILOS_DIR, ESTILOS_URL, ESTILOS_ESTATICOS
+
+
+def _hoja_fuente():
+    """Estilos CSS profesionales con tema Monokai completo (fuente sin minificar)"""
     
     theme_vars = """
         --primary-color: #66D9EF;     /* Azul verdoso Monokai */
@@ -889,6 +905,496 @@ def get_main_styles():
     </style>
     """
 
+# Login y componentes HTML (components/auth.py, components/ui.py, metrics_dashboard.py)
+_CSS_COMPONENTES = """
+.login-container {
+    max-width: 400px;
+    margin: 60px auto;
+    padding: 40px;
+    background: var(--bg-card);
+    border-radius: var(--radius-xl);
+    border: 1px solid var(--border-color);
+    box-shadow: var(--shadow-lg);
+    text-align: center;
+}
+
+.login-header {
+    margin-bottom: 30px;
+}
+
+.login-logo {
+    font-size: 3.5rem;
+    margin-bottom: 15px;
+    background: linear-gradient(135deg, #66D9EF 0%, #F92672 30%, #A6E22E 70%, #AE81FF 100%);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+}
+
+.login-title {
+    font-size: 1.8rem;
+    font-weight: 700;
+    margin-bottom: 10px;
+    color: var(--text-primary);
+}
+
+.login-subtitle {
+    color: var(--text-secondary);
+    margin-bottom: 30px;
+    font-size: 0.95rem;
+}
+
+.login-form {
+    text-align: left;
+}
+
+.login-input {
+    margin-bottom: 20px;
+}
+
+.login-button {
+    width: 100%;
+    margin-top: 10px;
+    padding: 12px;
+    font-size: 1rem;
+    font-weight: 600;
+}
+
+.login-footer {
+    margin-top: 30px;
+    padding-top: 20px;
+    border-top: 1px solid var(--border-light);
+    color: var(--text-muted);
+    font-size: 0.85rem;
+}
+
+.login-error {
+    background: rgba(239, 68, 68, 0.1);
+    border: 1px solid rgba(239, 68, 68, 0.3);
+    color: #EF4444;
+    padding: 12px;
+    border-radius: var(--radius-md);
+    margin: 15px 0;
+    text-align: center;
+}
+
+.login-success {
+    background: rgba(16, 185, 129, 0.1);
+    border: 1px solid rgba(16, 185, 129, 0.3);
+    color: #10B981;
+    padding: 12px;
+    border-radius: var(--radius-md);
+    margin: 15px 0;
+    text-align: center;
+}
+
+.login-icon {
+    font-size: 1.5rem;
+    padding-top: 10px;
+}
+
+.login-footer-note {
+    font-size: 0.8rem;
+    margin-top: 5px;
+}
+
+.app-header {
+    text-align: center;
+    padding: 2rem 0;
+}
+
+.app-header h1 {
+    margin: 0;
+    background: linear-gradient(135deg, #66D9EF 0%, #F92672 30%, #A6E22E 70%, #AE81FF 100%);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    font-size: 2.8rem;
+}
+
+.app-header p {
+    color: #CFCFC2;
+    margin-top: 0.5rem;
+}
+
+.app-version {
+    text-align: center;
+    color: #75715E;
+    font-size: 0.9rem;
+}
+
+.card-icon {
+    font-size: 24px;
+    color: var(--primary-color);
+}
+
+.card-heading {
+    margin: 0;
+}
+
+.metric-card {
+    text-align: center;
+    padding: 1.5rem;
+    background: var(--bg-card);
+    border: 1px solid var(--border-color);
+    border-radius: var(--radius-xl);
+    transition: all 0.3s ease;
+    min-height: 180px;
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+}
+
+.metric-icon {
+    font-size: 2.5rem;
+    color: var(--primary-color);
+    margin-bottom: 0.75rem;
+    background: linear-gradient(135deg, var(--primary-color), var(--primary-light));
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+}
+
+.metric-value {
+    font-size: 2rem;
+    font-weight: 700;
+    color: var(--text-primary);
+    margin-bottom: 0.5rem;
+    line-height: 1.2;
+}
+
+.metric-label {
+    color: var(--text-secondary);
+    font-weight: 600;
+    font-size: 1rem;
+    margin-bottom: 0.5rem;
+    line-height: 1.3;
+}
+
+.metric-subtitle {
+    color: var(--text-muted);
+    font-size: 0.85rem;
+    margin-top: 0.25rem;
+}
+
+.metric-trend {
+    font-size: 0.8rem;
+    margin-top: 0.25rem;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    gap: 0.25rem;
+}
+
+.metric-trend-up {
+    color: var(--success-color);
+}
+
+.metric-trend-down {
+    color: var(--danger-color);
+}
+
+.metric-card-compact {
+    padding: 1.5rem 1rem;
+    margin: 0;
+    min-height: 0;
+}
+
+.metric-card-compact .metric-icon {
+    margin-bottom: 0.5rem;
+    background: none;
+    -webkit-text-fill-color: currentColor;
+}
+
+.metric-card-compact .metric-value {
+    margin-bottom: 0;
+    line-height: 1;
+}
+
+.metric-card-compact .metric-label {
+    font-weight: 400;
+    font-size: 0.9rem;
+    margin: 0.5rem 0;
+}
+
+.badge-icon {
+    margin-right: 0.25rem;
+}
+
+.status-badge {
+    display: flex;
+    align-items: center;
+    justify-content: space-between;
+    padding: 0.75rem;
+    border-radius: var(--radius-md);
+    border: 1px solid;
+    margin: 0.25rem 0;
+    color: var(--text-muted);
+    background: rgba(117, 113, 94, 0.08);
+    border-color: rgba(117, 113, 94, 0.19);
+}
+
+.status-badge-label {
+    display: flex;
+    align-items: center;
+    gap: 0.5rem;
+}
+
+.status-badge-label span:last-child {
+    color: var(--text-primary);
+}
+
+.status-badge-count {
+    font-weight: 600;
+}
+
+.status-pendiente {
+    color: var(--warning-color);
+    background: rgba(253, 151, 31, 0.08);
+    border-color: rgba(253, 151, 31, 0.19);
+}
+
+.status-en-curso {
+    color: var(--info-color);
+    background: rgba(174, 129, 255, 0.08);
+    border-color: rgba(174, 129, 255, 0.19);
+}
+
+.status-resuelto {
+    color: var(--success-color);
+    background: rgba(166, 226, 46, 0.08);
+    border-color: rgba(166, 226, 46, 0.19);
+}
+
+.status-desconexion {
+    color: var(--danger-color);
+    background: rgba(255, 97, 136, 0.08);
+    border-color: rgba(255, 97, 136, 0.19);
+}
+
+.empty-state {
+    padding: 0.75rem;
+    background: var(--bg-surface);
+    border-radius: var(--radius-md);
+    border: 1px solid var(--border-color);
+    text-align: center;
+    color: var(--text-muted);
+}
+
+.dashboard-header {
+    margin: 2rem 0 1.5rem 0;
+}
+
+.dashboard-header h2 {
+    display: flex;
+    align-items: center;
+    gap: 0.5rem;
+    margin: 0;
+}
+
+.dashboard-header p {
+    color: var(--text-secondary);
+    margin: 0.5rem 0 0 0;
+}
+
+.section-title {
+    margin: 2rem 0 1rem 0;
+}
+
+.section-title h4 {
+    margin: 0 0 1rem 0;
+    color: var(--text-primary);
+}
+
+.breadcrumb {
+    display: flex;
+    align-items: center;
+    gap: 0.75rem;
+    margin: 2rem 0 1.5rem 0;
+    padding: 1.25rem;
+    background: var(--bg-card);
+    border-radius: var(--radius-xl);
+    border: 1px solid var(--border-color);
+    box-shadow: var(--shadow-sm);
+    font-size: 0.95rem;
+}
+
+.breadcrumb-prefix {
+    color: var(--text-muted);
+    display: flex;
+    align-items: center;
+    gap: 0.5rem;
+}
+
+.breadcrumb-prefix-icon {
+    font-size: 1.2rem;
+}
+
+.breadcrumb-current {
+    display: flex;
+    align-items: center;
+    gap: 0.5rem;
+    padding: 0.5rem 1rem;
+    background: linear-gradient(135deg, var(--bg-surface), var(--bg-secondary));
+    border-radius: var(--radius-lg);
+    border: 1px solid var(--border-light);
+    color: var(--primary-color);
+}
+
+.breadcrumb-current-icon {
+    font-size: 1.1rem;
+}
+
+.breadcrumb-current-name {
+    font-weight: 600;
+}
+
+.breadcrumb-spacer {
+    flex: 1;
+}
+
+.breadcrumb-date {
+    color: var(--text-muted);
+    font-size: 0.85rem;
+}
+
+.loader {
+    text-align: center;
+    padding: 2rem;
+}
+
+.loader-spinner {
+    width: 50px;
+    height: 50px;
+    border: 3px solid rgba(102, 217, 239, 0.3);
+    border-top: 3px solid #66D9EF;
+    border-radius: 50%;
+    animation: spin 1s linear infinite;
+    margin: 0 auto 1rem;
+}
+
+.loader-text {
+    color: var(--text-secondary);
+    margin: 0;
+    font-size: 0.9rem;
+}
+
+@keyframes spin {
+    0% { transform: rotate(0deg); }
+    100% { transform: rotate(360deg); }
+}
+
+.grid-container {
+    display: grid;
+    grid-template-columns: repeat(var(--grid-columns, 3), 1fr);
+    gap: var(--grid-gap, 1rem);
+    width: 100%;
+    margin: 1.5rem 0;
+}
+
+.grid-item {
+    width: 100%;
+}
+
+.expandable {
+    background: var(--bg-card);
+    border: 1px solid var(--border-color);
+    border-radius: var(--radius-lg);
+    margin: 1rem 0;
+    overflow: hidden;
+}
+
+.expandable-header {
+    padding: 1rem 1.5rem;
+    background: var(--bg-surface);
+    cursor: pointer;
+    display: flex;
+    align-items: center;
+    gap: 0.75rem;
+    font-weight: 600;
+    color: var(--text-primary);
+}
+
+.expandable-icon {
+    font-size: 1.1rem;
+}
+
+.expandable-title {
+    flex: 1;
+}
+
+.expandable-arrow {
+    font-size: 0.9rem;
+}
+
+.expandable-body {
+    padding: 1.5rem;
+}
+
+.expandable-collapsed .expandable-body {
+    display: none;
+}
+"""
+
+
+def minificar_css(css: str) -> str:
+    """Quita comentarios y espacios sobrantes"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=1)
+def hoja_estilos() -> Tuple[str, str]:
+    """CSS minificado y su hash de contenido (se arma una vez por proceso)"""
+    fuente = _hoja_fuente().replace("<style>", "").replace("</style>", "") + _CSS_COMPONENTES
+    css = minificar_css(fuente)
+    return css, hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+
+
+def get_main_styles():
+    """Bloque <style> con la hoja completa minificada"""
+    css, _ = hoja_estilos()
+    return f"<style>{css}</style>"
+
+
+@lru_cache(maxsize=1)
+def publicar_hoja_estilos() -> Optional[str]:
+    """
+    Escribe la hoja en ESTILOS_DIR como fusion.<hash>.css (una vez por proceso)
+    y devuelve su URL pública; None si no se pudo escribir.
+    """
+    css, huella = hoja_estilos()
+    nombre = f"fusion.{huella}.css"
+    ruta = os.path.join(ESTILOS_DIR, nombre)
+    try:
+        os.makedirs(ESTILOS_DIR, exist_ok=True)
+        if not os.path.exists(ruta):
+            tmp = f"{ruta}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(css)
+            os.replace(tmp, ruta)
+        for anterior in os.listdir(ESTILOS_DIR):
+            if anterior.startswith("fusion.") and anterior.endswith(".css") and anterior != nombre:
+                os.remove(os.path.join(ESTILOS_DIR, anterior))
+    except OSError:
+        return None
+    return f"{ESTILOS_URL}/{nombre}"
+
+
+def inyectar_estilos():
+    """
+    Aplica la hoja de estilos en el rerun actual.
+
+    Streamlit quita los elementos que un rerun no vuelve a emitir, así que la
+    referencia se envía siempre; con la hoja publicada es solo un @import.
+    """
+    url = publicar_hoja_estilos() if ESTILOS_ESTATICOS else None
+    if url:
+        st.markdown(f'<style>@import url("{url}");</style>', unsafe_allow_html=True)
+    else:
+        st.markdown(get_main_styles(), unsafe_allow_html=True)
+
+
 def get_loading_spinner():
     """Spinner de carga Monokai mejorado"""
     return """
@@ -0,0 +1,326 @@
+# utils/telemetria.py
+"""
+Métricas del proceso en formato de texto de Prometheus.
+
+Registro en memoria de contadores, medidores e histogramas con etiquetas,
+alimentado por ApiManager (llamadas, latencia, bytes, espera y cuota), las
+cachés de datos (consultas y fallos), los tiempos de render por componente,
+la latencia de cada rerun por página y los eventos de login.
+
+Se expone en http://TELEMETRIA_HOST:TELEMETRIA_PUERTO/metrics o se escribe
+cada TELEMETRIA_INTERVALO segundos en TELEMETRIA_ARCHIVO (con respaldos
+rotados); ambas salidas están desactivadas por defecto.
+"""
+import functools
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import streamlit as st
+
+from config.settings import (
+    API_CUOTA_POR_MINUTO,
+    TELEMETRIA_ARCHIVO,
+    TELEMETRIA_HOST,
+    TELEMETRIA_INTERVALO,
+    TELEMETRIA_PUERTO,
+    TELEMETRIA_RESPALDOS,
+)
+
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escapar(valor: Any) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatear(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def _etiquetas(nombres: Sequence[str], valores: Tuple, extra: str = "") -> str:
+    partes = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        partes.append(extra)
+    return "{" + ",".join(partes) + "}" if partes else ""
+
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._valores: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _clave(self, etiquetas: Dict[str, Any]) -> Tuple:
+        return tuple(str(etiquetas.get(n, "")) for n in self.etiquetas)
+
+    def lineas(self) -> List[str]:
+        return [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"] + self._muestras()
+
+    def _muestras(self) -> List[str]:
+        with self._lock:
+            valores = list(self._valores.items())
+        return [f"{self.nombre}{_etiquetas(self.etiquetas, clave)} {_formatear(v)}" for clave, v in valores]
+
+
+class Contador(_Metrica):
+    """Valor que solo crece (se reinicia con el proceso)"""
+    tipo = "counter"
+
+    def inc(self, cantidad: float = 1, **etiquetas) -> None:
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0) + cantidad
+
+
+class Medidor(_Metrica):
+    """Valor instantáneo; con `funcion` se calcula al momento de exponer"""
+    tipo = "gauge"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = (),
+                 funcion: Optional[Callable[[], float]] = None):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.funcion = funcion
+
+    def set(self, valor: float, **etiquetas) -> None:
+        with self._lock:
+            self._valores[self._clave(etiquetas)] = valor
+
+    def _muestras(self) -> List[str]:
+        if self.funcion is not None:
+            return [f"{self.nombre} {_formatear(self.funcion())}"]
+        return super()._muestras()
+
+
+class Histograma(_Metrica):
+    """Distribución acumulada por buckets, con suma y cantidad"""
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = (),
+                 buckets: Sequence[float] = BUCKETS_SEGUNDOS):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, valor: float, **etiquetas) -> None:
+        clave = self._clave(etiquetas)
+        with self._lock:
+            serie = self._valores.setdefault(clave, {"buckets": [0] * len(self.buckets), "suma": 0.0, "cantidad": 0})
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    serie["buckets"][i] += 1
+            serie["suma"] += valor
+            serie["cantidad"] += 1
+
+    def _muestras(self) -> List[str]:
+        with self._lock:
+            series = [(clave, dict(s, buckets=list(s["buckets"]))) for clave, s in self._valores.items()]
+        lineas = []
+        for clave, serie in series:
+            for limite, cantidad in zip(self.buckets, serie["buckets"]):
+                le = f'le="{_formatear(limite)}"'
+                lineas.append(f"{self.nombre}_bucket{_etiquetas(self.etiquetas, clave, le)} {cantidad}")
+            lineas.append(f"{self.nombre}_sum{_etiquetas(self.etiquetas, clave)} {_formatear(serie['suma'])}")
+            lineas.append(f"{self.nombre}_count{_etiquetas(self.etiquetas, clave)} {serie['cantidad']}")
+        return lineas
+
+
+class RegistroMetricas:
+    """Métricas del proceso (compartidas entre sesiones)"""
+
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, clase, nombre: str, *args, **kwargs):
+        with self._lock:
+            if nombre not in self._metricas:
+                self._metricas[nombre] = clase(nombre, *args, **kwargs)
+            return self._metricas[nombre]
+
+    def contador(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()) -> Contador:
+        return self._registrar(Contador, nombre, ayuda, etiquetas)
+
+    def medidor(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = (),
+                funcion: Optional[Callable[[], float]] = None) -> Medidor:
+        return self._registrar(Medidor, nombre, ayuda, etiquetas, funcion)
+
+    def histograma(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = (),
+                   buckets: Sequence[float] = BUCKETS_SEGUNDOS) -> Histograma:
+        return self._registrar(Histograma, nombre, ayuda, etiquetas, buckets)
+
+    def exponer(self) -> str:
+        """Todas las métricas en formato de texto de Prometheus"""
+        with self._lock:
+            metricas = list(self._metricas.values())
+        return "\n".join(linea for m in metricas for linea in m.lineas()) + "\n"
+
+
+registro_metricas = RegistroMetricas()
+
+# --- API de Google Sheets ---
+_ventana_api: deque = deque()
+_ventana_lock = threading.Lock()
+
+
+def _recortar_ventana(ahora: float) -> None:
+    """Descarta las llamadas de hace más de 60 s (llamar con _ventana_lock)"""
+    limite = ahora - 60
+    while _ventana_api and _ventana_api[0] < limite:
+        _ventana_api.popleft()
+
+
+def _llamadas_ultimo_minuto() -> int:
+    with _ventana_lock:
+        _recortar_ventana(time.time())
+        return len(_ventana_api)
+
+
+api_llamadas = registro_metricas.contador(
+    "fusion_api_llamadas_total", "Llamadas a la API de Sheets", ("operacion", "hoja", "resultado"))
+api_latencia = registro_metricas.histograma(
+    "fusion_api_latencia_segundos", "Latencia de las llamadas a la API de Sheets", ("operacion",))
+api_bytes = registro_metricas.contador(
+    "fusion_api_bytes_total", "Bytes estimados enviados o recibidos", ("operacion",))
+api_espera = registro_metricas.contador(
+    "fusion_api_espera_segundos_total", "Tiempo de espera por rate limiting")
+registro_metricas.medidor(
+    "fusion_api_llamadas_ultimo_minuto", "Llamadas a la API en los últimos 60 segundos",
+    funcion=_llamadas_ultimo_minuto)
+registro_metricas.medidor(
+    "fusion_api_cuota_uso_ratio", "Fracción de la cuota por minuto usada en los últimos 60 segundos",
+    funcion=lambda: round(_llamadas_ultimo_minuto() / API_CUOTA_POR_MINUTO, 4))
+
+# --- Cachés, render, reruns y login ---
+cache_consultas = registro_metricas.contador(
+    "fusion_cache_consultas_total", "Consultas a funciones cacheadas", ("cache",))
+cache_fallos = registro_metricas.contador(
+    "fusion_cache_fallos_total", "Consultas que recalcularon el resultado", ("cache",))
+render_duracion = registro_metricas.histograma(
+    "fusion_render_segundos", "Duración del render de cada componente", ("componente",))
+rerun_duracion = registro_metricas.histograma(
+    "fusion_rerun_segundos", "Duración de cada rerun de app.py", ("pagina",))
+logins = registro_metricas.contador(
+    "fusion_login_total", "Intentos de login y sesiones retomadas", ("resultado",))
+
+
+def observar_api(traza: Dict[str, Any]) -> None:
+    """Registra una traza de ApiManager (ver utils.trazas_api)"""
+    resultado = "error" if traza["error"] else "ok"
+    api_llamadas.inc(operacion=traza["operacion"], hoja=traza["hoja"] or "", resultado=resultado)
+    api_latencia.observe(traza["latencia_ms"] / 1000, operacion=traza["operacion"])
+    if traza["bytes"]:
+        api_bytes.inc(traza["bytes"], operacion=traza["operacion"])
+    if traza["espera_ms"]:
+        api_espera.inc(traza["espera_ms"] / 1000)
+    # Se recorta al agregar: sin exportadores activos nadie más vacía la ventana
+    with _ventana_lock:
+        _ventana_api.append(traza["momento"])
+        _recortar_ventana(traza["momento"])
+
+
+def cache_medida(nombre: str, cache: Callable[[Callable], Callable]):
+    """
+    Aplica un decorador de caché (st.cache_data, lru_cache, ...) contando
+    consultas y fallos: el cuerpo de la función solo corre en un fallo.
+    """
+    def decorador(f):
+        @functools.wraps(f)
+        def cuerpo(*args, **kwargs):
+            cache_fallos.inc(cache=nombre)
+            return f(*args, **kwargs)
+
+        cacheada = cache(cuerpo)
+
+        @functools.wraps(f)
+        def envoltura(*args, **kwargs):
+            cache_consultas.inc(cache=nombre)
+            return cacheada(*args, **kwargs)
+
+        for atributo in ("clear", "cache_clear", "cache_info"):
+            if hasattr(cacheada, atributo):
+                setattr(envoltura, atributo, getattr(cacheada, atributo))
+        return envoltura
+    return decorador
+
+
+# --------------------------
+# EXPORTACIÓN
+# --------------------------
+
+class _ManejadorMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        cuerpo = registro_metricas.exponer().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", TIPO_CONTENIDO)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        pass  # Sin ruido en la consola de Streamlit por cada scrape
+
+
+def escribir_archivo(ruta: str, respaldos: int = TELEMETRIA_RESPALDOS) -> None:
+    """Reemplaza el archivo de forma atómica y rota las copias anteriores"""
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        f.write(registro_metricas.exponer())
+    if respaldos > 0 and os.path.exists(ruta):
+        for i in range(respaldos - 1, 0, -1):
+            if os.path.exists(f"{ruta}.{i}"):
+                os.replace(f"{ruta}.{i}", f"{ruta}.{i + 1}")
+        shutil.copyfile(ruta, f"{ruta}.1")
+    os.replace(temporal, ruta)
+
+
+class ExportadorMetricas:
+    """Servidor HTTP y/o escritor periódico, en hilos daemon"""
+
+    def __init__(self, puerto: Optional[int] = TELEMETRIA_PUERTO, archivo: Optional[str] = TELEMETRIA_ARCHIVO):
+        self.servidor: Optional[ThreadingHTTPServer] = None
+        self.archivo = archivo
+        self.error: Optional[str] = None
+        self._detener = threading.Event()
+
+        if puerto:
+            try:
+                self.servidor = ThreadingHTTPServer((TELEMETRIA_HOST, int(puerto)), _ManejadorMetricas)
+                self.servidor.daemon_threads = True
+                threading.Thread(target=self.servidor.serve_forever, name="telemetria-http", daemon=True).start()
+            except OSError as e:
+                self.error = f"No se pudo abrir el puerto {puerto}: {e}"
+        if archivo:
+            threading.Thread(target=self._bucle_archivo, name="telemetria-archivo", daemon=True).start()
+
+    def _bucle_archivo(self):
+        while not self._detener.wait(TELEMETRIA_INTERVALO):
+            try:
+                escribir_archivo(self.archivo)
+            except OSError as e:
+                self.error = f"No se pudo escribir {self.archivo}: {e}"
+
+    def detener(self):
+        self._detener.set()
+        if self.servidor:
+            self.servidor.shutdown()
+
+
+@st.cache_resource
+def obtener_exportador() -> ExportadorMetricas:
+    """Exportador único por proceso"""
+    return ExportadorMetricas()
@@ -0,0 +1,159 @@
+# utils/tiempos_resolucion.py
+"""
+Percentiles de tiempo de resolución (p50/p90/p99) por técnico, sector y tipo.
+
+Usa sketches de cuantiles con error relativo acotado (estilo DDSketch): cada
+tiempo cae en un bucket logarítmico y el sketch es solo un conteo por bucket.
+Dos sketches se combinan sumando conteos, así que los agregados parciales
+por día se unen al instante para cualquier rango de fechas sin volver a
+recorrer los reclamos.
+"""
+import math
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.capacidad import calcular_horas_resolucion, separar_tecnicos
+from utils.telemetria import cache_medida
+from config.settings import RESOLUCION_PRECISION
+
+GAMMA = (1 + RESOLUCION_PRECISION) / (1 - RESOLUCION_PRECISION)
+LOG_GAMMA = math.log(GAMMA)
+MIN_HORAS = 1 / 60  # Por debajo de un minuto todos los tiempos se agrupan juntos
+
+DIMENSIONES_RESOLUCION = {"tecnico": "Técnico", "sector": "Sector", "tipo": "Tipo de reclamo", "total": "Total"}
+
+
+def indice_bucket(horas) -> np.ndarray:
+    """Bucket logarítmico de cada tiempo (vectorizado)"""
+    horas = np.maximum(np.asarray(horas, dtype=float), MIN_HORAS)
+    return np.ceil(np.log(horas) / LOG_GAMMA).astype(np.int64)
+
+
+def valor_bucket(indice: int) -> float:
+    """Representante del bucket (error relativo <= RESOLUCION_PRECISION)"""
+    return 2 * GAMMA ** indice / (GAMMA + 1)
+
+
+class SketchCuantiles:
+    """Sketch combinable: conteos por bucket logarítmico"""
+
+    def __init__(self, bins: Optional[Dict[int, int]] = None):
+        self.bins: Counter = Counter(bins or {})
+
+    @property
+    def cantidad(self) -> int:
+        return sum(self.bins.values())
+
+    def agregar(self, horas: Iterable[float]) -> "SketchCuantiles":
+        indices, conteos = np.unique(indice_bucket(list(horas)), return_counts=True)
+        self.bins.update(dict(zip(indices.tolist(), conteos.tolist())))
+        return self
+
+    def combinar(self, otro: "SketchCuantiles") -> "SketchCuantiles":
+        return SketchCuantiles(self.bins + otro.bins)
+
+    def cuantil(self, q: float) -> Optional[float]:
+        total = self.cantidad
+        if not total:
+            return None
+        rango = q * (total - 1)
+        acumulado = 0
+        for indice in sorted(self.bins):
+            acumulado += self.bins[indice]
+            if acumulado > rango:
+                return valor_bucket(indice)
+        return valor_bucket(max(self.bins))
+
+    def to_dict(self) -> Dict[str, int]:
+        return {str(k): int(v) for k, v in self.bins.items()}
+
+    @classmethod
+    def from_dict(cls, datos: Dict[str, int]) -> "SketchCuantiles":
+        return cls({int(k): int(v) for k, v in datos.items()})
+
+
+@cache_medida("bins_diarios", st.cache_data(show_spinner=False))
+def bins_diarios(_df_reclamos: pd.DataFrame, version: str) -> pd.DataFrame:
+    """
+    Agregados parciales por día de cierre (memoizado por versión de datos).
+
+    Returns:
+        DataFrame con dia, dimension, valor, indice, cantidad
+    """
+    columnas = ["dia", "dimension", "valor", "indice", "cantidad"]
+    tiempos = calcular_horas_resolucion(_df_reclamos)
+    if tiempos.empty:
+        return pd.DataFrame(columns=columnas)
+
+    base = pd.DataFrame({
+        "dia": tiempos["cierre"].dt.normalize(),
+        "indice": indice_bucket(tiempos["horas"].to_numpy()),
+    }, index=tiempos.index)
+
+    partes = [
+        base.assign(dimension="sector", valor=tiempos["Sector"]),
+        base.assign(dimension="tipo", valor=tiempos["Tipo de reclamo"]),
+        base.assign(dimension="total", valor="Todos"),
+        base.join(separar_tecnicos(tiempos["Técnico"]).rename("valor"), how="inner").assign(dimension="tecnico"),
+    ]
+    return (
+        pd.concat(partes, ignore_index=True)
+        .groupby(["dia", "dimension", "valor", "indice"]).size()
+        .rename("cantidad").reset_index()[columnas]
+    )
+
+
+def sketches_por_valor(bins: pd.DataFrame, dimension: str,
+                       desde: Optional[date] = None, hasta: Optional[date] = None) -> Dict[str, SketchCuantiles]:
+    """Combina los sketches diarios del rango para cada valor de la dimensión"""
+    seleccion = bins[bins["dimension"] == dimension]
+    if desde is not None:
+        seleccion = seleccion[seleccion["dia"] >= pd.Timestamp(desde)]
+    if hasta is not None:
+        seleccion = seleccion[seleccion["dia"] <= pd.Timestamp(hasta)]
+
+    combinados = seleccion.groupby(["valor", "indice"])["cantidad"].sum()
+    return {
+        valor: SketchCuantiles(grupo.droplevel(0).to_dict())
+        for valor, grupo in combinados.groupby(level=0)
+    }
+
+
+def percentiles_resolucion(
+    df_reclamos: pd.DataFrame,
+    dimension: str = "tecnico",
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    cuantiles: Sequence[float] = (0.5, 0.9, 0.99),
+    version: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Percentiles de horas de resolución por valor de la dimensión en el rango de fechas.
+
+    Returns:
+        DataFrame con la dimensión, Resueltos y una columna por percentil (horas)
+    """
+    from utils.data_manager import version_datos
+
+    if dimension not in DIMENSIONES_RESOLUCION:
+        raise ValueError(f"Dimensión no válida: {dimension}. Opciones: {list(DIMENSIONES_RESOLUCION)}")
+
+    version = version or st.session_state.get("df_version") or version_datos(df_reclamos)
+    sketches = sketches_por_valor(bins_diarios(df_reclamos, version), dimension, desde, hasta)
+
+    filas = []
+    for valor, sketch in sketches.items():
+        fila = {DIMENSIONES_RESOLUCION[dimension]: valor, "Resueltos": sketch.cantidad}
+        for q in cuantiles:
+            fila[f"p{round(q * 100)}"] = round(sketch.cuantil(q), 1)
+        filas.append(fila)
+
+    columnas = [DIMENSIONES_RESOLUCION[dimension], "Resueltos", *[f"p{round(q * 100)}" for q in cuantiles]]
+    if not filas:
+        return pd.DataFrame(columns=columnas)
+    return pd.DataFrame(filas, columns=columnas).sort_values("Resueltos", ascending=False).reset_index(drop=True)
@@ -0,0 +1,77 @@
+# utils/transiciones_reclamos.py
+"""
+Transiciones de estado en lote: cerrar, volver a pendiente y reasignar N
+reclamos con una sola escritura verificada (ver escritura_versionada).
+
+Cada función devuelve (resultado, error) con el resultado de
+escribir_verificado; cerrar_reclamos agrega en resultado["clientes"] el de
+la propagación de precintos a la hoja de Clientes y en
+resultado["error_clientes"] su error: una falla en Clientes no es un error
+del cierre, porque los reclamos ya quedaron cerrados.
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from utils.date_utils import ahora_argentina
+from utils.escritura_versionada import actualizar_reclamos, actualizar_clientes
+
+
+def cerrar_reclamos(sheet_reclamos, sheet_clientes, ids: Iterable[str],
+                    precintos: Optional[Dict[str, str]] = None,
+                    clientes: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Marca los reclamos como resueltos con la fecha de cierre actual.
+
+    Args:
+        ids: IDs de los reclamos a cerrar
+        precintos: id reclamo -> precinto nuevo (solo los que cambian)
+        clientes: id reclamo -> ID Cliente, para copiar el precinto a Clientes
+    """
+    precintos = {k: v.strip() for k, v in (precintos or {}).items() if v and v.strip()}
+    fecha_resolucion = ahora_argentina().strftime('%d/%m/%Y %H:%M')
+
+    cambios = {}
+    for id_reclamo in ids:
+        cambios[id_reclamo] = {"Estado": "Resuelto", "Fecha_formateada": fecha_resolucion}
+        if id_reclamo in precintos:
+            cambios[id_reclamo]["N° de Precinto"] = precintos[id_reclamo]
+
+    resultado, error = actualizar_reclamos(sheet_reclamos, cambios)
+    resultado["fecha"] = fecha_resolucion
+    resultado["clientes"] = None
+    resultado["error_clientes"] = None
+    if error:
+        return resultado, error
+
+    # El precinto pasa a Clientes solo para los reclamos que efectivamente se cerraron
+    cambios_clientes = {
+        clientes[id_reclamo]: {"N° de Precinto": precintos[id_reclamo]}
+        for id_reclamo in resultado["escritos"]
+        if id_reclamo in precintos and (clientes or {}).get(id_reclamo)
+    }
+    if cambios_clientes:
+        resultado["clientes"], resultado["error_clientes"] = actualizar_clientes(sheet_clientes, cambios_clientes)
+    return resultado, None
+
+
+def reabrir_reclamos(sheet_reclamos, ids: Iterable[str]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Vuelve los reclamos a Pendiente, sin técnico ni fecha de cierre"""
+    cambios = {i: {"Estado": "Pendiente", "Técnico": "", "Fecha_formateada": ""} for i in ids}
+    return actualizar_reclamos(sheet_reclamos, cambios)
+
+
+def reasignar_reclamos(sheet_reclamos, ids: Iterable[str], tecnicos: str,
+                       pendientes: Iterable[str] = ()) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Asigna los técnicos a los reclamos.
+
+    Args:
+        tecnicos: Técnicos ya formateados ("JUAN, PEDRO")
+        pendientes: IDs que además pasan de Pendiente a En curso
+    """
+    pendientes = set(pendientes)
+    cambios = {}
+    for id_reclamo in ids:
+        cambios[id_reclamo] = {"Técnico": tecnicos}
+        if id_reclamo in pendientes:
+            cambios[id_reclamo]["Estado"] = "En curso"
+    return actualizar_reclamos(sheet_reclamos, cambios)
@@ -0,0 +1,201 @@
+# utils/trazas_api.py
+"""
+Trazas de llamadas a la API de Google Sheets.
+
+ApiManager registra cada llamada real (operación, hoja, rango, bytes
+estimados, latencia y espera por rate limiting) junto con el rerun y la
+página que la originó. Así se ve qué página genera qué carga de API.
+
+El rerun en curso se marca con iniciar_rerun() al comienzo de app.py; las
+llamadas de hilos en segundo plano (vigilancia de SLA, cola de impresión)
+quedan registradas con el nombre del hilo. Cada rerun lleva además un
+contador propio (llamadas_del_rerun) para medir sin recorrer el buffer.
+"""
+import csv
+import io
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import TRAZA_API_MAX, TRAZA_API_MUESTRA_FILAS
+
+_contexto = threading.local()
+_contador_reruns = itertools.count(1)
+
+CAMPOS_TRAZA = ["momento", "rerun", "pagina", "sesion", "operacion", "hoja", "rango",
+                "bytes", "latencia_ms", "espera_ms", "error"]
+
+
+def iniciar_rerun(pagina: str, sesion: Optional[str] = None) -> int:
+    """Marca el comienzo de un rerun en el hilo del script; devuelve su id"""
+    _contexto.rerun = next(_contador_reruns)
+    _contexto.pagina = pagina
+    _contexto.sesion = sesion
+    _contexto.llamadas = 0
+    _contexto.latencia_ms = 0.0
+    return _contexto.rerun
+
+
+def rerun_actual() -> Optional[int]:
+    return getattr(_contexto, "rerun", None)
+
+
+def llamadas_del_rerun() -> Tuple[int, float]:
+    """(llamadas, latencia total en ms) del rerun en curso en este hilo"""
+    return getattr(_contexto, "llamadas", 0), getattr(_contexto, "latencia_ms", 0.0)
+
+
+def _origen() -> Dict[str, Any]:
+    rerun = getattr(_contexto, "rerun", None)
+    if rerun is None:
+        return {"rerun": None, "pagina": f"hilo:{threading.current_thread().name}", "sesion": None}
+    return {"rerun": rerun, "pagina": _contexto.pagina, "sesion": _contexto.sesion}
+
+
+def describir_rango(operacion: str, args: tuple, kwargs: dict) -> str:
+    """Rango A1 afectado (aproximado para operaciones sobre toda la hoja)"""
+    if operacion == "batch_update" and args:
+        if isinstance(args[0], dict):
+            return "estructura"  # Spreadsheet.batch_update({"requests": [...]})
+        return ",".join(str(d.get("range", "")) for d in args[0] if isinstance(d, dict))
+    if operacion == "update_cell" and len(args) >= 2:
+        from utils.almacenamiento_local import columna_a_letra
+        return f"{columna_a_letra(int(args[1]))}{int(args[0])}"
+    if operacion in ("update", "get") and args:
+        rango = args[0] if isinstance(args[0], str) else (args[1] if len(args) > 1 else kwargs.get("range_name", "A1"))
+        return str(rango)
+    if operacion == "batch_get" and args and isinstance(args[0], (list, tuple)):
+        return ",".join(str(r) for r in args[0])
+    if operacion in ("append_row", "append_rows"):
+        return "fin"
+    return "todo"
+
+
+def _tamano_valores(valores: Any) -> int:
+    """Bytes estimados de una matriz de celdas (muestreo: costo constante aunque sea enorme)"""
+    if not isinstance(valores, list) or not valores:
+        return len(str(valores)) if valores is not None else 0
+    if not isinstance(valores[0], (list, tuple)):
+        return sum(len(str(v)) for v in valores)
+    paso = max(1, len(valores) // TRAZA_API_MUESTRA_FILAS)
+    muestra = valores[::paso]
+    promedio = sum(len(str(c)) for fila in muestra for c in fila) / len(muestra)
+    return int(promedio * len(valores))
+
+
+def estimar_bytes(operacion: str, args: tuple, resultado: Any) -> int:
+    """Bytes enviados (escrituras) o recibidos (lecturas), estimados"""
+    if operacion in ("get_all_values", "get", "batch_get", "row_values", "col_values"):
+        return _tamano_valores(resultado)
+    if operacion == "batch_update" and args:
+        if isinstance(args[0], dict):
+            return len(str(args[0]))
+        return sum(
+            _tamano_valores(d.get("values")) + len(str(d.get("range", "")))
+            for d in args[0] if isinstance(d, dict)
+        )
+    if operacion in ("update", "append_rows", "append_row") and args:
+        valores = args[0] if not isinstance(args[0], str) else (args[1] if len(args) > 1 else None)
+        return _tamano_valores(valores)
+    if operacion == "update_cell" and len(args) >= 3:
+        return len(str(args[2]))
+    return 0
+
+
+class RegistroTrazas:
+    """Buffer circular de trazas (por proceso, compartido entre sesiones)"""
+
+    def __init__(self, maximo: int = TRAZA_API_MAX):
+        self._trazas: deque = deque(maxlen=maximo)
+        self._lock = threading.Lock()
+
+    def registrar(self, operacion: str, hoja: Optional[str], rango: str, bytes_: int,
+                  latencia: float, espera: float = 0.0, error: Optional[str] = None) -> Dict[str, Any]:
+        traza = {
+            "momento": time.time(),
+            **_origen(),
+            "operacion": operacion,
+            "hoja": hoja,
+            "rango": rango,
+            "bytes": bytes_,
+            "latencia_ms": round(latencia * 1000, 2),
+            "espera_ms": round(espera * 1000, 2),
+            "error": error,
+        }
+        with self._lock:
+            self._trazas.append(traza)
+        if traza["rerun"] is not None:
+            # registrar corre en el hilo que hizo la llamada: el contador es del rerun de ese hilo
+            _contexto.llamadas += 1
+            _contexto.latencia_ms += traza["latencia_ms"]
+        return traza
+
+    def trazas(self, rerun: Optional[int] = None, sesion: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            trazas = list(self._trazas)
+        if rerun is not None:
+            trazas = [t for t in trazas if t["rerun"] == rerun]
+        if sesion is not None:
+            trazas = [t for t in trazas if t["sesion"] == sesion]
+        return trazas
+
+    @staticmethod
+    def resumir(trazas: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Totales y desglose por operación y hoja"""
+        por_operacion: Dict[str, Dict[str, float]] = {}
+        for t in trazas:
+            clave = f"{t['operacion']} · {t['hoja'] or '-'}"
+            fila = por_operacion.setdefault(clave, {"llamadas": 0, "bytes": 0, "latencia_ms": 0.0})
+            fila["llamadas"] += 1
+            fila["bytes"] += t["bytes"]
+            fila["latencia_ms"] = round(fila["latencia_ms"] + t["latencia_ms"], 2)
+        return {
+            "llamadas": len(trazas),
+            "errores": sum(1 for t in trazas if t["error"]),
+            "bytes": sum(t["bytes"] for t in trazas),
+            "latencia_ms": round(sum(t["latencia_ms"] for t in trazas), 2),
+            "espera_ms": round(sum(t["espera_ms"] for t in trazas), 2),
+            "por_operacion": por_operacion,
+        }
+
+    def resumen_por_pagina(self) -> Dict[str, Dict[str, float]]:
+        """Carga promedio de API por rerun de cada página"""
+        reruns: Dict[str, set] = {}
+        totales: Dict[str, Dict[str, float]] = {}
+        for t in self.trazas():
+            pagina = t["pagina"]
+            reruns.setdefault(pagina, set()).add(t["rerun"])
+            fila = totales.setdefault(pagina, {"llamadas": 0, "bytes": 0, "latencia_ms": 0.0})
+            fila["llamadas"] += 1
+            fila["bytes"] += t["bytes"]
+            fila["latencia_ms"] += t["latencia_ms"]
+        return {
+            pagina: {
+                "reruns": len(reruns[pagina]),
+                "llamadas_por_rerun": round(fila["llamadas"] / len(reruns[pagina]), 2),
+                "bytes_por_rerun": int(fila["bytes"] / len(reruns[pagina])),
+                "latencia_ms_por_rerun": round(fila["latencia_ms"] / len(reruns[pagina]), 1),
+            }
+            for pagina, fila in totales.items()
+        }
+
+    def exportar(self, formato: str = "jsonl") -> bytes:
+        """Log completo en JSON Lines o CSV"""
+        trazas = self.trazas()
+        if formato == "csv":
+            salida = io.StringIO()
+            writer = csv.DictWriter(salida, fieldnames=CAMPOS_TRAZA)
+            writer.writeheader()
+            writer.writerows(trazas)
+            return salida.getvalue().encode("utf-8")
+        return "".join(json.dumps(t, ensure_ascii=False) + "\n" for t in trazas).encode("utf-8")
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._trazas.clear()
+
+
+registro_trazas = RegistroTrazas()
@@ -0,0 +1,239 @@
+# utils/vigilancia_sla.py
+"""
+Vigilancia de SLA en segundo plano.
+
+Un hilo por proceso evalúa periódicamente las reglas de SLA sobre la última
+versión de datos cargada por cualquier sesión y emite notificaciones
+deduplicadas: cada reclamo dispara a lo sumo un aviso por regla. Los
+renders de página ya no cargan con este control.
+
+La hoja no guarda cuándo un reclamo pasó a "En curso" o a "Desconexión":
+el vigilante anota el momento en que lo ve en ese estado por primera vez
+(con la resolución de SLA_INTERVALO y de la última carga de datos) y mide
+la regla desde ahí. Todo lo que corre en el hilo evita st.* (no hay
+contexto de script): el índice se memoiza en el módulo y las
+notificaciones usan utils.notificaciones con los errores al log.
+"""
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+import pandas as pd
+import streamlit as st
+
+from utils.date_utils import ahora_argentina, parse_fechas_series
+from utils.notificaciones import agregar_notificacion
+from config.settings import (
+    SLA_INTERVALO,
+    SLA_HORAS_SIN_TECNICO,
+    SLA_HORAS_EN_CURSO,
+    SLA_HORAS_DESCONEXION,
+    SLA_ESTADO_PATH,
+    COLUMNA_ID_RECLAMO,
+)
+
+logger = logging.getLogger(__name__)
+
+# regla -> (tipo de notificación, descripción para el mensaje)
+REGLAS_SLA = {
+    "sin_tecnico": ("unassigned_claim", f"sin técnico asignado desde hace más de {SLA_HORAS_SIN_TECNICO} horas"),
+    "en_curso_excedido": ("sla_en_curso", f"en curso desde hace más de {SLA_HORAS_EN_CURSO} horas"),
+    "desconexion_pendiente": ("sla_desconexion", f"de desconexión pendientes hace más de {SLA_HORAS_DESCONEXION} horas"),
+}
+
+# estado -> clave de avisados con el primer momento en que se vio cada reclamo en él
+ESTADOS_SEGUIDOS = {"en curso": "en_curso_desde", "desconexión": "desconexion_desde"}
+
+# Memo del índice por versión de datos (el hilo no puede usar st.cache_data)
+_INDICES_MAX = 2
+_indices: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_lock_indices = threading.Lock()
+
+
+def _calcular_indice(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return pd.DataFrame(columns=["id", "estado", "sin_tecnico", "ingreso"])
+    return pd.DataFrame({
+        "id": df[COLUMNA_ID_RECLAMO].fillna("").astype(str).str.strip(),
+        "estado": df["Estado"].fillna("").astype(str).str.strip().str.lower(),
+        "sin_tecnico": df["Técnico"].fillna("").astype(str).str.strip() == "",
+        "ingreso": parse_fechas_series(df["Fecha y hora"]),
+    })
+
+
+def indice_sla(df_reclamos: pd.DataFrame, version: str) -> pd.DataFrame:
+    """Columnas mínimas para evaluar las reglas (memoizado por versión de datos)"""
+    with _lock_indices:
+        indice = _indices.get(version)
+        if indice is not None:
+            _indices.move_to_end(version)
+            return indice
+    indice = _calcular_indice(df_reclamos)
+    with _lock_indices:
+        _indices[version] = indice
+        while len(_indices) > _INDICES_MAX:
+            _indices.popitem(last=False)
+    return indice
+
+
+def evaluar_reglas(indice: pd.DataFrame, ahora: pd.Timestamp,
+                   en_curso_desde: Optional[Dict[str, pd.Timestamp]] = None,
+                   desconexion_desde: Optional[Dict[str, pd.Timestamp]] = None) -> Dict[str, Set[str]]:
+    """
+    IDs de reclamos que incumplen cada regla en el momento indicado.
+
+    en_curso_excedido y desconexion_pendiente se miden desde en_curso_desde y
+    desconexion_desde (id -> momento en que se vio el reclamo en ese estado);
+    sin ese dato, se aproxima con el ingreso.
+    """
+    def antes_de(horas, desde=None):
+        return (indice["ingreso"] if desde is None else desde) < ahora - pd.Timedelta(hours=horas)
+
+    def inicio(desde):
+        if desde is None:
+            return None
+        return pd.to_datetime(indice["id"].map(desde)).fillna(indice["ingreso"])
+
+    activos = indice["estado"].isin(["pendiente", "en curso"])
+    mascaras = {
+        "sin_tecnico": activos & indice["sin_tecnico"] & antes_de(SLA_HORAS_SIN_TECNICO),
+        "en_curso_excedido": (indice["estado"] == "en curso") & antes_de(SLA_HORAS_EN_CURSO, inicio(en_curso_desde)),
+        "desconexion_pendiente": (
+            (indice["estado"] == "desconexión") & antes_de(SLA_HORAS_DESCONEXION, inicio(desconexion_desde))
+        ),
+    }
+    return {regla: set(indice.loc[mascara & (indice["id"] != ""), "id"]) for regla, mascara in mascaras.items()}
+
+
+class NotificadorSegundoPlano:
+    """Alta de notificaciones desde un hilo sin contexto de Streamlit: los errores van al log"""
+
+    def __init__(self, sheet):
+        self.sheet = sheet
+
+    def add(self, notification_type: str, message: str, user_target: str = "all") -> bool:
+        ok, error = agregar_notificacion(self.sheet, notification_type, message, user_target)
+        if not ok:
+            logger.warning("No se pudo agregar la notificación %s: %s", notification_type, error)
+        return ok
+
+
+class VigilanteSLA:
+    """Hilo de vigilancia con estado de avisos persistido en disco"""
+
+    def __init__(self, intervalo: int = SLA_INTERVALO, path_estado: str = SLA_ESTADO_PATH):
+        self.intervalo = intervalo
+        self.path_estado = path_estado
+        self._df: Optional[pd.DataFrame] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._notificador = None
+        self.ultima_evaluacion: Optional[Dict[str, Any]] = None
+        self._hilo = threading.Thread(target=self._bucle, name="vigilancia-sla", daemon=True)
+        self._hilo.start()
+
+    def actualizar_datos(self, df_reclamos: pd.DataFrame, version: str) -> None:
+        """Registra la última versión de datos cargada por una sesión (sin copiar)"""
+        with self._lock:
+            if version != self._version:
+                self._df, self._version = df_reclamos, version
+
+    def detener(self) -> None:
+        self._detener.set()
+
+    def _bucle(self) -> None:
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.evaluar()
+            except Exception:
+                # El vigilante nunca debe morir por un error puntual (hoja caída, etc.)
+                logger.exception("Error al evaluar las reglas de SLA")
+
+    def _cargar_avisados(self) -> Dict[str, Any]:
+        """Avisos por regla ({regla: [ids]}) y los ESTADOS_SEGUIDOS ({id: momento ISO})"""
+        try:
+            with open(self.path_estado, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _guardar_avisados(self, avisados: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.path_estado) or ".", exist_ok=True)
+        tmp = f"{self.path_estado}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(avisados, f, ensure_ascii=False)
+        os.replace(tmp, self.path_estado)
+
+    def evaluar(self) -> Dict[str, int]:
+        """
+        Evalúa las reglas y notifica solo los reclamos que todavía no fueron avisados.
+
+        Returns:
+            Cantidad de reclamos nuevos por regla
+        """
+        with self._lock:
+            df, version = self._df, self._version
+        if df is None:
+            return {}
+
+        ahora = pd.Timestamp(ahora_argentina()).tz_localize(None)
+        indice = indice_sla(df, version)
+        avisados = self._cargar_avisados()
+
+        # Primer momento en que se vio cada reclamo en el estado (se olvida al salir de él)
+        desde = {}
+        for estado, clave in ESTADOS_SEGUIDOS.items():
+            previos = avisados.get(clave, {})
+            ids = set(indice.loc[indice["estado"] == estado, "id"]) - {""}
+            avisados[clave] = {i: previos.get(i, ahora.isoformat()) for i in ids}
+            desde[clave] = {i: pd.Timestamp(m) for i, m in avisados[clave].items()}
+
+        incumplidos = evaluar_reglas(indice, ahora, **desde)
+        nuevos_por_regla = {}
+        for regla, ids in incumplidos.items():
+            previos = set(avisados.get(regla, []))
+            nuevos = ids - previos
+            nuevos_por_regla[regla] = len(nuevos)
+            if nuevos and self._notificar(regla, len(nuevos), len(ids)):
+                previos |= nuevos
+            # Se olvidan los reclamos que ya cumplen la regla: si vuelven a incumplirla se avisa otra vez
+            avisados[regla] = sorted(previos & ids)
+        self._guardar_avisados(avisados)
+
+        self.ultima_evaluacion = {"momento": ahora, "version": version, "incumplidos": {r: len(i) for r, i in incumplidos.items()}}
+        return nuevos_por_regla
+
+    def _notificar(self, regla: str, nuevos: int, total: int) -> bool:
+        tipo, descripcion = REGLAS_SLA[regla]
+        mensaje = f"{nuevos} reclamos nuevos {descripcion} (total: {total})."
+        notificador = self._obtener_notificador()
+        if notificador is None:
+            return False
+        return bool(notificador.add(notification_type=tipo, message=mensaje, user_target="all"))
+
+    def _obtener_notificador(self):
+        if self._notificador is None:
+            from utils.api_manager import api_manager
+            from config.settings import SHEET_ID, WORKSHEET_NOTIFICACIONES
+
+            # open_sheet sin cliente o con error usa st.error: se abre la hoja directamente
+            if api_manager.client is None:
+                logger.warning("API Manager sin cliente: no se pueden enviar avisos de SLA")
+                return None
+            try:
+                sheet = api_manager.client.open_by_key(SHEET_ID).worksheet(WORKSHEET_NOTIFICACIONES)
+            except Exception:
+                logger.warning("No se pudo abrir la hoja de notificaciones", exc_info=True)
+                return None
+            self._notificador = NotificadorSegundoPlano(sheet)
+        return self._notificador
+
+
+@st.cache_resource
+def obtener_vigilante() -> VigilanteSLA:
+    """Vigilante único por proceso"""
+    return VigilanteSLA()